@@ -2,10 +2,132 @@ import streamlit as st
 import os
 import pandas as pd
 from services.azure_clients import get_container_client, setup_openai_client
-from services.document_intelligence import list_blobs_by_prefix, extract_job_posting_text, analyze_resume_with_ai
-from services.llm_service import evaluate_candidate_fit, extract_score_from_evaluation
+from services.document_intelligence import list_blobs_by_prefix, extract_job_posting_text, ResumeAnalysisError
+from services.resume_pipeline import (
+    load_or_extract_resume, load_or_score_resume, priority_score, build_candidate_row, retry_failed_item,
+    results_posting_key, load_store_stats, RESULT_STORE_ENABLED
+)
+from services.retry_queue import RetryQueue, STAGE_ANALYSIS, STAGE_EVALUATION
+from services.ingestion_watcher import start_ingestion_watcher
+from services.usage_tracker import empty_usage, add_usage, usage_delta, is_over_budget, format_usage, BATCH_BUDGET_USD
 from components.chatbot import chat_with_llm
-from utils.data_parser import process_certificate_field, process_award_field, process_education_field, process_experience_field
+from components.metrics_panel import show_metrics_panel, METRICS_EXPORT_DIR
+from utils.metrics import export_metrics
+from utils.profiler import SamplingProfiler
+from components.profiling_panel import save_profile, show_profiling_results
+from components.result_view import show_result_details, clear_detail_payload_cache
+from components.leaderboard import show_leaderboard, build_candidate_table
+from utils.candidate_table import CandidateTable
+from components.memory_panel import show_memory_panel, enforce_session_memory_cap, MEMORY_TRACEMALLOC
+from utils.memory_monitor import start_tracemalloc, compare_tracemalloc, slim_result
+from utils.cancellation import CancelToken, BatchCancelled, CANCEL_REASON_USER, CANCEL_REASON_DEADLINE
+import time
+import heapq
+
+# 분석 중 실시간 순위 표에 표시할 상위 지원자 수
+PROGRESSIVE_TOP_N = int(os.getenv("PROGRESSIVE_TOP_N", "10"))
+# 배치 전체 제한 시간 (초, 0이면 제한 없음). 지나면 남은 이력서는 처리하지 않고 부분 순위를 표시
+BATCH_DEADLINE_SECONDS = float(os.getenv("BATCH_DEADLINE_SECONDS", "0"))
+
+def build_live_ranking(candidate_table, top_n=PROGRESSIVE_TOP_N):
+    """지원자 테이블에서 점수순 상위 top_n 표를 만듭니다."""
+    ranked = candidate_table.query(limit=top_n)
+    return pd.DataFrame({
+        "순위": range(1, len(ranked) + 1),
+        "파일명": ranked["파일명"].map(os.path.basename).values,
+        "적합성 점수": ranked["적합성 점수"].astype("Int64").values
+    })
+
+def request_batch_cancel():
+    """중단 버튼 콜백: 진행 중인 배치에 중단을 알립니다 (다음 실행에서 부분 결과로 마무리)."""
+    st.session_state.batch_cancel_requested = True
+    cancel_token = st.session_state.get("batch_cancel_token")
+    if cancel_token:
+        cancel_token.cancel(CANCEL_REASON_USER)
+
+def finish_batch(partial, stopped_reason=None):
+    """
+    배치 진행 상태(partial)로 최종 결과를 만들어 세션에 저장합니다.
+    중단된 배치(stopped_reason)는 평가까지 끝난 지원자와 분석만 끝난 지원자로 부분 순위를 만듭니다.
+    """
+    all_results = partial["all_results"]
+    candidate_table = partial["candidate_table"]
+    priorities = partial["priorities"]
+    retry_queue = partial["retry_queue"]
+    
+    # 재시도에서 분석까지 된 이력서는 결과와 지원자 테이블에 추가 (평가는 실패했더라도)
+    for item in retry_queue.recovered + retry_queue.unrecoverable + retry_queue.pending:
+        retried_result = item.get("result")
+        if retried_result is None:
+            continue
+        if item["failed_stage"] == STAGE_ANALYSIS:
+            priorities[retried_result["file_name"]] = priority_score(partial["job_text"], retried_result)
+            all_results.append(retried_result)
+        candidate_table.upsert(build_candidate_row(retried_result, priorities[retried_result["file_name"]]))
+    
+    # 중단으로 평가하지 못한 이력서도 분석 결과는 순위표에 포함 (점수 없음)
+    scored_names = {result["file_name"] for result in all_results}
+    for unscored_result in partial["extracted_results"]:
+        if unscored_result["file_name"] not in scored_names:
+            all_results.append(unscored_result)
+            candidate_table.upsert(build_candidate_row(unscored_result, priorities.get(unscored_result["file_name"], 0.0)))
+    
+    retry_queue.abandon_pending()
+    st.session_state.retry_recovered = len(retry_queue.recovered)
+    st.session_state.failure_report = retry_queue.report_rows()
+    
+    if stopped_reason:
+        st.session_state.batch_stopped = {
+            "reason": stopped_reason,
+            "evaluated": partial["evaluated"],
+            "analyzed": len(all_results),
+            "total": partial["resume_count"]
+        }
+    
+    # 분석 구간 프로파일 저장 후, 다음 화면 렌더링도 한 번 측정
+    if partial["profiler"]:
+        save_profile(partial["profiler"].stop(), "analysis")
+        st.session_state.profile_render_pending = True
+    
+    # 배치 동안 늘어난 메모리 할당 위치 기록
+    if partial["tracemalloc_before"]:
+        st.session_state.tracemalloc_report = compare_tracemalloc(partial["tracemalloc_before"])
+    
+    # 순위표와 챗봇이 공유 저장소에서 같은 채용공고의 평가 결과를 조회할 때 사용
+    st.session_state.results_posting_key = results_posting_key(all_results)
+    
+    # 전체 결과는 공유 저장소에 있으므로 세션에는 페이지/테이블을 뺀 가벼운 결과만 보관
+    if RESULT_STORE_ENABLED:
+        all_results = [slim_result(result) for result in all_results]
+    
+    # 세션 메모리 상한을 넘으면 상세 데이터를 디스크로 이동
+    all_results = enforce_session_memory_cap(all_results)
+    
+    # 배치 단위 지표를 로컬 파일로 저장
+    try:
+        export_metrics(METRICS_EXPORT_DIR)
+    except Exception as e:
+        st.warning(f"지표 파일 저장 실패: {str(e)}")
+    
+    # 분석 완료
+    st.session_state.analysis_results = all_results
+    st.session_state.candidate_table = candidate_table
+    st.session_state.batch_partial = None
+    st.session_state.batch_cancel_token = None
+    st.session_state.batch_cancel_requested = False
+    st.session_state.analysis_in_progress = False
+    st.session_state.analysis_completed = True
+
+def describe_batch_stop(batch_stopped):
+    """중단된 배치의 안내 문구를 만듭니다."""
+    if batch_stopped["reason"] == CANCEL_REASON_DEADLINE:
+        cause = f"⏱ 배치 제한 시간({BATCH_DEADLINE_SECONDS:.0f}초)에 도달하여 분석을 중단했습니다."
+    else:
+        cause = "⏹ 사용자가 분석을 중단했습니다."
+    return (
+        f"{cause} 전체 {batch_stopped['total']}개 중 {batch_stopped['analyzed']}개를 분석했고, "
+        f"{batch_stopped['evaluated']}명까지 적합성 평가를 마친 부분 순위입니다."
+    )
 
 def main():
     st.set_page_config(
@@ -82,6 +204,9 @@ def main():
         st.error("컨테이너에 연결할 수 없습니다.")
         return
     
+    # 새 이력서를 미리 분석하는 백그라운드 수집기 (프로세스당 한 번 시작)
+    ingestion_watcher = start_ingestion_watcher()
+    
     # 채용공고 파일들 가져오기
     job_files = list_blobs_by_prefix(container_client, "job-posting/")
     
@@ -126,6 +251,9 @@ def main():
     if 'analysis_completed' not in st.session_state:
         st.session_state.analysis_completed = False
     
+    # 프로파일링 대상 배치의 결과 화면 렌더링 측정용
+    render_profiler = None
+    
     # Resume 폴더의 파일들 가져오기
     try:
         if not container_client:
@@ -152,11 +280,35 @@ def main():
             with st.container():
                 st.subheader(f"📋 Resume 폴더 파일 목록 ({len(resume_files)}개)")
                 
+                watcher_stats = ingestion_watcher.stats_snapshot() if ingestion_watcher else None
+                if watcher_stats and watcher_stats["last_poll"]:
+                    st.caption(
+                        f"백그라운드 사전 분석: 마지막 확인 {time.strftime('%H:%M:%S', time.localtime(watcher_stats['last_poll']))}, "
+                        f"분석 {watcher_stats['analyzed']}건, 평가 {watcher_stats['scored']}건, 실패 {watcher_stats['failed']}건, 대기 {watcher_stats['pending']}건"
+                    )
+                if watcher_stats and watcher_stats["recent_errors"]:
+                    with st.expander(f"⚠️ 백그라운드 사전 분석 오류 {watcher_stats['errors']}건", expanded=False):
+                        for logged_at, message in reversed(watcher_stats["recent_errors"]):
+                            st.caption(f"{time.strftime('%H:%M:%S', time.localtime(logged_at))} {message}")
+                
                 # 분석 버튼
+                # 프로파일링 모드 (이번 배치의 분석 + 결과 렌더링만 측정)
+                profile_batch = st.checkbox("🔬 이번 배치 프로파일링", value=False, help="샘플링 프로파일러로 분석과 결과 화면 렌더링 구간을 측정합니다")
+                
                 if st.button("🚀 모든 이력서 분석 시작", type="primary"):
+                    st.session_state.profile_batch = profile_batch
+                    st.session_state.profile_batch_id = time.strftime("%Y%m%d-%H%M%S")
+                    st.session_state.profile_reports = {}
+                    clear_detail_payload_cache()
                     st.session_state.analysis_in_progress = True
                     st.session_state.analysis_completed = False
                     st.session_state.analysis_results = None
+                    st.session_state.candidate_table = None
+                    st.session_state.failure_report = None
+                    st.session_state.retry_recovered = 0
+                    st.session_state.batch_stopped = None
+                    st.session_state.batch_partial = None
+                    st.session_state.batch_cancel_requested = False
                     st.rerun()
                 
                 # 파일 목록 표시
@@ -166,363 +318,243 @@ def main():
         
         # 분석 중일 때 - 완전히 다른 컨테이너
         if st.session_state.analysis_in_progress:
+            # 중단 버튼으로 이전 실행이 끊겼으면 그때까지의 결과로 마무리
+            if st.session_state.get("batch_cancel_requested") and st.session_state.get("batch_partial"):
+                finish_batch(st.session_state.batch_partial, CANCEL_REASON_USER)
+                st.rerun()
+            
             # 기존 컨텐츠를 지우고 분석 진행 상태만 표시
             analysis_container = st.empty()
             with analysis_container.container():
                 st.info("분석을 시작합니다. 잠시만 기다려주세요...")
             
+            # 중단 버튼 (누르면 진행 중인 요청을 기다리지 않고 부분 결과로 마무리)
+            st.button("⏹ 분석 중단", on_click=request_batch_cancel)
+            
             # 진행률 표시
             progress_bar = st.progress(0)
             status_text = st.empty()
+            elapsed_text = st.empty()
+            
+            # 중단 신호와 배치 제한 시간. 요청을 기다리는 동안 경과 시간을 갱신하여 중단 버튼 입력을 받음
+            cancel_token = CancelToken(
+                BATCH_DEADLINE_SECONDS,
+                heartbeat=lambda: elapsed_text.caption(f"경과 시간: {time.monotonic() - cancel_token.started_at:.0f}초")
+            )
+            st.session_state.batch_cancel_token = cancel_token
             
             all_results = []
             
-            for i, blob in enumerate(resume_files):
-                status_text.text(f"분석 중: {blob.name} ({i+1}/{len(resume_files)})")
+            # 채용공고 텍스트는 배치 시작 시 한 번만 추출
+            job_text = None
+            if job_files and selected_job:
+                job_text = extract_job_posting_text(selected_job, container_client)
+            
+            # 배치 전체 사용량 (비용 상한 확인용)
+            batch_usage = empty_usage()
+            st.session_state.budget_skipped = 0
+            
+            # 실패한 이력서는 본 처리를 멈추지 않고 대기열에 모았다가 마지막에 재시도
+            retry_queue = RetryQueue()
+            
+            extracted_results = []
+            priorities = {}
+            
+            # 평가가 끝날 때마다 행을 추가하는 지원자 테이블 (결과 화면의 순위표로도 사용)
+            candidate_table = CandidateTable()
+            
+            # 중단되었을 때 다음 실행에서 부분 결과를 만들 수 있도록 진행 상태를 세션에 보관
+            partial = {
+                "all_results": all_results,
+                "extracted_results": extracted_results,
+                "candidate_table": candidate_table,
+                "priorities": priorities,
+                "retry_queue": retry_queue,
+                "job_text": job_text,
+                "resume_count": len(resume_files),
+                "evaluated": 0,
+                # 배치 전후 메모리 할당 비교용 스냅샷
+                "tracemalloc_before": start_tracemalloc() if MEMORY_TRACEMALLOC else None,
+                # 프로파일링 모드이면 분석 구간 샘플링 시작
+                "profiler": SamplingProfiler().start() if st.session_state.get("profile_batch") else None
+            }
+            st.session_state.batch_partial = partial
+            
+            stopped_reason = None
+            try:
+                # 분석과 평가를 번갈아 진행: 이력서 한 건을 분석할 때마다 분석이 끝난 이력서 중 가장 유망한 한 명을 평가
+                # 채용공고 단어가 이력서에 많이 등장하는 순서로 평가하여, 분석이 진행되는 동안에도 상위권 순위가 채워지도록 함
+                live_caption = st.empty()
+                live_table = st.empty()
                 
-                # Document Intelligence로 분석
-                analysis_result = analyze_resume_with_ai(blob.name)
+                pending_blobs = list(resume_files)
+                scoring_queue = []  # (-우선순위, 분석 순서, 결과) 힙
+                analyzed_count = 0
+                total_steps = len(resume_files) * 2
+                done_steps = 0
                 
-                if analysis_result:
-                    # 적합성 평가 결과도 함께 저장
-                    fitness_evaluation = None
-                    fitness_score = None
+                while pending_blobs or scoring_queue:
+                    cancel_token.check()
+                    
+                    # 비용 상한을 넘으면 남은 이력서는 분석/평가하지 않음 (분석된 이력서는 점수 없이 순위표에 포함)
+                    if is_over_budget(batch_usage):
+                        st.session_state.budget_skipped += len(pending_blobs) + len(scoring_queue)
+                        break
+                    
+                    # 이력서 한 건 분석 (공유 저장소에 같은 ETag의 분석 결과가 있으면 재사용)
+                    if pending_blobs:
+                        blob = pending_blobs.pop(0)
+                        analyzed_count += 1
+                        status_text.text(f"분석 중: {blob.name} ({analyzed_count}/{len(resume_files)})")
+                        try:
+                            extracted = load_or_extract_resume(blob.name, blob.etag, job_posting=selected_job if job_files else None, cancel_token=cancel_token)
+                            extracted_results.append(extracted)
+                            add_usage(batch_usage, extracted.get("usage"))
+                            priorities[extracted["file_name"]] = priority_score(job_text, extracted)
+                            heapq.heappush(scoring_queue, (-priorities[extracted["file_name"]], analyzed_count, extracted))
+                        except ResumeAnalysisError as e:
+                            retry_queue.add(
+                                STAGE_ANALYSIS, blob.name, e,
+                                resume_version=blob.etag, job_posting=selected_job if job_files else None
+                            )
+                            total_steps -= 1
+                        done_steps += 1
+                        progress_bar.progress(done_steps / total_steps)
+                    
+                    if not scoring_queue or is_over_budget(batch_usage):
+                        continue
                     
-                    if job_files and selected_job:
-                        job_text = extract_job_posting_text(selected_job, container_client)
-                        if job_text and analysis_result["documents"] and analysis_result["documents"][0]["fields"]:
-                            fields_data = analysis_result["documents"][0]["fields"]
-                            target_fields = ["학력사항", "경력사항", "자격증", "수상경력"]
-                            resume_fields = {}
-                            
-                            for field_name in target_fields:
-                                if field_name in fields_data:
-                                    if field_name == "학력사항":
-                                        # 학력사항 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_education_field
-                                        education_data = process_education_field(fields_data[field_name]['content'])
-                                        resume_fields[field_name] = education_data
-                                    elif field_name == "경력사항":
-                                        # 경력사항 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_experience_field
-                                        experience_data = process_experience_field(fields_data[field_name]['content'])
-                                        resume_fields[field_name] = experience_data
-                                    elif field_name == "자격증":
-                                        # 자격증 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_certificate_field
-                                        certificate_data = process_certificate_field(fields_data[field_name]['content'])
-                                        resume_fields[field_name] = certificate_data
-                                    elif field_name == "수상경력":
-                                        # 수상경력 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_award_field
-                                        award_data = process_award_field(fields_data[field_name]['content'])
-                                        resume_fields[field_name] = award_data
-                                    else:
-                                        resume_fields[field_name] = fields_data[field_name]['content']
-                            
-                            if resume_fields:
-                                # API 키 상태 확인
-                                import os
-                                from dotenv import load_dotenv
-                                load_dotenv()
-                                
-                                openai_key = os.getenv("OPENAI_API_KEY")
-                                azure_endpoint = os.getenv("AZURE_ENDPOINT")
-                                
-                                # API 키 디버그 정보 추가
-                                debug_info = f"""
-🔍 디버그 정보:
-- OpenAI API 키: {'설정됨' if openai_key else '설정되지 않음'}
-- Azure 엔드포인트: {'설정됨' if azure_endpoint else '설정되지 않음'}
-- 이력서 필드 수: {len(resume_fields)}
-- 채용공고 길이: {len(job_text) if job_text else 0}자
-"""
-                                
-                                success, evaluation_result = evaluate_candidate_fit(job_text, resume_fields)
-                                if success:
-                                    fitness_evaluation = evaluation_result
-                                    fitness_score = extract_score_from_evaluation(evaluation_result)
-                                else:
-                                    # 실패 시 디버그 정보 포함
-                                    fitness_evaluation = f"❌ 평가 실패\n{debug_info}\n\n오류: {evaluation_result}"
-                                    fitness_score = None
+                    # 분석된 이력서 중 가장 유망한 한 명 평가
+                    _, _, resume_result = heapq.heappop(scoring_queue)
+                    status_text.text(f"적합성 평가 중: {resume_result['file_name']} (평가 {partial['evaluated'] + 1}/{len(extracted_results)})")
                     
-                    all_results.append({
-                        "file_name": blob.name,
-                        "analysis": analysis_result,
-                        "fitness_evaluation": fitness_evaluation,
-                        "fitness_score": fitness_score
-                    })
+                    usage_before = dict(resume_result["usage"])
+                    load_or_score_resume(resume_result, job_text, cancel_token=cancel_token)
+                    add_usage(batch_usage, usage_delta(usage_before, resume_result["usage"]))
+                    all_results.append(resume_result)
+                    partial["evaluated"] += 1
+                    if resume_result.get("evaluation_error"):
+                        retry_queue.add(STAGE_EVALUATION, resume_result["file_name"], resume_result["evaluation_error"], result=resume_result)
+                    candidate_table.upsert(build_candidate_row(resume_result, priorities[resume_result["file_name"]]))
+                    
+                    # 평가가 끝날 때마다 점수순 상위 지원자 표 갱신
+                    live_caption.caption(
+                        f"실시간 순위 (분석 {analyzed_count}/{len(resume_files)}명, 평가 완료 {partial['evaluated']}명, 상위 {PROGRESSIVE_TOP_N}명)"
+                    )
+                    live_table.dataframe(build_live_ranking(candidate_table), use_container_width=True)
+                    
+                    done_steps += 1
+                    progress_bar.progress(done_steps / total_steps)
                 
-                # 진행률 업데이트
-                progress_bar.progress((i + 1) / len(resume_files))
+                # 마지막 단계: 실패 항목 재시도 (일시적 오류만, 백오프를 두고 최대 RETRY_MAX_ATTEMPTS번)
+                if retry_queue.pending:
+                    status_text.text(f"실패 항목 재시도 대기 중: {len(retry_queue.pending)}건")
+                    retry_queue.run(
+                        lambda item: retry_failed_item(item, job_text, batch_usage, cancel_token=cancel_token),
+                        should_stop=lambda: is_over_budget(batch_usage) or cancel_token.is_cancelled(),
+                        progress_callback=lambda attempt, done, total: status_text.text(f"실패 항목 재시도 중 ({attempt}차): {done}/{total}")
+                    )
+                    if cancel_token.is_cancelled():
+                        stopped_reason = cancel_token.reason
+            except BatchCancelled as e:
+                stopped_reason = e.reason
             
-            # 분석 완료
-            st.session_state.analysis_results = all_results
-            st.session_state.analysis_in_progress = False
-            st.session_state.analysis_completed = True
+            finish_batch(partial, stopped_reason)
             st.rerun()
         
+        # 분석한 이력서 없이 중단된 경우
+        if st.session_state.analysis_completed and not st.session_state.analysis_results and st.session_state.get("batch_stopped"):
+            st.warning(describe_batch_stop(st.session_state.batch_stopped))
+        
         # 분석 완료 후 결과 표시
         if st.session_state.analysis_completed and st.session_state.analysis_results:
             all_results = st.session_state.analysis_results
             
+            # 프로파일링 배치의 첫 결과 렌더링 측정
+            if st.session_state.get("profile_render_pending"):
+                st.session_state.profile_render_pending = False
+                render_profiler = SamplingProfiler().start()
+            
             st.success(f"✅ {len(all_results)}개 파일 분석 완료!")
             
-            # 결과 요약
-            st.subheader("📊 분석 결과 요약")
+            # 중단되었거나 배치 제한 시간에 도달한 경우 부분 순위임을 안내
+            if st.session_state.get("batch_stopped"):
+                st.warning(describe_batch_stop(st.session_state.batch_stopped))
+            
+            # 비용 상한으로 조기 종료된 경우 안내
+            if st.session_state.get("budget_skipped"):
+                st.warning(f"⚠️ 배치 비용 상한(${BATCH_BUDGET_USD:.2f})에 도달하여 {st.session_state.budget_skipped}개 이력서는 평가하지 않았습니다.")
             
-            summary_data = []
+            # 재시도 결과와 복구하지 못한 항목 보고서 (해당 이력서만 다시 분석하면 됨)
+            if st.session_state.get("retry_recovered"):
+                st.caption(f"🔁 실패 후 재시도로 복구: {st.session_state.retry_recovered}건")
+            failure_report = st.session_state.get("failure_report")
+            if failure_report:
+                st.warning(f"⚠️ 복구하지 못한 항목이 {len(failure_report)}건 있습니다.")
+                with st.expander("복구하지 못한 항목 보고서", expanded=False):
+                    st.dataframe(pd.DataFrame(failure_report), use_container_width=True)
+            
+            # 토큰 및 비용 사용량 (배치 전체 / 채용공고별)
+            batch_usage = empty_usage()
+            usage_by_posting = {}
             for result in all_results:
-                file_name = result["file_name"]
-                analysis = result["analysis"]
-                
-                # 문서 정보
-                doc_count = len(analysis["documents"])
-                page_count = len(analysis["pages"])
-                table_count = len(analysis["tables"])
-                kv_count = len(analysis["key_value_pairs"])
-                
-                # 필드 정보 (첫 번째 문서 기준)
-                fields = []
-                if analysis["documents"]:
-                    fields = list(analysis["documents"][0]["fields"].keys())
-                
-                # 저장된 적합성 점수 사용
-                fitness_score = result.get("fitness_score")
-                
-                summary_data.append({
-                    "파일명": file_name,
-                    "문서 수": doc_count,
-                    "페이지 수": page_count,
-                    "테이블 수": table_count,
-                    "키-값 쌍 수": kv_count,
-                    "추출된 필드": ", ".join(fields[:5]) + ("..." if len(fields) > 5 else ""),
-                    "적합성 점수": fitness_score if fitness_score is not None else "평가 불가"
-                })
+                add_usage(batch_usage, result.get("usage"))
+                posting_name = os.path.basename(result.get("job_posting") or "채용공고 없음")
+                add_usage(usage_by_posting.setdefault(posting_name, empty_usage()), result.get("usage"))
             
-            # 점수 순으로 정렬 (점수가 높은 순)
-            df_summary = pd.DataFrame(summary_data)
-            # 적합성 점수가 숫자인 경우만 정렬 가능하도록 처리
-            df_summary['정렬용_점수'] = pd.to_numeric(df_summary['적합성 점수'].replace('평가 불가', -1), errors='coerce')
-            df_summary = df_summary.sort_values('정렬용_점수', ascending=False)
-            df_summary = df_summary.drop('정렬용_점수', axis=1)
+            st.caption(f"배치 사용량: {format_usage(batch_usage)}")
+            if len(usage_by_posting) > 1:
+                for posting_name, posting_usage in usage_by_posting.items():
+                    st.caption(f"- {posting_name}: {format_usage(posting_usage)}")
             
-            # 요약 테이블 표시
-            st.dataframe(df_summary, use_container_width=True)
+            # 로컬 텍스트 추출로 처리된 이력서 비율
+            local_count = sum(1 for result in all_results if result["analysis"].get("extraction_source") == "local")
+            st.caption(f"로컬 텍스트 추출로 처리: {local_count}/{len(all_results)}개 ({local_count / len(all_results):.0%}), 나머지는 Document Intelligence 사용")
             
-            # 상세 결과 표시
-            st.subheader("🔍 상세 분석 결과")
+            # 공유 저장소에서 재사용한 결과 (다른 세션/이전 배치에서 계산된 결과)
+            if RESULT_STORE_ENABLED:
+                reused_analyses = sum(1 for result in all_results if result.get("cached_analysis"))
+                reused_evaluations = sum(1 for result in all_results if result.get("cached_evaluation"))
+                store_stats = load_store_stats()
+                store_summary = f" (저장소 전체: 분석 {store_stats['analyses']}건, 적합성 평가 {store_stats['evaluations']}건)" if store_stats else ""
+                st.caption(f"공유 저장소 재사용: 분석 {reused_analyses}/{len(all_results)}개, 적합성 평가 {reused_evaluations}/{len(all_results)}개{store_summary}")
             
-            for result in all_results:
-                file_name = result["file_name"]
-                analysis = result["analysis"]
-                
-                with st.expander(f"📄 {file_name}", expanded=False):
-                    # 필드 정보 표시
-                    if analysis["documents"] and analysis["documents"][0]["fields"]:
-                        st.write("**🏷️ 추출된 필드:**")
-                        fields = analysis["documents"][0]["fields"]
-                        
-                        # 필드 데이터를 테이블 형태로 준비
-                        field_data = []
-                        for field_name, field_info in fields.items():
-                            # 학력사항 필드인 경우 구조화된 형태로 표시
-                            if field_name == "학력사항":
-                                from services.llm_service import process_education_field
-                                education_data = process_education_field(field_info['content'])
-                                if education_data:
-                                    # 학력사항 데이터를 JSON 형태로 표시
-                                    import json
-                                    education_json = json.dumps(education_data, ensure_ascii=False, indent=2)
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": education_json,
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                                else:
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": "학력사항 정보 없음",
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                            elif field_name == "경력사항":
-                                # 경력사항 필드인 경우 구조화된 형태로 표시
-                                from services.llm_service import process_experience_field
-                                experience_data = process_experience_field(field_info['content'])
-                                if experience_data:
-                                    # 경력사항 데이터를 JSON 형태로 표시
-                                    import json
-                                    experience_json = json.dumps(experience_data, ensure_ascii=False, indent=2)
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": experience_json,
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                                else:
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": "경력사항 정보 없음",
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                            elif field_name == "자격증":
-                                from services.llm_service import process_certificate_field
-                                certificate_data = process_certificate_field(field_info['content'])
-                                if certificate_data:
-                                    # 자격증 데이터를 JSON 형태로 표시
-                                    import json
-                                    certificate_json = json.dumps(certificate_data, ensure_ascii=False, indent=2)
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": certificate_json,
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                                else:
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": "자격증 정보 없음",
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                            elif field_name == "수상경력":
-                                # 수상경력 필드인 경우 구조화된 형태로 표시
-                                from services.llm_service import process_award_field
-                                award_data = process_award_field(field_info['content'])
-                                if award_data:
-                                    # 수상경력 데이터를 JSON 형태로 표시
-                                    import json
-                                    award_json = json.dumps(award_data, ensure_ascii=False, indent=2)
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": award_json,
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                                else:
-                                    field_data.append({
-                                        "필드명": field_name,
-                                        "타입": field_info['type'],
-                                        "값": "수상경력 정보 없음",
-                                        "신뢰도": f"{field_info['confidence']:.2f}"
-                                    })
-                            else:
-                                field_data.append({
-                                    "필드명": field_name,
-                                    "타입": field_info['type'],
-                                    "값": field_info['content'],
-                                    "신뢰도": f"{field_info['confidence']:.2f}"
-                                })
-                        
-                        # 필드 데이터를 테이블로 표시
-                        if field_data:
-                            df_fields = pd.DataFrame(field_data)
-                            st.dataframe(df_fields, use_container_width=True)
-                    
-                    # 채용 적합성 평가
-                    if job_files and selected_job:
-                        job_text = extract_job_posting_text(selected_job, container_client)
-                        if job_text:
-                            st.markdown("---")
-                            st.write("**🎯 채용 적합성 평가:**")
-                            
-                            # 이력서 필드 데이터 준비 (요약 테이블과 동일한 필드만 사용)
-                            target_fields = ["학력사항", "경력사항", "자격증", "수상경력"]
-                            resume_fields = {}
-                            
-                            for field_name in target_fields:
-                                if field_name in fields:
-                                    if field_name == "학력사항":
-                                        # 학력사항 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_education_field
-                                        education_data = process_education_field(fields[field_name]['content'])
-                                        resume_fields[field_name] = education_data
-                                    elif field_name == "경력사항":
-                                        # 경력사항 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_experience_field
-                                        experience_data = process_experience_field(fields[field_name]['content'])
-                                        resume_fields[field_name] = experience_data
-                                    elif field_name == "자격증":
-                                        # 자격증 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_certificate_field
-                                        certificate_data = process_certificate_field(fields[field_name]['content'])
-                                        resume_fields[field_name] = certificate_data
-                                    elif field_name == "수상경력":
-                                        # 수상경력 데이터를 구조화된 형태로 변환
-                                        from services.llm_service import process_award_field
-                                        award_data = process_award_field(fields[field_name]['content'])
-                                        resume_fields[field_name] = award_data
-                                    else:
-                                        resume_fields[field_name] = fields[field_name]['content']
-                            
-                            # 평가 기준 데이터 JSON 형식으로 표시
-                            st.write("**📋 평가 기준 데이터:**")
-                            import json
-                            
-                            # 추출할 주요 필드들
-                            target_fields = ["학력사항", "경력사항", "자격증", "수상경력"]
-                            extracted_info = {}
-                            
-                            for field_name in target_fields:
-                                if field_name in fields:
-                                    field_info = fields[field_name]
-                                    
-                                    # 학력사항 필드인 경우 구조화된 형태로 변환
-                                    if field_name == "학력사항":
-                                        from services.llm_service import process_education_field
-                                        education_data = process_education_field(field_info['content'])
-                                        extracted_info[field_name] = education_data
-                                    elif field_name == "경력사항":
-                                        # 경력사항 필드인 경우 구조화된 형태로 변환
-                                        from services.llm_service import process_experience_field
-                                        experience_data = process_experience_field(field_info['content'])
-                                        extracted_info[field_name] = experience_data
-                                    elif field_name == "자격증":
-                                        from services.llm_service import process_certificate_field
-                                        certificate_data = process_certificate_field(field_info['content'])
-                                        extracted_info[field_name] = certificate_data
-                                    elif field_name == "수상경력":
-                                        # 수상경력 필드인 경우 구조화된 형태로 변환
-                                        from services.llm_service import process_award_field
-                                        award_data = process_award_field(field_info['content'])
-                                        extracted_info[field_name] = award_data
-                                    else:
-                                        extracted_info[field_name] = {
-                                            "content": field_info['content'],
-                                            "confidence": field_info['confidence'],
-                                            "type": field_info['type']
-                                        }
-                            
-                            # JSON 형태로 표시
-                            if extracted_info:
-                                formatted_json = json.dumps(extracted_info, ensure_ascii=False, indent=2)
-                                st.code(formatted_json, language="json")
-                            else:
-                                st.warning("평가 기준 데이터를 추출할 수 없습니다.")
-                            
-                            # 저장된 적합성 평가 결과 사용
-                            fitness_evaluation = result.get("fitness_evaluation")
-                            
-                            if fitness_evaluation:
-                                st.success("✅ 적합성 평가 결과")
-                                st.markdown("**📊 평가 결과:**")
-                                st.text_area(
-                                    "평가 결과",
-                                    value=fitness_evaluation,
-                                    height=200,
-                                    disabled=True,
-                                    key=f"eval_result_{file_name}"
-                                )
-                            else:
-                                st.warning("⚠️ 적합성 평가 결과가 없습니다.")
+            # 업로드 전 압축이 적용된 문서의 크기 변화
+            compactions = [result["analysis"]["compaction"] for result in all_results if result["analysis"].get("compaction")]
+            if compactions:
+                original_mb = sum(info["original_bytes"] for info in compactions) / (1024 * 1024)
+                compacted_mb = sum(info["compacted_bytes"] for info in compactions) / (1024 * 1024)
+                avg_compaction = sum(info["compaction_seconds"] for info in compactions) / len(compactions)
+                avg_analysis = sum(info.get("analysis_seconds", 0) for info in compactions) / len(compactions)
+                st.caption(f"업로드 전 압축: {len(compactions)}개 문서, {original_mb:.1f}MB → {compacted_mb:.1f}MB (평균 압축 {avg_compaction:.2f}초, 평균 분석 {avg_analysis:.2f}초)")
+            
+            # 결과 요약 (배치 중 만든 지원자 테이블을 필터/정렬하여 표시)
+            if st.session_state.get("candidate_table") is None:
+                st.session_state.candidate_table = build_candidate_table(all_results)
+            filtered = show_leaderboard(st.session_state.candidate_table, posting=st.session_state.get("results_posting_key"))
+            
+            # 상세 결과 표시 (순위표 순서, 현재 페이지만, 펼친 지원자만 렌더링)
+            results_by_key = {
+                CandidateTable.row_key(result["file_name"], result.get("job_posting")): result
+                for result in all_results
+            }
+            show_result_details([results_by_key[key] for key in filtered.index if key in results_by_key])
     
     except Exception as e:
         st.error(f"파일 목록 가져오기 실패: {str(e)}")
     
+    if render_profiler:
+        save_profile(render_profiler.stop(), "render")
+    
+    # 최근 프로파일링 결과
+    show_profiling_results()
+    
+    # 단계별 처리 시간 지표 패널
+    show_metrics_panel()
+    
+    # 세션별 메모리 사용량 패널
+    show_memory_panel()
+    
     # 챗봇 기능 호출 (항상 화면 하단에 표시)
     chat_with_llm()
 
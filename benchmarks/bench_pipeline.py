@@ -0,0 +1,146 @@
+"""
+오프라인 end-to-end 벤치마크
+
+가짜 Blob/Document Intelligence/챗 모델로 analyze_resume_with_ai → 필드 파서 → evaluate_candidate_fit
+경로를 그대로 실행하고 처리량(이력서/초), p95 지연시간, 최대 RSS를 측정합니다.
+
+실행 예시 (저장소 루트에서):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --sizes 10 100 --llm-median 0.2 --llm-error-rate 0.02
+"""
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import (
+    LatencyModel, build_corpus, FakeContainerClient, FakeDocumentIntelligenceClient, FakeChatModel, FakeOpenAIModule
+)
+
+JOB_POSTING_TEXT = """[백엔드 개발자 채용]
+- Java/Spring 또는 Python 기반 API 개발 경력 3년 이상
+- Kafka, Spark 등 대용량 데이터 처리 경험 우대
+- 금융 도메인 경험 우대
+"""
+
+def install_fakes(args, corpus):
+    """서비스 모듈이 가짜 클라이언트를 사용하도록 교체합니다."""
+    import services.document_intelligence as document_intelligence
+    import services.llm_service as llm_service
+    
+    container_client = FakeContainerClient(corpus, LatencyModel(args.blob_median, error_rate=args.blob_error_rate, seed=1))
+    doc_client = FakeDocumentIntelligenceClient(corpus, LatencyModel(args.di_median, error_rate=args.di_error_rate, seed=2))
+    chat_model = FakeChatModel(LatencyModel(args.llm_median, error_rate=args.llm_error_rate, seed=3), seed=4)
+    
+    document_intelligence.get_container_client = lambda: container_client
+    document_intelligence.get_document_intelligence_client = lambda: doc_client
+    llm_service.get_llm = lambda: chat_model
+    # LangChain 경로 실패 시 사용하는 openai 폴백도 가짜 모델로 연결
+    llm_service.openai = FakeOpenAIModule(chat_model)
+    llm_service.setup_openai_client = lambda: None
+    
+    # 합성 문서는 실제 PDF가 아니므로 로컬 텍스트 추출은 건너뜀
+    document_intelligence.LOCAL_EXTRACTION_ENABLED = False
+    return container_client
+
+def percentile(values, ratio):
+    """정렬된 값에서 백분위수를 계산합니다."""
+    from utils.metrics import percentile as metrics_percentile
+    return metrics_percentile(sorted(values), ratio)
+
+def run_single(args, resume_count):
+    """이력서 resume_count건을 처리하고 측정 결과를 반환합니다."""
+    from services.document_intelligence import list_blobs_by_prefix
+    from services.resume_pipeline import process_resume
+    
+    corpus = build_corpus(resume_count, document_bytes=args.document_kb * 1024)
+    container_client = install_fakes(args, corpus)
+    resume_names = list_blobs_by_prefix(container_client, "resume/")
+    
+    latencies = []
+    failures = 0
+    
+    def timed_process(blob_name):
+        started_at = time.perf_counter()
+        result = process_resume(blob_name, JOB_POSTING_TEXT)
+        return time.perf_counter() - started_at, result
+    
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for seconds, result in executor.map(timed_process, resume_names):
+            latencies.append(seconds)
+            if result is None or result["fitness_score"] is None:
+                failures += 1
+    elapsed = time.perf_counter() - started_at
+    
+    return {
+        "resumes": resume_count,
+        "workers": args.workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "resumes_per_second": round(resume_count / elapsed, 2) if elapsed else 0.0,
+        "p50_seconds": round(percentile(latencies, 0.50), 4),
+        "p95_seconds": round(percentile(latencies, 0.95), 4),
+        "failures": failures,
+        # Linux의 ru_maxrss 단위는 KB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="오프라인 이력서 분석 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="측정할 이력서 수 목록")
+    parser.add_argument("--workers", type=int, default=1, help="동시 처리 수 (앱과 동일한 순차 처리는 1)")
+    parser.add_argument("--document-kb", type=int, default=200, help="합성 이력서 파일 크기(KB)")
+    parser.add_argument("--blob-median", type=float, default=0.002, help="Blob 다운로드 지연 중앙값(초)")
+    parser.add_argument("--di-median", type=float, default=0.01, help="DI 분석 지연 중앙값(초)")
+    parser.add_argument("--llm-median", type=float, default=0.015, help="LLM 응답 지연 중앙값(초)")
+    parser.add_argument("--blob-error-rate", type=float, default=0.0)
+    parser.add_argument("--di-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    # 하위 프로세스 모드: 한 가지 크기만 측정하고 JSON 한 줄 출력
+    if args.single:
+        print(json.dumps(run_single(args, args.single)))
+        return
+    
+    # 크기별로 별도 프로세스에서 실행해야 최대 RSS가 서로 섞이지 않음
+    passthrough = [
+        "--workers", str(args.workers),
+        "--document-kb", str(args.document_kb),
+        "--blob-median", str(args.blob_median),
+        "--di-median", str(args.di_median),
+        "--llm-median", str(args.llm_median),
+        "--blob-error-rate", str(args.blob_error_rate),
+        "--di-error-rate", str(args.di_error_rate),
+        "--llm-error-rate", str(args.llm_error_rate)
+    ]
+    
+    reports = []
+    for size in args.sizes:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_pipeline", "--single", str(size)] + passthrough,
+            capture_output=True, text=True, check=True
+        )
+        reports.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+        return
+    
+    print(f"{'이력서 수':>8} {'처리량(건/초)':>12} {'p50(초)':>9} {'p95(초)':>9} {'실패':>5} {'최대 RSS(MB)':>12}")
+    for report in reports:
+        print(
+            f"{report['resumes']:>8} {report['resumes_per_second']:>12} {report['p50_seconds']:>9} "
+            f"{report['p95_seconds']:>9} {report['failures']:>5} {report['peak_rss_mb']:>12}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import time
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+
+# 합성 이력서 필드 (services.llm_service 파서가 기대하는 DI 출력 형식)
+SCHOOLS = ["서울대학교", "연세대학교", "고려대학교", "KAIST", "한양대학교", "성균관대학교"]
+MAJORS = ["컴퓨터공학", "산업공학", "전자공학", "통계학", "경영학"]
+DEGREES = ["대학교", "석사", "박사"]
+COMPANIES = ["네이버", "카카오", "쿠팡", "토스", "NHN Cloud", "라인", "배달의민족"]
+POSITIONS = ["선임 연구원(대리)", "Tech Leader (과장)", "백엔드 개발자(사원)", "데이터 엔지니어(주임)"]
+TASKS = [
+    "- Spring Boot 기반 금융 API 개발",
+    "- Kafka 기반 실시간 데이터 파이프라인 구축",
+    "- Python + Spark 기반 리스크 탐지 모델 운영",
+    "- React 프론트엔드 및 Node.js BFF 개발",
+    "- Kubernetes 기반 MSA 전환 리딩"
+]
+CERTIFICATES = [("정보처리기사", "한국산업인력공단"), ("AWS Solutions Architect", "Amazon"), ("SQLD", "한국데이터산업진흥원")]
+AWARDS = [("사내 해커톤 대상", "네이버"), ("공개SW 개발자대회 은상", "과학기술정보통신부")]
+
+class LatencyModel:
+    """로그정규 분포를 따르는 지연시간과 오류율을 흉내 냅니다."""
+    
+    def __init__(self, median_seconds, sigma=0.5, error_rate=0.0, seed=None):
+        self.median_seconds = median_seconds
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        """지연시간만큼 대기하고, 오류율에 따라 예외를 발생시킵니다."""
+        with self.lock:
+            delay = self.random.lognormvariate(0, self.sigma) * self.median_seconds if self.median_seconds > 0 else 0
+            failed = self.random.random() < self.error_rate
+        time.sleep(delay)
+        if failed:
+            raise RuntimeError("가짜 서비스 오류 (benchmark)")
+
+def build_resume_fields(index, rng):
+    """합성 이력서 한 건의 DI 필드 내용을 만듭니다."""
+    education = []
+    for _ in range(rng.randint(1, 3)):
+        education.append("\n".join([
+            str(rng.randint(2005, 2022)),
+            rng.choice(DEGREES),
+            rng.choice(SCHOOLS),
+            "졸업",
+            f"전공: {rng.choice(MAJORS)} 학점: {rng.uniform(3.0, 4.5):.1f}/4.5"
+        ]))
+    
+    experience = []
+    for _ in range(rng.randint(0, 4)):
+        start_year = rng.randint(2010, 2022)
+        experience.append("\n".join(
+            [rng.choice(COMPANIES), rng.choice(POSITIONS)]
+            + rng.sample(TASKS, rng.randint(1, 3))
+            + [f"{start_year}-0{rng.randint(1, 9)}~{rng.choice([str(start_year + rng.randint(1, 3)) + '-12', '현재'])}"]
+        ))
+    
+    certificates = []
+    for name, issuer in rng.sample(CERTIFICATES, rng.randint(0, len(CERTIFICATES))):
+        certificates.append(f"{rng.randint(2012, 2024)}.0{rng.randint(1, 9)}.1{rng.randint(0, 9)}\n{name}\n{issuer}")
+    
+    awards = []
+    for name, organizer in rng.sample(AWARDS, rng.randint(0, len(AWARDS))):
+        awards.append(f"{rng.randint(2012, 2024)}-0{rng.randint(1, 9)}-2{rng.randint(0, 8)}\n{name}\n{organizer}")
+    
+    return {
+        "성명": f"지원자{index:05d}",
+        "학력사항": "\n".join(education),
+        "경력사항": "\n".join(experience),
+        "자격증": "\n".join(certificates),
+        "수상경력": "\n".join(awards)
+    }
+
+def build_corpus(resume_count, document_bytes=200 * 1024, seed=42):
+    """blob 이름 → (문서 바이트, DI 필드) 형태의 합성 코퍼스를 만듭니다."""
+    rng = random.Random(seed)
+    payload = bytes(rng.getrandbits(8) for _ in range(1024))
+    corpus = {}
+    for index in range(resume_count):
+        blob_name = f"resume/candidate_{index:05d}.pdf"
+        # 문서 앞부분에 blob 이름을 넣어 가짜 DI가 어떤 이력서인지 찾을 수 있도록 함
+        header = blob_name.encode() + b"\n"
+        corpus[blob_name] = {
+            "content": header + (payload * (document_bytes // len(payload) + 1))[:document_bytes],
+            "fields": build_resume_fields(index, rng)
+        }
+    return corpus
+
+class FakeDownloader:
+    def __init__(self, content, latency):
+        self.content = content
+        self.latency = latency
+    
+    def readall(self):
+        self.latency.wait()
+        return self.content
+
+class FakeBlobClient:
+    def __init__(self, container, blob_name):
+        self.container = container
+        self.blob_name = blob_name
+        self.account_name = "benchmark"
+        self.container_name = "benchmark"
+        self.url = f"https://benchmark.blob.core.windows.net/benchmark/{blob_name}"
+    
+    def download_blob(self):
+        return FakeDownloader(self.container.corpus[self.blob_name]["content"], self.container.latency)
+
+class FakeContainerClient:
+    """azure.storage.blob.ContainerClient 대체 (목록 조회와 다운로드만 지원)."""
+    
+    def __init__(self, corpus, latency):
+        self.corpus = corpus
+        self.latency = latency
+        self.credential = None
+    
+    def get_container_properties(self):
+        return {}
+    
+    def list_blobs(self, name_starts_with=None):
+        for blob_name, entry in self.corpus.items():
+            if name_starts_with is None or blob_name.startswith(name_starts_with):
+                yield SimpleNamespace(
+                    name=blob_name,
+                    size=len(entry["content"]),
+                    etag=hashlib.md5(blob_name.encode()).hexdigest()
+                )
+    
+    def get_blob_client(self, blob_name):
+        return FakeBlobClient(self, blob_name)
+
+class FakePoller:
+    def __init__(self, result, latency):
+        self._result = result
+        self.latency = latency
+        self._done = False
+        self._error = None
+    
+    def wait(self, timeout=None):
+        if not self._done:
+            try:
+                self.latency.wait()
+            except Exception as e:
+                self._error = e
+            self._done = True
+    
+    def done(self):
+        return self._done
+    
+    def result(self, timeout=None):
+        self.wait(timeout)
+        if self._error:
+            raise self._error
+        return self._result
+
+class FakeDocumentIntelligenceClient:
+    """DocumentIntelligenceClient 대체 (커스텀 모델 필드 결과를 반환)."""
+    
+    def __init__(self, corpus, latency):
+        self.corpus = corpus
+        self.latency = latency
+    
+    def find_blob_name(self, body):
+        """바이트 본문(또는 URL 요청)에서 blob 이름을 찾습니다."""
+        if isinstance(body, (bytes, bytearray)):
+            return body.split(b"\n", 1)[0].decode()
+        url_source = getattr(body, "url_source", None) or body.get("url_source")
+        return url_source.split("/benchmark/", 1)[1].split("?", 1)[0]
+    
+    def begin_analyze_document(self, model_id, body, **kwargs):
+        entry = self.corpus[self.find_blob_name(body)]
+        fields = {
+            name: SimpleNamespace(type="string", content=content, confidence=0.9)
+            for name, content in entry["fields"].items()
+        }
+        result = SimpleNamespace(
+            model_id=model_id or "benchmark-model",
+            documents=[SimpleNamespace(doc_type="resume", confidence=0.95, fields=fields)],
+            pages=[SimpleNamespace(page_number=1, lines=[], words=[])],
+            tables=[],
+            key_value_pairs=[]
+        )
+        return FakePoller(result, self.latency)
+
+class FakeChatModel:
+    """AzureChatOpenAI 대체 (점수와 설명이 포함된 응답을 반환)."""
+    
+    def __init__(self, latency, seed=None):
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.seen_prefixes = set()
+    
+    def invoke(self, prompt):
+        self.latency.wait()
+        with self.lock:
+            score = self.random.randint(30, 95)
+            # 메시지 목록이면 첫 메시지(정적 접두부)가 이전에 나온 적 있을 때 캐시 적중으로 처리
+            cached_tokens = 0
+            if isinstance(prompt, list) and prompt:
+                prefix = str(prompt[0])
+                if prefix in self.seen_prefixes:
+                    cached_tokens = len(prefix) // 2
+                self.seen_prefixes.add(prefix)
+        content = f"적합도 점수: {score}\n\n평가 이유: 합성 응답입니다."
+        prompt_tokens = len(str(prompt)) // 2
+        return SimpleNamespace(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": 40,
+                "total_tokens": prompt_tokens + 40,
+                "input_token_details": {"cache_read": cached_tokens}
+            },
+            response_metadata={}
+        )
+
+class FakeOpenAIModule:
+    """openai 모듈의 chat.completions.create 대체 (FakeChatModel 재사용)."""
+    
+    def __init__(self, chat_model):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.chat_model = chat_model
+    
+    def create(self, model, messages, **kwargs):
+        response = self.chat_model.invoke(messages[-1]["content"])
+        usage = response.usage_metadata
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=response.content))],
+            usage=SimpleNamespace(
+                prompt_tokens=usage["input_tokens"],
+                completion_tokens=usage["output_tokens"],
+                total_tokens=usage["total_tokens"]
+            )
+        )
@@ -1,10 +1,22 @@
 import streamlit as st
+import pandas as pd
 import re
 import openai
 # import config
 from dotenv import load_dotenv
 import os
 from services.llm_service import process_certificate_field, process_award_field, process_education_field, process_experience_field
+from utils.metrics import stage_timer, increment_counter
+from utils.answer_cache import AnswerCache, candidate_set_version
+from utils.context_compactor import compact_documents, pack_candidate_digests
+from services.map_reduce_qa import map_reduce_candidates, format_map_reduce_answer, MAP_REDUCE_MAX_WORKERS
+from services.prompt_templates import (
+    CHAT_PROMPT_VERSION, MAP_REDUCE_PROMPT_VERSION, GREETING_ANSWER, CHAT_SYSTEM_PROMPT, CHAT_FEW_SHOT_EXAMPLES,
+    CHAT_EXAMPLE_HUMAN_TEMPLATE, CHAT_EXAMPLE_ASSISTANT_TEMPLATE, CHAT_HUMAN_TEMPLATE
+)
+from services.resume_pipeline import load_top_evaluations
+from utils.intent_router import classify_intent, parse_structured_query, INTENT_GREETING, INTENT_HELP, INTENT_STRUCTURED, INTENT_COMPARATIVE
+from services.usage_tracker import empty_usage, add_usage, record_callback_usage, record_prompt_cache_metrics, format_usage
 
 # .env 파일 로드
 load_dotenv()
@@ -19,12 +31,64 @@ AZURE_SEARCH_INDEX_NAME = os.getenv("AZURE_SEARCH_INDEX_NAME")
 AZURE_SEARCH_API_KEY = os.getenv("AZURE_SEARCH_API_KEY")
 AZURE_SEARCH_API_VERSION = os.getenv("AZURE_SEARCH_API_VERSION")
 
+# 반복 질문 답변 캐시 (정규화한 질문 + 임베딩 유사도)
+CHAT_CACHE_ENABLED = os.getenv("CHAT_CACHE_ENABLED", "true").lower() == "true"
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "256"))
+CHAT_CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.95"))
+# 검색 인덱스를 다시 만들면 값을 바꿔 기존 캐시 답변을 무효화
+CHAT_INDEX_VERSION = os.getenv("CHAT_INDEX_VERSION", "1")
+
+# 인사/도움말/구조화된 질문을 검색 + LLM 없이 로컬에서 답변
+CHAT_INTENT_ROUTER_ENABLED = os.getenv("CHAT_INTENT_ROUTER_ENABLED", "true").lower() == "true"
+CHAT_INTENT_MIN_CONFIDENCE = float(os.getenv("CHAT_INTENT_MIN_CONFIDENCE", "0.7"))
+# 검색된 청크 정리 (중복 제거, 지원자별 묶음, 로컬 재정렬, 토큰 예산)
+CONTEXT_COMPACTION_ENABLED = os.getenv("CONTEXT_COMPACTION_ENABLED", "true").lower() == "true"
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.85"))
+# 재정렬에 임베딩 유사도도 사용할지 여부 (청크 임베딩 호출이 추가됨)
+CONTEXT_RERANK_EMBEDDINGS = os.getenv("CONTEXT_RERANK_EMBEDDINGS", "false").lower() == "true"
+
+# 비교 질문은 검색 대신 분석 결과의 지원자 요약(한 줄씩)을 한 번에 넣어 답변
+CANDIDATE_DIGEST_ENABLED = os.getenv("CANDIDATE_DIGEST_ENABLED", "true").lower() == "true"
+CANDIDATE_DIGEST_TOKEN_BUDGET = int(os.getenv("CANDIDATE_DIGEST_TOKEN_BUDGET", "8000"))
+# 요약이 한 번의 예산에 다 들어가지 않는 비교 질문은 묶음별 동시 질의(map-reduce)로 답변
+# auto: 예산 초과 시에만, always: 항상, off: 사용 안 함 (예산 안의 상위 지원자만 사용)
+MAP_REDUCE_QA_MODE = os.getenv("MAP_REDUCE_QA_MODE", "auto").lower()
+
+# 구조화된 질문에 인원 수가 없을 때 보여줄 지원자 수
+STRUCTURED_ANSWER_LIMIT = int(os.getenv("STRUCTURED_ANSWER_LIMIT", "10"))
+
+HELP_ANSWER = """이런 질문을 하실 수 있어요:
+
+**바로 답변되는 질문 (분석 결과 기준)**
+• "점수 상위 5명 알려줘"
+• "석사 지원자 목록 보여줘", "경력 3년 이상 80점 이상 지원자"
+• "자격증 있는 지원자 몇 명이야?", "평균 점수는?"
+
+**분석된 지원자 전체를 비교하는 질문 (지원자 요약 기준)**
+• "클라우드 경험이 있는 지원자 중 누가 가장 적합해?"
+• "백엔드 개발 경험이 있는 지원자를 비교해줘"
+
+**이력서 내용을 검색해서 답변하는 질문**
+• "Python 경험자 찾아줘"
+• "이 지원자에게 면접에서 물어볼 질문 추천해줘"
+
+이력서 분석을 먼저 실행하면 점수/학력/경력 기준 질문에 더 정확하게 답변할 수 있습니다."""
+
+INTENT_LABELS = {
+    INTENT_GREETING: "인사",
+    INTENT_HELP: "도움말",
+    INTENT_STRUCTURED: "분석 결과 조회"
+}
+
 # LangChain 관련 import (선택적)
 try:
     from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
     from langchain_community.retrievers import AzureCognitiveSearchRetriever
+    from langchain_community.callbacks import get_openai_callback
     from langchain.chains import RetrievalQA
     from langchain.prompts import ChatPromptTemplate, FewShotChatMessagePromptTemplate
+    from langchain.schema import Document
     LANGCHAIN_AVAILABLE = True
 except ImportError:
     LANGCHAIN_AVAILABLE = False
@@ -248,58 +312,25 @@ def get_qa_chain():
         
         if not llm or not retriever:
             return None
-            
-        # Few-shot 예시 데이터 정의
-        examples = [
-            {
-                "question": "백엔드 개발 경험이 있는 지원자를 찾아주세요",
-                "context": "지원자 A: Java/Spring 백엔드 개발 3년 경험\n지원자 B: Node.js/Express 백엔드 개발 2년 경험",
-                "answer": "검색된 문서를 확인한 결과, 백엔드 개발 경험이 있는 지원자를 찾았습니다:\n\n- 지원자 A: Java/Spring을 사용한 백엔드 개발 3년 경험\n- 지원자 B: Node.js/Express 백엔드 개발 2년 경험"
-            },
-            {
-                "question": "머신러닝 전문가를 찾아주세요",
-                "context": "지원자 A: 웹 개발 경험\n지원자 B: 모바일 앱 개발 경험",
-                "answer": "검색된 문서를 확인했지만, 머신러닝 관련 경험이 있는 지원자 정보를 찾을 수 없습니다."
-            },
-            {
-                "question": "안녕하세요",
-                "context": "",
-                "answer": "안녕하세요! 저는 채용 지원 시스템의 AI 어시스턴트입니다.\n\n지원자와 채용공고에 대한 다양한 질문에 답변해드릴 수 있습니다. 예를 들어:\n\n• 지원자들의 학력사항이나 경력사항을 물어보실 수 있어요\n• 특정 지원자의 적합성이나 평가 기준을 알아보실 수 있어요\n• 면접에서 물어볼 수 있는 질문들을 알아보실 수 있어요\n• 특정 기술이나 경험을 가진 지원자를 찾아보실 수 있어요\n\n궁금한 점이 있으시면 언제든 편하게 물어보세요!"
-            }
-        ]
-
+        
+        # 프롬프트 순서: 정적 접두부(시스템 프롬프트 + few-shot 예시, CHAT_PROMPT_VERSION) → 가변 접미부(검색 문맥 + 질문)
         # 예시 포맷팅 템플릿
         example_prompt = ChatPromptTemplate.from_messages([
-            ("human", "질문: {question}\n\n지원자 정보:\n{context}"),
-            ("assistant", "{answer}")
+            ("human", CHAT_EXAMPLE_HUMAN_TEMPLATE),
+            ("assistant", CHAT_EXAMPLE_ASSISTANT_TEMPLATE)
         ])
 
         # Few-shot 프롬프트 템플릿 생성
         few_shot_prompt = FewShotChatMessagePromptTemplate(
             example_prompt=example_prompt,
-            examples=examples
+            examples=CHAT_FEW_SHOT_EXAMPLES
         )
 
         # 최종 프롬프트 템플릿 구성
         final_prompt = ChatPromptTemplate.from_messages([
-            ("system", """당신은 채용 지원 시스템의 AI 어시스턴트입니다. 지원자와 채용공고에 대한 질문에 답변해주세요.
-
-다음 규칙에 따라 답변해주세요:
-
-1. 일반적인 인사말이나 대화에는 다음 형식으로 답변해주세요:
-   "안녕하세요! 저는 채용 지원 시스템의 AI 어시스턴트입니다.\n\n지원자와 채용공고에 대한 다양한 질문에 답변해드릴 수 있습니다. 예를 들어:\n\n• 지원자들의 학력사항이나 경력사항을 물어보실 수 있어요\n• 특정 지원자의 적합성이나 평가 기준을 알아보실 수 있어요\n• 면접에서 물어볼 수 있는 질문들을 알아보실 수 있어요\n• 특정 기술이나 경험을 가진 지원자를 찾아보실 수 있어요\n\n궁금한 점이 있으시면 언제든 편하게 물어보세요!"
-2. 지원자나 채용공고에 대한 구체적인 질문이면, 제공된 문서를 참고하여 정확하고 구체적으로 답변해주세요.
-3. 특정 기술이나 경험에 대한 질문인 경우, 해당 기술을 사용한 경험이나 관련 자격증을 가진 지원자를 우선적으로 추천해주세요.
-4. 경력사항에서 해당 기술을 사용한 구체적인 프로젝트나 업무 내용을 언급해주세요.
-5. 답변은 한국어로 해주세요.
-6. 가능하면 구체적인 예시나 설명을 포함해주세요.
-7. 분석되지 않은 이력서나 존재하지 않는 지원자에 대해서는 언급하지 마세요.
-8. 제공된 문서에 없는 내용은 추측하지 마세요.
-9. 정보가 부족한 경우 "해당 정보를 찾을 수 없습니다"라고 답변하세요.
-10. 경력사항, 자격증, 학력사항, 수상경력을 종합적으로 고려해서 답변해주세요.
-11. 가장 적합한 지원자부터 순서대로 설명해주세요."""),
+            ("system", CHAT_SYSTEM_PROMPT),
             few_shot_prompt,
-            ("human", "다음은 지원자의 이력 정보 및 채용공고와 관련된 문서들입니다:\n\n<지원자 정보 및 검색된 문서>\n{context}\n\n---\n\n사용자 질문: {question}")
+            ("human", CHAT_HUMAN_TEMPLATE)
         ])
 
         qa_chain = RetrievalQA.from_chain_type(
@@ -314,6 +345,250 @@ def get_qa_chain():
         st.error(f"QA 체인 초기화 실패: {str(e)}")
         return None
 
+@st.cache_resource
+def get_answer_cache():
+    """프로세스 전체에서 공유하는 답변 캐시를 반환합니다."""
+    return AnswerCache(max_entries=CHAT_CACHE_MAX_ENTRIES, similarity_threshold=CHAT_CACHE_SIMILARITY)
+
+def get_cache_version():
+    """현재 세션의 지원자 집합과 검색 인덱스 버전으로 캐시 버전을 계산합니다."""
+    return candidate_set_version(
+        st.session_state.get("analysis_results"),
+        f"{AZURE_SEARCH_INDEX_NAME}:{CHAT_INDEX_VERSION}"
+    )
+
+def embed_question(question):
+    """질문 임베딩을 계산합니다. 임베딩 모델을 쓸 수 없으면 None을 반환합니다."""
+    if not LANGCHAIN_AVAILABLE:
+        return None
+    embeddings = get_embedding_model()
+    if not embeddings:
+        return None
+    try:
+        with stage_timer("chat.embed_question"):
+            return embeddings.embed_query(question)
+    except Exception:
+        return None
+
+def lookup_cached_answer(cache, cache_version, question):
+    """
+    캐시에서 답변을 찾습니다. (캐시 항목, 질문 임베딩)을 반환합니다.
+    정규화한 질문이 같으면 임베딩 계산 없이 바로 반환합니다.
+    """
+    cached = cache.lookup_exact(cache_version, question)
+    if cached:
+        increment_counter("chat_answer_cache", result="exact_hit")
+        return cached, None
+    
+    question_embedding = embed_question(question)
+    cached = cache.lookup_similar(cache_version, question_embedding)
+    increment_counter("chat_answer_cache", result="semantic_hit" if cached else "miss")
+    return cached, question_embedding
+
+def answer_with_compacted_context(qa_chain, question, question_embedding=None):
+    """
+    검색 결과를 정리(중복 제거, 재정렬, 토큰 예산)한 뒤 QA 체인의 문서 결합 단계로 답변합니다.
+    (답변, 문맥 통계)를 반환합니다.
+    """
+    retriever = get_retriever()
+    with stage_timer("chat.retrieve"):
+        documents = retriever.invoke(question)
+    
+    document_embeddings = None
+    if CONTEXT_RERANK_EMBEDDINGS and documents:
+        embeddings = get_embedding_model()
+        if embeddings:
+            try:
+                question_embedding = question_embedding or embeddings.embed_query(question)
+                document_embeddings = embeddings.embed_documents([document.page_content for document in documents])
+            except Exception:
+                document_embeddings = None
+    
+    with stage_timer("chat.compact_context"):
+        packed_documents, context_stats = compact_documents(
+            question,
+            documents,
+            CONTEXT_TOKEN_BUDGET,
+            dedup_threshold=CONTEXT_DEDUP_THRESHOLD,
+            query_embedding=question_embedding if document_embeddings else None,
+            document_embeddings=document_embeddings
+        )
+    increment_counter("chat_context_tokens", context_stats["original_tokens"], kind="retrieved")
+    increment_counter("chat_context_tokens", context_stats["packed_tokens"], kind="packed")
+    
+    response = qa_chain.combine_documents_chain.invoke({"input_documents": packed_documents, "question": question})
+    return response.get("output_text"), context_stats
+
+def format_context_stats(context_stats):
+    """문맥 정리 통계를 한 줄로 표시합니다."""
+    return (
+        f"검색 문맥: 청크 {context_stats['retrieved_chunks']}개 → {context_stats['packed_chunks']}개 "
+        f"(중복 {context_stats['deduplicated_chunks']}개, 지원자 {context_stats['candidates']}명), "
+        f"약 {context_stats['original_tokens']:,} → {context_stats['packed_tokens']:,} 토큰 "
+        f"({context_stats['tokens_saved']:,} 절약)"
+    )
+
+def answer_with_candidate_digests(qa_chain, question):
+    """
+    지원자 테이블의 요약 줄(점수순)을 토큰 예산까지 하나의 문맥으로 묶어 QA 체인의 문서 결합 단계로 답변합니다.
+    (답변, 요약 통계)를 반환합니다.
+    """
+    frame = st.session_state.candidate_table.query()
+    packed, digest_stats = pack_candidate_digests(frame["요약"].tolist(), CANDIDATE_DIGEST_TOKEN_BUDGET)
+    header = f"[분석된 지원자 요약: 전체 {digest_stats['total_candidates']}명 중 점수순 {digest_stats['packed_candidates']}명]"
+    header += "\n형식: 파일명 | 적합성 점수 | 최종 학력 | 총 경력 | 주요 기술 | 자격증"
+    document = Document(page_content=header + "\n" + "\n".join(packed), metadata={"source": "candidate_digests"})
+    increment_counter("chat_context_tokens", digest_stats["packed_tokens"], kind="digest")
+    
+    response = qa_chain.combine_documents_chain.invoke({"input_documents": [document], "question": question})
+    return response.get("output_text"), digest_stats
+
+def should_map_reduce():
+    """비교 질문을 map-reduce로 답변할지 결정합니다 (auto이면 요약 줄이 예산을 넘을 때만)."""
+    if MAP_REDUCE_QA_MODE == "off":
+        return False
+    if MAP_REDUCE_QA_MODE == "always":
+        return True
+    digests = st.session_state.candidate_table.frame()["요약"].tolist()
+    _, digest_stats = pack_candidate_digests(digests, CANDIDATE_DIGEST_TOKEN_BUDGET)
+    return digest_stats["packed_candidates"] < digest_stats["total_candidates"]
+
+def answer_with_map_reduce(question):
+    """
+    지원자 요약 전체를 묶음별로 동시에 질문하고 관련도순으로 합쳐 답변합니다.
+    (답변, 통계, 사용량)을 반환합니다. 묶음 요청은 작업 스레드에서 실행되므로 사용량은 직접 집계합니다.
+    """
+    frame = st.session_state.candidate_table.query()
+    fitness_scores = {
+        os.path.basename(file_name): float(score)
+        for file_name, score in zip(frame["파일명"], frame["적합성 점수"]) if not pd.isna(score)
+    }
+    
+    progress_bar = st.progress(0.0, text="지원자 묶음별로 질문하는 중...")
+    def report_progress(done, total):
+        progress_bar.progress(done / total, text=f"지원자 묶음별로 질문하는 중... ({done}/{total})")
+    
+    ranked, map_usage, map_reduce_stats = map_reduce_candidates(
+        get_llm(),
+        question,
+        frame["요약"].tolist(),
+        fitness_scores=fitness_scores,
+        progress_callback=report_progress
+    )
+    progress_bar.empty()
+    return format_map_reduce_answer(ranked, map_reduce_stats, fitness_scores), map_reduce_stats, map_usage
+
+def format_map_reduce_stats(map_reduce_stats):
+    """map-reduce 질의 통계를 한 줄로 표시합니다."""
+    text = (
+        f"지원자 전체 질의: {map_reduce_stats['candidates']}명, 묶음 {map_reduce_stats['completed_shards']}/{map_reduce_stats['shards']}개 완료 "
+        f"(동시 {MAP_REDUCE_MAX_WORKERS}개), {map_reduce_stats['elapsed_seconds']}초"
+    )
+    if map_reduce_stats["stopped_reason"]:
+        text += f", 상한 도달: {map_reduce_stats['stopped_reason']}"
+    return text
+
+def format_digest_stats(digest_stats):
+    """지원자 요약 문맥 통계를 한 줄로 표시합니다."""
+    return (
+        f"지원자 요약 문맥: {digest_stats['packed_candidates']}/{digest_stats['total_candidates']}명, "
+        f"약 {digest_stats['packed_tokens']:,} 토큰"
+    )
+
+def has_candidate_digests():
+    """세션에 요약 줄이 있는 분석 결과가 있는지 확인합니다."""
+    candidate_table = st.session_state.get("candidate_table")
+    return candidate_table is not None and len(candidate_table) > 0
+
+def is_score_ranking_query(query):
+    """학력/경력/자격증 조건 없이 점수 높은 순으로 순위를 묻는 질문인지 확인합니다."""
+    return not (
+        query["degrees"] or query["min_years"] is not None or query["require_certificate"]
+        or query["count_only"] or query["average"] or query["ascending"]
+    )
+
+def answer_from_shared_store(query, candidate_table):
+    """
+    공유 저장소에서 현재 결과의 채용공고로 평가된 점수 상위 지원자를 조회하여 답변합니다.
+    저장소를 사용할 수 없거나 결과가 없으면 None을 반환합니다 (세션의 지원자 테이블로 답변).
+    """
+    limit = query["limit"] or STRUCTURED_ANSWER_LIMIT
+    rows = load_top_evaluations(st.session_state.get("results_posting_key"), limit, min_score=query["min_score"])
+    if not rows:
+        return None
+    
+    # 이번 세션에서 분석한 지원자는 학력/경력 정보도 함께 표시
+    details = candidate_table.frame().drop_duplicates("파일명").set_index("파일명")
+    lines = [f"이 채용공고로 평가된 지원자(다른 세션 포함) 중 점수순 상위 {len(rows)}명입니다:\n"]
+    for rank, row in enumerate(rows, start=1):
+        line = f"{rank}. {os.path.basename(row['file_name'])} - {row['fitness_score']}점"
+        if row["file_name"] in details.index:
+            detail = details.loc[row["file_name"]]
+            certificates = f", 자격증: {detail['자격증 목록']}" if detail["자격증 목록"] else ""
+            line += f" ({detail['최종 학력']}, 경력 {detail['경력(년)']}년{certificates})"
+        lines.append(line)
+    return "\n".join(lines)
+
+def answer_structured_query(question):
+    """점수/학력/경력 조건 질문에 세션의 지원자 테이블로 답변합니다."""
+    candidate_table = st.session_state.get("candidate_table")
+    if candidate_table is None or len(candidate_table) == 0:
+        return "아직 분석된 지원자가 없습니다. 먼저 '모든 이력서 분석 시작'으로 이력서를 분석해주세요."
+    
+    query = parse_structured_query(question)
+    
+    # 점수 조건만 있는 상위 N명 질문은 공유 저장소의 채용공고별 점수 인덱스로 조회 (다른 세션에서 평가한 지원자 포함)
+    if is_score_ranking_query(query):
+        answer = answer_from_shared_store(query, candidate_table)
+        if answer:
+            return answer
+    
+    matched = candidate_table.query(
+        min_score=query["min_score"],
+        degrees=query["degrees"],
+        min_years=query["min_years"],
+        require_certificate=query["require_certificate"],
+        sort_keys=[("적합성 점수", query["ascending"])]
+    )
+    
+    if query["count_only"]:
+        return f"조건에 맞는 지원자는 {len(matched)}명입니다 (전체 {len(candidate_table)}명)."
+    
+    if query["average"]:
+        scores = matched["적합성 점수"].dropna()
+        if scores.empty:
+            return "평가된 지원자가 없어 평균 점수를 계산할 수 없습니다."
+        return f"평가된 지원자 {len(scores)}명의 평균 적합성 점수는 {scores.mean():.1f}점입니다 (최고 {scores.max():.0f}점, 최저 {scores.min():.0f}점)."
+    
+    if matched.empty:
+        return "조건에 맞는 지원자를 찾을 수 없습니다."
+    
+    limit = query["limit"] or STRUCTURED_ANSWER_LIMIT
+    order = "점수 낮은 순" if query["ascending"] else "점수순 상위"
+    lines = [f"조건에 맞는 지원자 {len(matched)}명 중 {order} {min(limit, len(matched))}명입니다:\n"]
+    for rank, (_, row) in enumerate(matched.head(limit).iterrows(), start=1):
+        score = "평가 불가" if pd.isna(row["적합성 점수"]) else f"{row['적합성 점수']:.0f}점"
+        certificates = f", 자격증: {row['자격증 목록']}" if row["자격증 목록"] else ""
+        lines.append(f"{rank}. {os.path.basename(row['파일명'])} - {score} ({row['최종 학력']}, 경력 {row['경력(년)']}년{certificates})")
+    return "\n".join(lines)
+
+def route_local_intent(question):
+    """
+    질문 의도를 분류하여 로컬에서 답변할 수 있으면 (의도, 답변)을, 아니면 (의도, None)을 반환합니다.
+    인사/도움말은 템플릿으로, 구조화된 질문은 지원자 테이블로 답변합니다.
+    비교 질문은 (의도, None)을 반환하며, 지원자 요약 문맥으로 LLM이 답변합니다.
+    """
+    intent, source, confidence = classify_intent(question, CHAT_INTENT_MIN_CONFIDENCE)
+    increment_counter("chat_intent", intent=intent, source=source)
+    
+    if intent == INTENT_GREETING:
+        return intent, GREETING_ANSWER
+    if intent == INTENT_HELP:
+        return intent, HELP_ANSWER
+    if intent == INTENT_STRUCTURED:
+        return intent, answer_structured_query(question)
+    return intent, None
+
 def chat_with_llm():
     """챗봇 인터페이스를 제공합니다."""
     st.subheader("🤖 AI 챗봇")
@@ -326,6 +601,18 @@ def chat_with_llm():
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            if message.get("usage"):
+                st.caption(f"사용량: {format_usage(message['usage'])}")
+            if message.get("cached"):
+                st.caption("⚡ 캐시된 답변")
+            if message.get("local_intent"):
+                st.caption(f"🧭 로컬 응답 ({INTENT_LABELS[message['local_intent']]})")
+            if message.get("context_stats"):
+                st.caption(format_context_stats(message["context_stats"]))
+            if message.get("digest_stats"):
+                st.caption(format_digest_stats(message["digest_stats"]))
+            if message.get("map_reduce_stats"):
+                st.caption(format_map_reduce_stats(message["map_reduce_stats"]))
     
     # 사용자 입력
     if prompt := st.chat_input("질문을 입력하세요..."):
@@ -338,32 +625,105 @@ def chat_with_llm():
         with st.chat_message("assistant"):
             message_placeholder = st.empty()
             full_response = ""
+            turn_usage = empty_usage()
+            cached = None
+            local_intent = None
+            context_stats = None
+            digest_stats = None
+            map_reduce_stats = None
+            map_usage = None
             
             try:
-                # QA 체인 가져오기
-                qa_chain = get_qa_chain()
+                # 인사/도움말/구조화된 질문은 검색 + LLM 없이 로컬에서 답변
+                local_answer = None
+                intent = None
+                if CHAT_INTENT_ROUTER_ENABLED:
+                    with stage_timer("chat.intent_router"):
+                        intent, local_answer = route_local_intent(prompt)
+                    if local_answer:
+                        local_intent = intent
                 
-                if qa_chain:
-                    # 질문에 대한 응답 생성
-                    response = qa_chain.invoke({"query": prompt})
+                # 같은(또는 매우 비슷한) 질문의 답변이 캐시에 있으면 재사용
+                answer_cache = get_answer_cache() if CHAT_CACHE_ENABLED and not local_answer else None
+                question_embedding = None
+                if answer_cache:
+                    cache_version = get_cache_version()
+                    cached, question_embedding = lookup_cached_answer(answer_cache, cache_version, prompt)
+                
+                if local_answer:
+                    full_response = local_answer
+                elif cached:
+                    full_response = cached["answer"]
+                else:
+                    # QA 체인 가져오기
+                    qa_chain = get_qa_chain()
                     
-                    if response and "result" in response:
-                        full_response = response["result"]
+                    if qa_chain:
+                        # 질문에 대한 응답 생성
+                        with stage_timer("qa_chain.invoke"), get_openai_callback() as usage_callback:
+                            if CANDIDATE_DIGEST_ENABLED and intent == INTENT_COMPARATIVE and has_candidate_digests():
+                                if should_map_reduce():
+                                    answer, map_reduce_stats, map_usage = answer_with_map_reduce(prompt)
+                                else:
+                                    answer, digest_stats = answer_with_candidate_digests(qa_chain, prompt)
+                            elif CONTEXT_COMPACTION_ENABLED:
+                                answer, context_stats = answer_with_compacted_context(qa_chain, prompt, question_embedding)
+                            else:
+                                response = qa_chain.invoke({"query": prompt})
+                                answer = response.get("result") if response else None
+                        record_callback_usage(turn_usage, usage_callback)
+                        record_prompt_cache_metrics(CHAT_PROMPT_VERSION, turn_usage)
+                        if map_usage:
+                            record_prompt_cache_metrics(MAP_REDUCE_PROMPT_VERSION, map_usage)
+                            add_usage(turn_usage, map_usage)
+                        
+                        if answer:
+                            full_response = answer
+                            # 시간/비용 상한이나 실패로 일부 지원자만 확인한 답변은 캐시하지 않음 (다음 질문은 다시 전체 확인)
+                            partial_answer = map_reduce_stats and (map_reduce_stats["stopped_reason"] or map_reduce_stats["failed_shards"])
+                            if answer_cache and not partial_answer:
+                                answer_cache.put(cache_version, prompt, full_response, question_embedding)
+                        else:
+                            full_response = "죄송합니다. 응답을 생성할 수 없습니다."
                     else:
-                        full_response = "죄송합니다. 응답을 생성할 수 없습니다."
-                else:
-                    full_response = "죄송합니다. AI 서비스를 초기화할 수 없습니다."
+                        full_response = "죄송합니다. AI 서비스를 초기화할 수 없습니다."
                 
             except Exception as e:
                 full_response = f"오류가 발생했습니다: {str(e)}"
             
             # 응답 표시
             message_placeholder.markdown(full_response)
+            if turn_usage["llm_calls"]:
+                st.caption(f"사용량: {format_usage(turn_usage)}")
+            if cached:
+                st.caption("⚡ 캐시된 답변")
+            if local_intent:
+                st.caption(f"🧭 로컬 응답 ({INTENT_LABELS[local_intent]})")
+            if context_stats:
+                st.caption(format_context_stats(context_stats))
+            if digest_stats:
+                st.caption(format_digest_stats(digest_stats))
+            if map_reduce_stats:
+                st.caption(format_map_reduce_stats(map_reduce_stats))
         
-        # AI 응답을 세션에 추가
-        st.session_state.messages.append({"role": "assistant", "content": full_response})
+        # AI 응답을 세션에 추가 (대화 전체 사용량도 누적)
+        st.session_state.messages.append({"role": "assistant", "content": full_response, "usage": turn_usage, "cached": bool(cached), "local_intent": local_intent, "context_stats": context_stats, "digest_stats": digest_stats, "map_reduce_stats": map_reduce_stats})
+        st.session_state.chat_usage = add_usage(st.session_state.get("chat_usage", empty_usage()), turn_usage)
+    
+    # 대화 전체 사용량
+    if st.session_state.get("chat_usage"):
+        st.caption(f"대화 누적 사용량: {format_usage(st.session_state.chat_usage)}")
+    
+    # 답변 캐시 적중률 (프로세스 전체)
+    if CHAT_CACHE_ENABLED:
+        cache_stats = get_answer_cache().stats
+        st.caption(
+            f"답변 캐시 적중률: {get_answer_cache().hit_rate():.0%} "
+            f"(정확 일치 {cache_stats['exact_hits']}, 유사 질문 {cache_stats['semantic_hits']}, 미적중 {cache_stats['misses']})"
+        )
     
     # 채팅 기록 초기화 버튼
     if st.button("채팅 기록 초기화"):
         st.session_state.messages = []
+        st.session_state.chat_usage = empty_usage()
         st.rerun() 
\ No newline at end of file
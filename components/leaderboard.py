@@ -0,0 +1,89 @@
+import streamlit as st
+import pandas as pd
+import os
+from services.resume_pipeline import build_candidate_row, load_top_evaluations
+from utils.candidate_table import CandidateTable, DEGREE_LABELS
+
+# 정렬 기준으로 선택할 수 있는 컬럼
+SORTABLE_COLUMNS = ["적합성 점수", "키워드 일치도", "경력(년)", "학력 수준", "자격증 수", "수상 수", "예상 비용($)", "파일명"]
+
+# 공유 저장소 순위(다른 세션 평가 포함)에 표시할 지원자 수
+SHARED_RANKING_LIMIT = int(os.getenv("SHARED_RANKING_LIMIT", "20"))
+
+# 화면에 표시하지 않는 내부 컬럼
+HIDDEN_COLUMNS = ["학력 수준", "자격증 보유", "요약"]
+
+def build_candidate_table(results):
+    """분석 결과 목록으로 지원자 테이블을 만듭니다 (배치 중 만든 테이블이 없을 때 사용)."""
+    table = CandidateTable()
+    for result in results:
+        table.upsert(build_candidate_row(result))
+    return table
+
+def format_candidate_frame(frame):
+    """지원자 테이블을 화면 표시용으로 변환합니다."""
+    display = frame.drop(columns=HIDDEN_COLUMNS)
+    display["파일명"] = display["파일명"].map(os.path.basename)
+    display["채용공고"] = display["채용공고"].fillna("").map(os.path.basename)
+    display["적합성 점수"] = display["적합성 점수"].astype("Int64")
+    return display.reset_index(drop=True)
+
+def show_shared_ranking(posting, min_score=None):
+    """공유 저장소에서 같은 채용공고로 평가된 지원자(다른 세션 포함)의 점수 순위를 표시합니다."""
+    rows = load_top_evaluations(posting, SHARED_RANKING_LIMIT, min_score=min_score)
+    if not rows:
+        return
+    
+    with st.expander(f"🌐 공유 저장소 순위 (이 채용공고를 평가한 모든 세션, 상위 {len(rows)}명)", expanded=False):
+        shared_frame = pd.DataFrame([
+            {"파일명": os.path.basename(row["file_name"]), "적합성 점수": row["fitness_score"]}
+            for row in rows
+        ])
+        st.dataframe(shared_frame, use_container_width=True)
+
+def show_leaderboard(table, posting=None):
+    """
+    필터와 다중 정렬을 적용한 지원자 순위표를 표시합니다.
+    posting(채용공고 저장소 키)을 전달하면 공유 저장소의 점수 순위도 함께 표시합니다.
+    필터/정렬된 테이블(원본 컬럼 유지)을 반환합니다.
+    """
+    st.subheader("📊 분석 결과 요약")
+    
+    with st.expander("🔎 필터 및 정렬", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            min_score = st.slider("최소 적합성 점수", min_value=0, max_value=100, value=0, key="leaderboard_min_score")
+            min_years = st.number_input("최소 경력(년)", min_value=0.0, value=0.0, step=0.5, key="leaderboard_min_years")
+        with col2:
+            degrees = st.multiselect("최종 학력", DEGREE_LABELS, key="leaderboard_degrees")
+            require_certificate = st.checkbox("자격증 보유자만", key="leaderboard_require_certificate")
+        with col3:
+            certificate_keyword = st.text_input("자격증 검색", key="leaderboard_certificate_keyword")
+            name_keyword = st.text_input("파일명 검색", key="leaderboard_name_keyword")
+        
+        # 선택한 순서대로 정렬 우선순위가 적용됨
+        sort_options = [f"{column} {direction}" for column in SORTABLE_COLUMNS for direction in ("↓", "↑")]
+        sort_selection = st.multiselect(
+            "정렬 기준 (선택 순서대로 적용)",
+            sort_options,
+            default=["적합성 점수 ↓"],
+            key="leaderboard_sort"
+        )
+    
+    sort_keys = [(option[:-2], option.endswith("↑")) for option in sort_selection]
+    filtered = table.query(
+        min_score=min_score,
+        degrees=degrees,
+        min_years=min_years,
+        require_certificate=require_certificate,
+        certificate_keyword=certificate_keyword.strip(),
+        name_keyword=name_keyword.strip(),
+        sort_keys=sort_keys
+    )
+    
+    st.caption(f"전체 {len(table)}명 중 {len(filtered)}명 표시")
+    st.dataframe(format_candidate_frame(filtered), use_container_width=True)
+    
+    if posting:
+        show_shared_ranking(posting, min_score=min_score or None)
+    return filtered
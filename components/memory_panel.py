@@ -0,0 +1,125 @@
+import streamlit as st
+import pandas as pd
+from dotenv import load_dotenv
+import os
+import time
+from utils.memory_monitor import deep_sizeof, update_session_report, get_session_reports, evict_result_details
+
+# .env 파일 로드
+load_dotenv()
+
+# 세션당 분석 결과 메모리 상한 (MB, 0이면 제한 없음)
+SESSION_MEMORY_CAP_MB = float(os.getenv("SESSION_MEMORY_CAP_MB", "0"))
+# 상한 초과 시 상세 데이터를 메모리에 남겨 둘 점수 상위 지원자 수 (나머지는 상세 데이터 제거)
+SESSION_FULL_RESULTS_TOP_N = int(os.getenv("SESSION_FULL_RESULTS_TOP_N", "50"))
+# 배치 전후 tracemalloc 스냅샷 비교 여부 (측정 중에는 메모리/속도 오버헤드가 있음)
+MEMORY_TRACEMALLOC = os.getenv("MEMORY_TRACEMALLOC", "false").lower() == "true"
+
+def get_session_id():
+    """현재 Streamlit 세션 ID를 반환합니다."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        if ctx:
+            return ctx.session_id
+    except Exception:
+        pass
+    return "local"
+
+def measure_session_memory():
+    """현재 세션의 분석 결과, 채팅 메시지, 기타 상태의 대략적인 크기를 기록합니다."""
+    sizes = {
+        "분석 결과": deep_sizeof(st.session_state.get("analysis_results")),
+        "채팅 메시지": deep_sizeof(st.session_state.get("messages")),
+        "기타 세션 상태": deep_sizeof({
+            key: value for key, value in st.session_state.items()
+            if key not in ("analysis_results", "messages")
+        })
+    }
+    update_session_report(get_session_id(), sizes)
+    return sizes
+
+def measure_cached_clients():
+    """프로세스 전체에서 공유하는 캐시 클라이언트들의 대략적인 크기를 반환합니다."""
+    from services.azure_clients import get_container_client, get_document_intelligence_client
+    from services.llm_service import get_llm
+    from components.chatbot import get_qa_chain
+    
+    sizes = {}
+    for name, getter in [
+        ("Blob 컨테이너", get_container_client),
+        ("Document Intelligence", get_document_intelligence_client),
+        ("평가용 LLM", get_llm),
+        ("QA 체인", get_qa_chain)
+    ]:
+        try:
+            sizes[name] = deep_sizeof(getter())
+        except Exception:
+            sizes[name] = 0
+    return sizes
+
+def enforce_session_memory_cap(results):
+    """
+    분석 결과가 세션 메모리 상한을 넘으면 점수 상위 SESSION_FULL_RESULTS_TOP_N명만 상세 데이터를 남기고
+    나머지는 상세 데이터를 제거한 결과 목록을 반환합니다 (순서는 유지).
+    제거된 상세 데이터는 상세 화면을 펼칠 때 공유 결과 저장소에서 다시 불러옵니다.
+    """
+    if SESSION_MEMORY_CAP_MB <= 0 or not results:
+        return results
+    
+    size_mb = deep_sizeof(results) / (1024 * 1024)
+    if size_mb <= SESSION_MEMORY_CAP_MB:
+        return results
+    
+    ranked = sorted(
+        range(len(results)),
+        key=lambda index: results[index].get("fitness_score") if results[index].get("fitness_score") is not None else -1,
+        reverse=True
+    )
+    keep = set(ranked[:SESSION_FULL_RESULTS_TOP_N])
+    capped = [result if index in keep else evict_result_details(result) for index, result in enumerate(results)]
+    
+    capped_mb = deep_sizeof(capped) / (1024 * 1024)
+    st.info(
+        f"분석 결과({size_mb:.1f}MB)가 세션 상한({SESSION_MEMORY_CAP_MB:.0f}MB)을 넘어 "
+        f"점수 상위 {len(keep)}명을 제외한 {len(results) - len(keep)}명의 상세 데이터를 메모리에서 제거했습니다 ({capped_mb:.1f}MB)."
+    )
+    return capped
+
+def show_memory_panel():
+    """세션별 메모리 사용량과 최근 배치의 tracemalloc 비교 결과를 표시합니다."""
+    with st.expander("🧠 메모리 사용량", expanded=False):
+        # 세션 상태 전체를 순회하므로 재실행마다 측정하지 않고 요청할 때만 측정
+        if st.button("현재 세션 메모리 측정"):
+            measure_session_memory()
+        
+        reports = get_session_reports()
+        current_session = get_session_id()
+        
+        rows = []
+        for session_id, report in reports.items():
+            row = {"세션": session_id[:8] + (" (현재)" if session_id == current_session else "")}
+            for name, size in report["sizes"].items():
+                row[f"{name} (MB)"] = round(size / (1024 * 1024), 2)
+            row["합계 (MB)"] = round(report["total"] / (1024 * 1024), 2)
+            row["측정 시각"] = time.strftime("%H:%M:%S", time.localtime(report["updated_at"]))
+            rows.append(row)
+        
+        if rows:
+            st.write("**세션별 사용량 (근사치):**")
+            st.dataframe(pd.DataFrame(rows).sort_values("합계 (MB)", ascending=False), use_container_width=True)
+        
+        if SESSION_MEMORY_CAP_MB > 0:
+            st.caption(f"세션당 분석 결과 상한: {SESSION_MEMORY_CAP_MB:.0f}MB (초과 시 점수 상위 {SESSION_FULL_RESULTS_TOP_N}명 외에는 상세 데이터를 메모리에서 제거)")
+        
+        if st.button("공유 캐시 클라이언트 크기 측정"):
+            client_sizes = measure_cached_clients()
+            st.dataframe(pd.DataFrame([
+                {"클라이언트": name, "크기 (MB)": round(size / (1024 * 1024), 2)}
+                for name, size in client_sizes.items()
+            ]), use_container_width=True)
+        
+        tracemalloc_report = st.session_state.get("tracemalloc_report")
+        if tracemalloc_report:
+            st.write(f"**최근 배치 tracemalloc:** 현재 {tracemalloc_report['current_mb']}MB, 최대 {tracemalloc_report['peak_mb']}MB")
+            st.dataframe(pd.DataFrame(tracemalloc_report["top"]), use_container_width=True)
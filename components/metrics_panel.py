@@ -0,0 +1,147 @@
+import streamlit as st
+import pandas as pd
+import json
+from dotenv import load_dotenv
+import os
+from utils.metrics import get_stage_summary, get_metrics_snapshot, to_prometheus_text, export_metrics, reset_metrics
+from services.prompt_templates import STATIC_PREFIXES, prefix_fingerprint
+from utils.circuit_breaker import get_circuit_breakers
+from utils.hedging import get_hedge_policies
+
+# .env 파일 로드
+load_dotenv()
+
+# 지표 파일(metrics.prom, metrics.json)을 저장할 로컬 디렉토리
+METRICS_EXPORT_DIR = os.getenv("METRICS_EXPORT_DIR", "metrics")
+
+def build_prompt_cache_rows():
+    """프롬프트 버전별 호출 수, 입력/캐시 토큰, 캐시 비율과 정적 접두부 지문을 표 행으로 만듭니다."""
+    totals = {}
+    for counter in get_metrics_snapshot()["counters"]:
+        if counter["name"] not in ("llm_prompt_tokens", "llm_prompt_calls"):
+            continue
+        version = counter["labels"].get("prompt")
+        row = totals.setdefault(version, {"calls": 0, "total": 0, "cached": 0})
+        if counter["name"] == "llm_prompt_calls":
+            row["calls"] += counter["value"]
+        else:
+            row[counter["labels"].get("kind")] += counter["value"]
+    
+    return [
+        {
+            "프롬프트 버전": version,
+            "접두부 지문": prefix_fingerprint(STATIC_PREFIXES[version]) if version in STATIC_PREFIXES else "-",
+            "호출 수": row["calls"],
+            "입력 토큰": row["total"],
+            "캐시 토큰": row["cached"],
+            "캐시 비율": f"{row['cached'] / row['total']:.0%}" if row["total"] else "-"
+        }
+        for version, row in totals.items()
+    ]
+
+# 회로 차단기 상태 표시 이름
+BREAKER_STATE_LABELS = {"closed": "🟢 정상", "half_open": "🟡 복구 확인 중", "open": "🔴 차단"}
+
+def build_circuit_breaker_rows():
+    """LLM 백엔드별 회로 차단기 상태를 표 행으로 만듭니다."""
+    return [
+        {
+            "백엔드": snapshot["backend"],
+            "상태": BREAKER_STATE_LABELS[snapshot["state"]],
+            "연속 실패": snapshot["consecutive_failures"],
+            "남은 차단 시간 (초)": round(snapshot["cooldown_remaining"], 1),
+            "성공": snapshot["successes"],
+            "실패": snapshot["failures"],
+            "건너뜀": snapshot["rejected"],
+            "차단 횟수": snapshot["opened"],
+            "마지막 오류": snapshot["last_error"] or "-"
+        }
+        for snapshot in (breaker.snapshot() for breaker in get_circuit_breakers())
+    ]
+
+def build_hedging_rows():
+    """LLM 백엔드별 요청 헤징 통계와 헤징 전후 꼬리 지연시간을 표 행으로 만듭니다."""
+    return [
+        {
+            "백엔드": snapshot["policy"],
+            "호출 수": snapshot["calls"],
+            "헤지 요청": snapshot["hedged"],
+            "헤지 우선 응답": snapshot["hedge_wins"],
+            "예산 사용률": f"{snapshot['budget_used']:.0%}",
+            "건너뜀 (예산/동시 한도)": f"{snapshot['skipped_budget']}/{snapshot['skipped_limit']}",
+            "헤지 기준 (초)": round(snapshot["threshold"], 1) if snapshot["threshold"] is not None else "-",
+            "헤징 전 p95/p99 (초)": f"{snapshot['primary_p95']:.1f} / {snapshot['primary_p99']:.1f}",
+            "헤징 후 p95/p99 (초)": f"{snapshot['effective_p95']:.1f} / {snapshot['effective_p99']:.1f}"
+        }
+        for snapshot in (policy.snapshot() for policy in get_hedge_policies())
+    ]
+
+def show_metrics_panel():
+    """단계별 처리 시간 지표 패널을 표시합니다."""
+    with st.expander("📈 단계별 처리 시간 지표", expanded=False):
+        stage_summary = get_stage_summary()
+        
+        if not stage_summary:
+            st.info("아직 수집된 지표가 없습니다.")
+            return
+        
+        # 단계별 지표를 밀리초 단위 테이블로 표시
+        rows = []
+        for stage, stats in stage_summary.items():
+            rows.append({
+                "단계": stage,
+                "호출 수": stats["count"],
+                "오류 수": stats["errors"],
+                "p50 (ms)": round(stats["p50"] * 1000, 1),
+                "p95 (ms)": round(stats["p95"] * 1000, 1),
+                "p99 (ms)": round(stats["p99"] * 1000, 1),
+                "누적 (초)": round(stats["sum"], 2)
+            })
+        
+        df_metrics = pd.DataFrame(rows).sort_values("누적 (초)", ascending=False)
+        st.dataframe(df_metrics, use_container_width=True)
+        
+        # 프롬프트 캐싱 확인용 (정적 접두부 지문이 배포 간에 같아야 캐시가 유지됨)
+        prompt_cache_rows = build_prompt_cache_rows()
+        if prompt_cache_rows:
+            st.write("**프롬프트 캐시 (버전별):**")
+            st.dataframe(pd.DataFrame(prompt_cache_rows), use_container_width=True)
+        
+        # LLM 백엔드 회로 차단기 (차단된 백엔드는 대기 시간 동안 호출하지 않음)
+        circuit_breaker_rows = build_circuit_breaker_rows()
+        if circuit_breaker_rows:
+            st.write("**LLM 백엔드 회로 차단기:**")
+            st.dataframe(pd.DataFrame(circuit_breaker_rows), use_container_width=True)
+        
+        # 요청 헤징 (헤징 전 = 원 요청 지연시간, 헤징 후 = 먼저 도착한 응답까지 기다린 시간)
+        hedging_rows = build_hedging_rows()
+        if hedging_rows:
+            st.write("**LLM 요청 헤징:**")
+            st.dataframe(pd.DataFrame(hedging_rows), use_container_width=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            if st.button("💾 지표 파일로 내보내기"):
+                try:
+                    prom_path, json_path = export_metrics(METRICS_EXPORT_DIR)
+                    st.success(f"✅ 저장 완료: {prom_path}, {json_path}")
+                except Exception as e:
+                    st.error(f"지표 내보내기 실패: {str(e)}")
+        with col2:
+            st.download_button(
+                label="📥 Prometheus 형식",
+                data=to_prometheus_text(),
+                file_name="metrics.prom",
+                mime="text/plain"
+            )
+        with col3:
+            st.download_button(
+                label="📥 JSON 형식",
+                data=json.dumps(get_metrics_snapshot(), ensure_ascii=False, indent=2),
+                file_name="metrics.json",
+                mime="application/json"
+            )
+        with col4:
+            if st.button("🗑️ 지표 초기화"):
+                reset_metrics()
+                st.rerun()
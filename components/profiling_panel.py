@@ -0,0 +1,56 @@
+import streamlit as st
+import pandas as pd
+import time
+from dotenv import load_dotenv
+import os
+
+# .env 파일 로드
+load_dotenv()
+
+# collapsed stack 파일을 저장할 로컬 디렉토리
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "profiles")
+# 상위 함수 표에 표시할 개수
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "20"))
+
+def save_profile(profiler, scope):
+    """프로파일 결과를 파일로 저장하고 세션에 요약을 보관합니다."""
+    if "profile_reports" not in st.session_state:
+        st.session_state.profile_reports = {}
+    
+    batch_id = st.session_state.get("profile_batch_id") or time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(PROFILE_OUTPUT_DIR, f"{batch_id}-{scope}.collapsed")
+    
+    try:
+        profiler.write_collapsed(path)
+    except Exception as e:
+        st.warning(f"프로파일 파일 저장 실패: {str(e)}")
+        path = None
+    
+    st.session_state.profile_reports[scope] = {
+        "path": path,
+        "samples": profiler.sample_count,
+        "elapsed": profiler.elapsed,
+        "top": profiler.top_functions(PROFILE_TOP_N),
+        "collapsed": "\n".join(profiler.collapsed_lines())
+    }
+
+def show_profiling_results():
+    """가장 최근 배치의 프로파일 결과(상위 함수 표, collapsed stack 파일)를 표시합니다."""
+    reports = st.session_state.get("profile_reports")
+    if not reports:
+        return
+    
+    with st.expander("🔬 프로파일링 결과 (최근 배치)", expanded=False):
+        for scope, report in reports.items():
+            st.write(f"**{scope}** - {report['elapsed']:.2f}초, 샘플 {report['samples']}개")
+            if report["path"]:
+                st.caption(f"collapsed stack 파일: {report['path']} (flamegraph.pl 또는 speedscope로 열 수 있습니다)")
+            if report["top"]:
+                st.dataframe(pd.DataFrame(report["top"]), use_container_width=True)
+            st.download_button(
+                label=f"📥 {scope} collapsed stack 다운로드",
+                data=report["collapsed"],
+                file_name=f"{scope}.collapsed",
+                mime="text/plain",
+                key=f"profile_download_{scope}"
+            )
@@ -0,0 +1,161 @@
+import streamlit as st
+import pandas as pd
+import json
+import math
+from dotenv import load_dotenv
+import os
+from datetime import datetime
+from services.resume_pipeline import TARGET_FIELDS, FIELD_PROCESSORS, restore_result_details, load_evaluation_history
+
+# .env 파일 로드
+load_dotenv()
+
+# 상세 결과 한 페이지에 표시할 지원자 수
+RESULTS_PAGE_SIZE = int(os.getenv("RESULTS_PAGE_SIZE", "20"))
+
+# 구조화된 필드가 비어 있을 때 표시할 문구
+EMPTY_FIELD_MESSAGES = {
+    "학력사항": "학력사항 정보 없음",
+    "경력사항": "경력사항 정보 없음",
+    "자격증": "자격증 정보 없음",
+    "수상경력": "수상경력 정보 없음"
+}
+
+def build_detail_payload(result):
+    """
+    지원자 상세 화면에 필요한 데이터(필드 표, 평가 기준 JSON)를 한 번만 계산합니다.
+    필드 파싱과 json.dumps는 여기서만 수행됩니다.
+    """
+    analysis = result["analysis"]
+    fields = analysis["documents"][0]["fields"] if analysis["documents"] else {}
+    
+    # 필드별 구조화 데이터 (평가 대상 필드만 파싱)
+    structured = {
+        field_name: FIELD_PROCESSORS[field_name](fields[field_name]['content'])
+        for field_name in TARGET_FIELDS if field_name in fields
+    }
+    
+    field_rows = []
+    for field_name, field_info in fields.items():
+        if field_name in structured:
+            value = json.dumps(structured[field_name], ensure_ascii=False, indent=2) if structured[field_name] else EMPTY_FIELD_MESSAGES[field_name]
+        else:
+            value = field_info['content']
+        field_rows.append({
+            "필드명": field_name,
+            "타입": field_info['type'],
+            "값": value,
+            "신뢰도": f"{field_info['confidence']:.2f}"
+        })
+    
+    return {
+        "field_rows": field_rows,
+        "criteria_json": json.dumps(structured, ensure_ascii=False, indent=2) if structured else None,
+        "fitness_evaluation": result.get("fitness_evaluation")
+    }
+
+def get_detail_payload(result):
+    """
+    세션 캐시에서 상세 화면 데이터를 가져오고, 없으면 계산하여 저장합니다.
+    메모리 상한으로 상세 데이터가 제거된 결과는 공유 저장소에서 다시 불러오며, 찾지 못하면 None을 반환합니다.
+    """
+    if "detail_payload_cache" not in st.session_state:
+        st.session_state.detail_payload_cache = {}
+    
+    cache = st.session_state.detail_payload_cache
+    cache_key = (result["file_name"], result.get("job_posting"))
+    if cache_key not in cache:
+        if result.get("details_evicted"):
+            result = restore_result_details(result)
+            if result is None:
+                return None
+        cache[cache_key] = build_detail_payload(result)
+    return cache[cache_key]
+
+def clear_detail_payload_cache():
+    """새 배치가 시작될 때 상세 화면 캐시를 비웁니다."""
+    st.session_state.detail_payload_cache = {}
+
+def render_candidate_detail(result):
+    """지원자 한 명의 상세 분석 결과를 표시합니다."""
+    payload = get_detail_payload(result)
+    file_name = result["file_name"]
+    
+    if payload is None:
+        st.info("세션 메모리 상한으로 상세 데이터가 정리되었고 공유 저장소에서도 찾을 수 없습니다. 이 이력서를 다시 분석하면 확인할 수 있습니다.")
+        return
+    
+    if payload["field_rows"]:
+        st.write("**🏷️ 추출된 필드:**")
+        st.dataframe(pd.DataFrame(payload["field_rows"]), use_container_width=True)
+    
+    # 채용 적합성 평가 (채용공고를 기준으로 분석한 경우)
+    if result.get("job_posting"):
+        st.markdown("---")
+        st.write("**🎯 채용 적합성 평가:**")
+        
+        st.write("**📋 평가 기준 데이터:**")
+        if payload["criteria_json"]:
+            st.code(payload["criteria_json"], language="json")
+        else:
+            st.warning("평가 기준 데이터를 추출할 수 없습니다.")
+        
+        fitness_evaluation = payload["fitness_evaluation"]
+        if fitness_evaluation:
+            st.success("✅ 적합성 평가 결과")
+            st.markdown("**📊 평가 결과:**")
+            st.text_area(
+                "평가 결과",
+                value=fitness_evaluation,
+                height=200,
+                disabled=True,
+                key=f"eval_result_{file_name}"
+            )
+        else:
+            st.warning("⚠️ 적합성 평가 결과가 없습니다.")
+    
+    # 같은 이력서를 다른 채용공고로 평가한 이력 (공유 저장소)
+    other_evaluations = [
+        row for row in load_evaluation_history(file_name)
+        if row["posting_key"] != result.get("posting_key")
+    ]
+    if other_evaluations:
+        st.write("**🗂️ 다른 채용공고 평가 이력:**")
+        st.dataframe(pd.DataFrame([
+            {
+                "채용공고": os.path.basename(row["posting_key"].rsplit("@", 1)[0]),
+                "적합성 점수": row["fitness_score"],
+                "평가 시각": datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M")
+            }
+            for row in other_evaluations
+        ]), use_container_width=True)
+
+def show_result_details(all_results):
+    """
+    상세 분석 결과를 페이지 단위로 표시합니다.
+    결과는 주어진 순서(순위표의 필터/정렬 결과)대로 표시하며,
+    현재 페이지의 지원자 목록만 그리고, 상세 내용은 펼친 지원자에 대해서만 만듭니다.
+    """
+    st.subheader("🔍 상세 분석 결과")
+    
+    ordered = all_results
+    if not ordered:
+        st.info("조건에 맞는 지원자가 없습니다.")
+        return
+    
+    page_count = max(1, math.ceil(len(ordered) / RESULTS_PAGE_SIZE))
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input("페이지", min_value=1, max_value=page_count, value=1, step=1, key="result_detail_page")
+    with col2:
+        st.caption(f"전체 {len(ordered)}명 중 {(page - 1) * RESULTS_PAGE_SIZE + 1}~{min(page * RESULTS_PAGE_SIZE, len(ordered))}번째 ({page}/{page_count} 페이지)")
+    
+    for result in ordered[(page - 1) * RESULTS_PAGE_SIZE:page * RESULTS_PAGE_SIZE]:
+        file_name = result["file_name"]
+        score = result.get("fitness_score")
+        label = f"📄 {file_name} - {score if score is not None else '평가 불가'}점"
+        
+        # 체크한 지원자만 상세 내용을 계산/렌더링
+        if st.checkbox(label, key=f"open_detail_{file_name}"):
+            with st.container():
+                render_candidate_detail(result)
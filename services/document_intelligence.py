@@ -1,8 +1,17 @@
 import streamlit as st
 import io
+import time
 import PyPDF2
+from datetime import datetime, timedelta, timezone
 from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
+from azure.core.exceptions import HttpResponseError
+from azure.storage.blob import generate_blob_sas, BlobSasPermissions
 from services.azure_clients import get_document_intelligence_client, get_container_client
+from utils.local_extractor import extract_resume_locally, extract_resume_from_docx, extract_docx_text
+from services.llm_service import process_education_field, process_experience_field, process_certificate_field, process_award_field
+from utils.document_compactor import compact_document
+from utils.metrics import trace_stage
+from utils.cancellation import wait_with_deadline
 # from config import MODEL_ID
 from dotenv import load_dotenv
 import os
@@ -11,6 +20,60 @@ import os
 load_dotenv()
 
 MODEL_ID = os.getenv("MODEL_ID")
+# 문서 전달 방식: "bytes"(앱이 다운로드 후 업로드) 또는 "url"(SAS URL로 참조 전달)
+DI_SOURCE_MODE = os.getenv("DI_SOURCE_MODE", "bytes").lower()
+DI_SAS_EXPIRY_MINUTES = int(os.getenv("DI_SAS_EXPIRY_MINUTES", "10"))
+# 텍스트 레이어가 있는 PDF는 로컬에서 먼저 추출 (신뢰도가 낮을 때만 DI 호출)
+# 로컬 추출에는 앱이 파일을 내려받아야 하므로 DI_SOURCE_MODE=url에서는 사용하지 않음
+LOCAL_EXTRACTION_ENABLED = os.getenv("LOCAL_EXTRACTION_ENABLED", "true").lower() == "true" and DI_SOURCE_MODE != "url"
+LOCAL_EXTRACTION_MIN_CONFIDENCE = float(os.getenv("LOCAL_EXTRACTION_MIN_CONFIDENCE", "0.75"))
+# 분석할 페이지 범위 (예: "1-3", 비우면 전체 페이지)
+DI_PAGES = os.getenv("DI_PAGES", "").strip() or None
+# 추가 분석 기능 (예: "keyValuePairs,ocrHighResolution", 비우면 요청하지 않음)
+DI_FEATURES = [feature.strip() for feature in os.getenv("DI_FEATURES", "").split(",") if feature.strip()]
+# 분석 결과에서 보관할 항목 (적합도 평가에는 "documents"만 필요)
+DI_OUTPUTS = [output.strip() for output in os.getenv("DI_OUTPUTS", "documents,pages,tables,key_value_pairs").split(",") if output.strip()]
+# 업로드 전 문서 압축 (대용량 스캔 PDF/사진용, 선택사항)
+DOCUMENT_COMPACTION_ENABLED = os.getenv("DOCUMENT_COMPACTION_ENABLED", "false").lower() == "true"
+COMPACTION_MIN_BYTES = int(os.getenv("COMPACTION_MIN_BYTES", str(4 * 1024 * 1024)))
+COMPACTION_MAX_PAGES = int(os.getenv("COMPACTION_MAX_PAGES", "10"))
+COMPACTION_MAX_IMAGE_SIDE = int(os.getenv("COMPACTION_MAX_IMAGE_SIDE", "2000"))
+COMPACTION_JPEG_QUALITY = int(os.getenv("COMPACTION_JPEG_QUALITY", "80"))
+# PDF 안의 이미지(스캔 페이지 등)를 축소할 해상도
+COMPACTION_IMAGE_DPI = int(os.getenv("COMPACTION_IMAGE_DPI", "150"))
+# 이력서 한 건의 Document Intelligence 분석 제한 시간 (초, 0이면 제한 없음)
+DI_TIMEOUT_SECONDS = float(os.getenv("DI_TIMEOUT_SECONDS", "120"))
+
+# 로컬 추출 신뢰도 계산에 쓰는 필드 파서 (파싱 결과가 나와야 추출된 것으로 봄)
+LOCAL_FIELD_PARSERS = {
+    "학력사항": process_education_field,
+    "경력사항": process_experience_field,
+    "자격증": process_certificate_field,
+    "수상경력": process_award_field
+}
+
+class ResumeAnalysisError(Exception):
+    """
+    이력서 분석에 실패했을 때 발생합니다.
+    원래 예외는 __cause__에 남아 재시도 대기열에서 일시적/영구 오류 분류에 사용됩니다.
+    """
+    
+    def __init__(self, blob_name, reason):
+        super().__init__(reason)
+        self.blob_name = blob_name
+
+@trace_stage("list_blobs_by_prefix")
+def report_problem(message, on_error=None, level="warning"):
+    """
+    처리 중 발생한 문제를 알립니다.
+    on_error가 있으면 메시지를 전달하고(백그라운드 스레드처럼 화면이 없는 호출자), 없으면 Streamlit 화면에 표시합니다.
+    """
+    if on_error:
+        on_error(message)
+    elif level == "error":
+        st.error(message)
+    else:
+        st.warning(message)
 
 def list_blobs_by_prefix(container_client, prefix):
     """특정 접두사로 시작하는 blob들을 반환합니다."""
@@ -32,8 +95,9 @@ def list_blobs_by_prefix(container_client, prefix):
         st.error(f"Blob 목록 가져오기 오류: {str(e)}")
         return []
 
-def extract_job_posting_text(blob_name, container_client):
-    """채용공고 파일에서 텍스트를 추출합니다."""
+@trace_stage("extract_job_posting_text", is_error=lambda result: result is None)
+def extract_job_posting_text(blob_name, container_client, on_error=None):
+    """채용공고 파일에서 텍스트를 추출합니다 (on_error를 전달하면 오류를 화면 대신 콜백으로 알림)."""
     try:
         blob_client = container_client.get_blob_client(blob_name)
         blob_data = blob_client.download_blob()
@@ -46,44 +110,212 @@ def extract_job_posting_text(blob_name, container_client):
                 text += page.extract_text() + "\n"
             return text
         
+        # DOCX 파일인 경우 (zip 내부의 문서 XML에서 직접 추출)
+        elif blob_name.lower().endswith('.docx'):
+            return extract_docx_text(blob_data.readall())
+        
         # 텍스트 파일인 경우
-        elif blob_name.lower().endswith(('.txt', '.doc', '.docx')):
+        elif blob_name.lower().endswith(('.txt', '.doc')):
             return blob_data.readall().decode('utf-8')
         
         else:
-            st.warning(f"지원하지 않는 파일 형식입니다: {blob_name}")
+            report_problem(f"지원하지 않는 파일 형식입니다: {blob_name}", on_error)
             return None
             
     except Exception as e:
-        st.error(f"파일 읽기 오류: {str(e)}")
+        report_problem(f"파일 읽기 오류: {str(e)}", on_error, level="error")
+        return None
+
+def get_blob_read_url(container_client, blob_name, expiry_minutes=DI_SAS_EXPIRY_MINUTES):
+    """Blob에 대한 읽기 전용 단기 SAS URL을 생성합니다. 생성할 수 없으면 None을 반환합니다."""
+    try:
+        blob_client = container_client.get_blob_client(blob_name)
+        account_key = getattr(container_client.credential, 'account_key', None)
+        if not account_key:
+            return None
+        
+        sas_token = generate_blob_sas(
+            account_name=blob_client.account_name,
+            container_name=blob_client.container_name,
+            blob_name=blob_name,
+            account_key=account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.now(timezone.utc) + timedelta(minutes=expiry_minutes)
+        )
+        return f"{blob_client.url}?{sas_token}"
+        
+    except Exception:
         return None
 
-def analyze_resume_with_ai(blob_name):
-    """Azure Document Intelligence를 사용하여 이력서를 분석합니다."""
+def get_blob_size(container_client, blob_name):
+    """Blob 속성에서 파일 크기(바이트)를 조회합니다 (다운로드하지 않음)."""
+    return container_client.get_blob_client(blob_name).get_blob_properties().size
+
+def download_blob_bytes(container_client, blob_name):
+    """Blob 전체를 바이트로 다운로드합니다."""
+    blob_client = container_client.get_blob_client(blob_name)
+    return blob_client.download_blob().readall()
+
+def try_local_extraction(document_content):
+    """텍스트 레이어 기반 로컬 추출을 시도하고, 신뢰도가 충분할 때만 결과를 반환합니다."""
+    try:
+        analysis_result, confidence = extract_resume_locally(document_content, LOCAL_FIELD_PARSERS)
+        if analysis_result and confidence >= LOCAL_EXTRACTION_MIN_CONFIDENCE:
+            return analysis_result
+    except Exception:
+        pass
+    return None
+
+def get_analyze_options():
+    """배포 설정(DI_PAGES, DI_FEATURES)에 따른 begin_analyze_document 추가 인자를 반환합니다."""
+    options = {}
+    if DI_PAGES:
+        options["pages"] = DI_PAGES
+    if DI_FEATURES:
+        options["features"] = DI_FEATURES
+    return options
+
+def wait_for_poller(poller, cancel_token=None, timeout_seconds=DI_TIMEOUT_SECONDS):
+    """
+    분석 작업이 끝날 때까지 짧게 나눠 기다린 뒤 결과를 반환합니다.
+    제한 시간이 지나면 TimeoutError, 배치가 중단되면 BatchCancelled가 발생합니다 (작업은 더 기다리지 않음).
+    """
+    wait_with_deadline(
+        poller.done,
+        lambda seconds: poller.wait(timeout=seconds),
+        timeout_seconds,
+        cancel_token,
+        "Document Intelligence 분석"
+    )
+    return poller.result()
+
+# URL 방식에서 DI가 Blob을 읽지 못했을 때의 오류 코드 (이 경우에만 바이트 전송으로 다시 분석)
+URL_FETCH_ERROR_CODES = {"InvalidContent", "InvalidContentSourceFormat", "ContentSourceNotAccessible", "UrlDownloadFailed", "InvalidUrl"}
+
+def is_url_fetch_error(error):
+    """DI 오류(및 내부 오류) 코드가 URL의 문서를 가져오지 못한 경우인지 확인합니다."""
+    odata_error = getattr(error, "error", None)
+    if odata_error is None:
+        return False
+    
+    codes = {odata_error.code}
+    inner_error = getattr(odata_error, "innererror", None)
+    while inner_error:
+        codes.add(inner_error.get("code"))
+        inner_error = inner_error.get("innererror")
+    return bool(codes & URL_FETCH_ERROR_CODES)
+
+def run_resume_analysis(doc_client, container_client, blob_name, document_content=None, force_bytes=False, cancel_token=None, on_error=None):
+    """
+    설정된 전달 방식(DI_SOURCE_MODE)에 따라 Document Intelligence 분석을 실행하고 결과를 반환합니다.
+    URL 방식은 DI가 Blob을 읽지 못한 경우(만료된 SAS, 방화벽 등)에만 바이트 전송으로 다시 분석하며,
+    이때는 원래 제한 시간(DI_TIMEOUT_SECONDS) 중 남은 시간만 기다립니다. 시간 초과 등 다른 오류는 그대로 발생합니다.
+    """
+    timeout_seconds = DI_TIMEOUT_SECONDS
+    
+    # URL 참조 방식: 앱을 거치지 않고 DI가 Blob을 직접 읽음 (압축본을 보낼 때는 사용하지 않음)
+    if DI_SOURCE_MODE == "url" and not force_bytes:
+        read_url = get_blob_read_url(container_client, blob_name)
+        if read_url:
+            started_at = time.monotonic()
+            try:
+                poller = doc_client.begin_analyze_document(
+                    MODEL_ID,
+                    AnalyzeDocumentRequest(url_source=read_url),
+                    **get_analyze_options()
+                )
+                return wait_for_poller(poller, cancel_token, timeout_seconds)
+            except HttpResponseError as e:
+                if not is_url_fetch_error(e):
+                    raise
+                report_problem(f"DI가 URL의 문서를 읽지 못해 바이트 전송으로 대체합니다: {str(e)}", on_error)
+                if timeout_seconds > 0:
+                    timeout_seconds -= time.monotonic() - started_at
+                    if timeout_seconds <= 0:
+                        raise TimeoutError(f"Document Intelligence 분석 시간 초과 ({DI_TIMEOUT_SECONDS:.0f}초)") from e
+    
+    # 기본 방식(폴백): Blob에서 파일 다운로드 후 바이트 전송 (이미 받은 바이트는 재사용)
+    if document_content is None:
+        document_content = download_blob_bytes(container_client, blob_name)
+    poller = doc_client.begin_analyze_document(
+        MODEL_ID, 
+        document_content,
+        **get_analyze_options()
+    )
+    return wait_for_poller(poller, cancel_token, timeout_seconds)
+
+@trace_stage("analyze_resume_with_ai")
+def analyze_resume_with_ai(blob_name, cancel_token=None, on_error=None):
+    """
+    Azure Document Intelligence를 사용하여 이력서를 분석합니다.
+    분석에 실패하면 ResumeAnalysisError를 발생시킵니다.
+    cancel_token을 전달하면 배치가 중단될 때 분석 대기를 멈추고 BatchCancelled를 발생시킵니다.
+    on_error를 전달하면 오류와 경고를 화면 대신 콜백으로 알립니다 (백그라운드 수집기 등).
+    """
     try:
         # Azure 클라이언트들 가져오기
         container_client = get_container_client()
         doc_client = get_document_intelligence_client()
         
         if not container_client or not doc_client:
-            st.error("Azure 클라이언트를 가져올 수 없습니다.")
-            return None
+            report_problem("Azure 클라이언트를 가져올 수 없습니다.", on_error, level="error")
+            raise ResumeAnalysisError(blob_name, "Azure 클라이언트를 가져올 수 없습니다.")
         
-        # Blob에서 파일 다운로드
-        blob_client = container_client.get_blob_client(blob_name)
-        blob_data = blob_client.download_blob()
-        document_content = blob_data.readall()
+        # 텍스트 레이어가 있는 PDF는 로컬 추출 우선
+        document_content = None
+        if LOCAL_EXTRACTION_ENABLED and blob_name.lower().endswith('.pdf'):
+            document_content = download_blob_bytes(container_client, blob_name)
+            local_result = try_local_extraction(document_content)
+            if local_result:
+                local_result["extraction_source"] = "local"
+                if "pages" not in DI_OUTPUTS:
+                    local_result["pages"] = []
+                return local_result
         
-        # Document Intelligence로 분석
-        poller = doc_client.begin_analyze_document(
-            MODEL_ID, 
-            document_content
+        # DOCX 이력서도 로컬에서 먼저 추출 (섹션이 충분히 파싱되지 않으면 Document Intelligence로 분석)
+        if blob_name.lower().endswith('.docx'):
+            document_content = download_blob_bytes(container_client, blob_name)
+            local_result, confidence = extract_resume_from_docx(document_content, LOCAL_FIELD_PARSERS)
+            if local_result and confidence >= LOCAL_EXTRACTION_MIN_CONFIDENCE:
+                local_result["extraction_source"] = "local"
+                return local_result
+        
+        # 대용량 문서는 업로드 전에 압축
+        compaction_info = None
+        if DOCUMENT_COMPACTION_ENABLED:
+            # 크기는 Blob 속성으로 확인하여 압축 대상만 다운로드 (URL 방식에서도 작은 문서는 받지 않음)
+            document_size = len(document_content) if document_content is not None else get_blob_size(container_client, blob_name)
+            if document_size >= COMPACTION_MIN_BYTES:
+                if document_content is None:
+                    document_content = download_blob_bytes(container_client, blob_name)
+                document_content, compaction_info = compact_document(
+                    document_content,
+                    blob_name,
+                    max_pages=COMPACTION_MAX_PAGES,
+                    max_image_side=COMPACTION_MAX_IMAGE_SIDE,
+                    jpeg_quality=COMPACTION_JPEG_QUALITY,
+                    max_image_dpi=COMPACTION_IMAGE_DPI
+                )
+        
+        # Document Intelligence로 분석 (URL 참조 또는 바이트 전송)
+        analysis_started_at = time.perf_counter()
+        result = run_resume_analysis(
+            doc_client, container_client, blob_name, document_content,
+            force_bytes=compaction_info is not None,
+            cancel_token=cancel_token,
+            on_error=on_error
         )
-        result = poller.result()
+        
+        # 압축 전후 크기와 분석 소요 시간 기록
+        if compaction_info:
+            compaction_info["analysis_seconds"] = round(time.perf_counter() - analysis_started_at, 3)
         
         # check3-1.py와 동일한 구조로 분석 결과 구성
         analysis_result = {
             "model_id": result.model_id,
+            "extraction_source": "document_intelligence",
+            "page_count": len(result.pages) if getattr(result, 'pages', None) else 0,
+            "compaction": compaction_info,
             "documents": [],
             "pages": [],
             "tables": [],
@@ -91,7 +323,7 @@ def analyze_resume_with_ai(blob_name):
         }
         
         # 문서 정보 추출 (안전한 처리)
-        if hasattr(result, 'documents') and result.documents:
+        if "documents" in DI_OUTPUTS and hasattr(result, 'documents') and result.documents:
             for document in result.documents:
                 doc_info = {
                     "doc_type": getattr(document, 'doc_type', 'unknown'),
@@ -108,7 +340,7 @@ def analyze_resume_with_ai(blob_name):
                 analysis_result["documents"].append(doc_info)
         
         # 페이지 정보 추출 (안전한 처리)
-        if hasattr(result, 'pages') and result.pages:
+        if "pages" in DI_OUTPUTS and hasattr(result, 'pages') and result.pages:
             for page in result.pages:
                 page_info = {
                     "page_number": getattr(page, 'page_number', 0),
@@ -118,7 +350,7 @@ def analyze_resume_with_ai(blob_name):
                 analysis_result["pages"].append(page_info)
         
         # 테이블 정보 추출 (안전한 처리)
-        if hasattr(result, 'tables') and result.tables:
+        if "tables" in DI_OUTPUTS and hasattr(result, 'tables') and result.tables:
             for table in result.tables:
                 table_info = {
                     "row_count": getattr(table, 'row_count', 0),
@@ -136,7 +368,7 @@ def analyze_resume_with_ai(blob_name):
                 analysis_result["tables"].append(table_info)
         
         # 키-값 쌍 추출 (안전한 처리)
-        if hasattr(result, 'key_value_pairs') and result.key_value_pairs:
+        if "key_value_pairs" in DI_OUTPUTS and hasattr(result, 'key_value_pairs') and result.key_value_pairs:
             for kv_pair in result.key_value_pairs:
                 kv_info = {
                     "key": kv_pair.key.content if hasattr(kv_pair, 'key') and kv_pair.key else "",
@@ -146,8 +378,8 @@ def analyze_resume_with_ai(blob_name):
         
         return analysis_result
         
+    except ResumeAnalysisError:
+        raise
     except Exception as e:
-        st.error(f"Document Intelligence 분석 실패: {str(e)}")
-        st.error(f"파일: {blob_name}")
-        st.error(f"Model ID: {MODEL_ID}")
-        return None 
\ No newline at end of file
+        report_problem(f"Document Intelligence 분석 실패: {str(e)} (파일: {blob_name}, Model ID: {MODEL_ID})", on_error, level="error")
+        raise ResumeAnalysisError(blob_name, f"{type(e).__name__}: {str(e)}") from e 
\ No newline at end of file
@@ -0,0 +1,204 @@
+import streamlit as st
+import time
+import threading
+from collections import deque
+from dotenv import load_dotenv
+import os
+from services.azure_clients import get_container_client
+from services.document_intelligence import extract_job_posting_text
+from services.document_intelligence import ResumeAnalysisError
+from services.resume_pipeline import load_or_extract_resume, load_or_score_resume, RESULT_STORE_ENABLED
+from services.usage_tracker import empty_usage
+from utils.metrics import increment_counter, set_gauge
+
+# .env 파일 로드
+load_dotenv()
+
+# 새 이력서를 미리 분석하는 백그라운드 수집기 사용 여부 (공유 결과 저장소가 필요)
+INGESTION_WATCHER_ENABLED = os.getenv("INGESTION_WATCHER_ENABLED", "false").lower() == "true"
+# 컨테이너 목록 확인 간격 (초)
+INGESTION_POLL_SECONDS = float(os.getenv("INGESTION_POLL_SECONDS", "60"))
+# 화면에 표시할 최근 오류 수
+INGESTION_RECENT_ERRORS = int(os.getenv("INGESTION_RECENT_ERRORS", "20"))
+# 미리 분석한 이력서를 등록된 모든 채용공고에 대해 적합성 평가까지 할지 여부 (LLM 비용 발생)
+INGESTION_SCORE_POSTINGS = os.getenv("INGESTION_SCORE_POSTINGS", "false").lower() == "true"
+
+JOB_POSTING_PREFIX = "job-posting/"
+
+class IngestionWatcher:
+    """
+    컨테이너 목록을 주기적으로 확인하여 새로 올라오거나 바뀐(ETag 변경) 이력서를 미리 분석합니다.
+    결과는 공유 결과 저장소에 저장되므로, 분석 버튼을 누르면 대부분 저장된 결과를 읽기만 합니다.
+    백그라운드 스레드에는 Streamlit 화면이 없으므로 파이프라인 오류는 record_error 콜백으로 받아 통계에 기록하고,
+    화면에서는 stats_snapshot()으로 복사본을 읽습니다.
+    """
+    
+    def __init__(self, container_client, poll_seconds=INGESTION_POLL_SECONDS, score_postings=INGESTION_SCORE_POSTINGS):
+        self.container_client = container_client
+        self.poll_seconds = poll_seconds
+        self.score_postings = score_postings
+        self.known_etags = {}
+        self.failed_resumes = set()
+        self.posting_texts = {}
+        self.posting_etags = {}
+        self.stats = {
+            "polls": 0,
+            "analyzed": 0,
+            "scored": 0,
+            "failed": 0,
+            "pending": 0,
+            "errors": 0,
+            "last_poll": None,
+            "last_error": None
+        }
+        self.recent_errors = deque(maxlen=INGESTION_RECENT_ERRORS)
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """백그라운드 스레드에서 주기적인 확인을 시작합니다."""
+        if self._thread is not None:
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ingestion-watcher", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """확인을 멈춥니다 (진행 중인 이력서 한 건은 끝까지 처리)."""
+        if self._thread is None:
+            return self
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        return self
+    
+    def _update_stats(self, **increments):
+        """통계 값을 더합니다 (화면 스레드가 읽는 중에도 일관되도록 잠금 사용)."""
+        with self._stats_lock:
+            for key, amount in increments.items():
+                self.stats[key] += amount
+    
+    def _set_stats(self, **values):
+        """통계 값을 바꿉니다."""
+        with self._stats_lock:
+            self.stats.update(values)
+    
+    def stats_snapshot(self):
+        """화면 표시용 통계 복사본과 최근 오류 목록을 반환합니다."""
+        with self._stats_lock:
+            return {**self.stats, "recent_errors": list(self.recent_errors)}
+    
+    def record_error(self, message):
+        """파이프라인에서 전달한 오류/경고를 기록합니다 (load_or_extract_resume 등의 on_error 콜백)."""
+        with self._stats_lock:
+            self.stats["errors"] += 1
+            self.stats["last_error"] = message
+            self.recent_errors.append((time.time(), message))
+        increment_counter("ingestion_errors")
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.record_error(f"확인 실패: {str(e)}")
+                increment_counter("ingestion_poll_errors")
+            self._stop_event.wait(self.poll_seconds)
+    
+    def find_changed_resumes(self):
+        """새로 올라왔거나 ETag가 바뀐 이력서 blob 목록을 반환합니다."""
+        blobs = [blob for blob in self.container_client.list_blobs() if 'resume' in blob.name.lower()]
+        set_gauge("ingestion_known_resumes", len(blobs))
+        return [blob for blob in blobs if self.known_etags.get(blob.name) != blob.etag]
+    
+    def refresh_postings(self):
+        """채용공고 목록을 확인하여 새로 올라왔거나 바뀐 채용공고 이름 목록을 반환합니다."""
+        changed = []
+        current = set()
+        for blob in self.container_client.list_blobs(name_starts_with=JOB_POSTING_PREFIX):
+            current.add(blob.name)
+            if self.posting_etags.get(blob.name) == blob.etag:
+                continue
+            job_text = extract_job_posting_text(blob.name, self.container_client, on_error=self.record_error)
+            if not job_text:
+                continue
+            self.posting_texts[blob.name] = job_text
+            self.posting_etags[blob.name] = blob.etag
+            changed.append(blob.name)
+        
+        # 삭제된 채용공고는 더 이상 평가하지 않음
+        for removed in set(self.posting_texts) - current:
+            self.posting_texts.pop(removed, None)
+            self.posting_etags.pop(removed, None)
+        return changed
+    
+    def score_against_postings(self, result, posting_names):
+        """분석된 이력서를 지정한 채용공고들에 대해 평가합니다 (저장소에 있으면 재사용)."""
+        for posting_name in posting_names:
+            if self._stop_event.is_set():
+                return
+            posting_result = {**result, "job_posting": posting_name, "usage": empty_usage()}
+            load_or_score_resume(posting_result, self.posting_texts[posting_name], on_error=self.record_error)
+            if posting_result["fitness_score"] is not None:
+                self._update_stats(scored=1)
+            elif posting_result.get("evaluation_error"):
+                self.record_error(f"적합성 평가 실패 ({result['file_name']}, {posting_name}): {posting_result['evaluation_error']}")
+    
+    def poll_once(self):
+        """한 번 확인하여 바뀐 이력서를 분석(및 평가)합니다."""
+        changed_resumes = self.find_changed_resumes()
+        changed_postings = self.refresh_postings() if self.score_postings else []
+        self._set_stats(pending=len(changed_resumes))
+        
+        for blob in changed_resumes:
+            if self._stop_event.is_set():
+                break
+            
+            try:
+                result = load_or_extract_resume(blob.name, blob.etag, on_error=self.record_error)
+            except ResumeAnalysisError:
+                result = None
+            # 실패한 이력서도 ETag를 기록하여, 파일이 바뀔 때까지 매번 다시 시도하지 않음
+            self.known_etags[blob.name] = blob.etag
+            self._update_stats(pending=-1)
+            if result is None:
+                self.failed_resumes.add(blob.name)
+                self._update_stats(failed=1)
+                increment_counter("ingestion_resumes", result="failed")
+                continue
+            
+            self.failed_resumes.discard(blob.name)
+            self._update_stats(analyzed=1)
+            increment_counter("ingestion_resumes", result="analyzed")
+            if self.score_postings:
+                self.score_against_postings(result, list(self.posting_texts))
+        
+        # 새 채용공고가 생기면 이미 분석한 이력서들도 평가 (분석 결과는 저장소에서 읽음)
+        if changed_postings:
+            changed_names = {blob.name for blob in changed_resumes}
+            for blob_name, etag in list(self.known_etags.items()):
+                if self._stop_event.is_set():
+                    break
+                if blob_name in changed_names or blob_name in self.failed_resumes:
+                    continue
+                try:
+                    result = load_or_extract_resume(blob_name, etag, on_error=self.record_error)
+                except ResumeAnalysisError:
+                    continue
+                self.score_against_postings(result, changed_postings)
+        
+        self._update_stats(polls=1)
+        self._set_stats(last_poll=time.time())
+
+@st.cache_resource
+def start_ingestion_watcher():
+    """프로세스당 하나의 수집기를 시작합니다. 비활성화되어 있으면 None을 반환합니다."""
+    if not INGESTION_WATCHER_ENABLED or not RESULT_STORE_ENABLED:
+        return None
+    
+    container_client = get_container_client()
+    if container_client is None:
+        return None
+    return IngestionWatcher(container_client).start()
@@ -5,6 +5,12 @@ import re
 from dotenv import load_dotenv
 import os
 from services.azure_clients import setup_openai_client
+from utils.metrics import trace_stage
+from utils.circuit_breaker import get_circuit_breaker
+from utils.cancellation import call_with_deadline
+from utils.hedging import get_hedge_policy, hedged_call
+from services.usage_tracker import empty_usage, add_usage, record_langchain_usage, record_openai_usage, record_prompt_cache_metrics
+from services.prompt_templates import EVALUATION_PROMPT_VERSION, build_evaluation_messages, to_openai_messages
 
 # .env 파일 로드
 load_dotenv()
@@ -19,6 +25,21 @@ AZURE_SEARCH_INDEX_NAME = os.getenv("AZURE_SEARCH_INDEX_NAME")
 AZURE_SEARCH_API_KEY = os.getenv("AZURE_SEARCH_API_KEY")
 AZURE_SEARCH_API_VERSION = os.getenv("AZURE_SEARCH_API_VERSION")
 
+# LLM 백엔드(LangChain / openai 직접 호출) 회로 차단기
+# 연속 실패가 기준 이상이면 대기 시간 동안 해당 백엔드를 건너뛰고 다른 백엔드로 바로 요청
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "2"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "60"))
+# 적합성 평가 LLM 호출 한 번의 제한 시간 (초, 0이면 제한 없음)
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "90"))
+# 적합성 평가 요청 헤징: 응답이 최근 p95보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "2"))
+# 헤지 요청은 전체 호출 수의 이 비율까지만 (추가 비용 상한), 동시에 진행 중인 헤지는 이 개수까지만
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05"))
+LLM_HEDGE_MAX_IN_FLIGHT = int(os.getenv("LLM_HEDGE_MAX_IN_FLIGHT", "2"))
+
 # 데이터 파싱 함수들 추가
 def parse_certificate_data(certificate_text):
     """자격증 텍스트를 파싱하여 구조화된 형태로 변환"""
@@ -74,6 +95,7 @@ def parse_certificate_data(certificate_text):
     
     return certificates
 
+@trace_stage("process_certificate_field")
 def process_certificate_field(field_content):
     """자격증 필드 내용을 구조화된 형태로 변환"""
     if not field_content:
@@ -135,6 +157,7 @@ def parse_award_data(award_text):
     
     return awards
 
+@trace_stage("process_award_field")
 def process_award_field(field_content):
     """수상경력 필드 내용을 구조화된 형태로 변환"""
     if not field_content:
@@ -216,6 +239,7 @@ def parse_education_data(education_text):
     
     return education_records
 
+@trace_stage("process_education_field")
 def process_education_field(field_content):
     """학력사항 필드 내용을 구조화된 형태로 변환"""
     if not field_content:
@@ -320,6 +344,7 @@ def parse_experience_data(experience_text):
     
     return experience_records
 
+@trace_stage("process_experience_field")
 def process_experience_field(field_content):
     """경력사항 필드 내용을 구조화된 형태로 변환"""
     if not field_content:
@@ -339,9 +364,31 @@ except ImportError as e:
     st.error(f"LangChain 모듈을 불러올 수 없습니다: {str(e)}")
     LANGCHAIN_AVAILABLE = False
 
-def evaluate_candidate_fit(job_posting_text, resume_fields):
+def call_llm_backend(backend, request, cancel_token=None, on_duplicate=None):
+    """
+    LLM 요청을 제한 시간/배치 중단 확인과 함께 실행합니다.
+    헤징이 켜져 있으면 백엔드별 정책에 따라 느린 요청에 중복 요청을 보내고,
+    중복 요청이 나갔으면 on_duplicate(응답)로 결과를 버린 요청의 사용량도 집계합니다.
+    """
+    if not LLM_HEDGE_ENABLED:
+        return call_with_deadline(request, LLM_TIMEOUT_SECONDS, cancel_token, "LLM 평가")
+    
+    policy = get_hedge_policy(
+        backend,
+        percentile_ratio=LLM_HEDGE_PERCENTILE,
+        min_samples=LLM_HEDGE_MIN_SAMPLES,
+        min_delay_seconds=LLM_HEDGE_MIN_DELAY_SECONDS,
+        budget_ratio=LLM_HEDGE_BUDGET_RATIO,
+        max_in_flight=LLM_HEDGE_MAX_IN_FLIGHT
+    )
+    return hedged_call(request, policy, LLM_TIMEOUT_SECONDS, cancel_token, "LLM 평가", on_duplicate=on_duplicate)
+
+@trace_stage("evaluate_candidate_fit", is_error=lambda result: not result[0])
+def evaluate_candidate_fit(job_posting_text, resume_fields, usage=None, cancel_token=None):
     """
     채용공고와 이력서 내용을 바탕으로 지원자의 적합성을 평가하는 함수
+    usage(dict)를 전달하면 토큰 사용량이 누적됩니다.
+    cancel_token을 전달하면 배치가 중단될 때 응답을 기다리지 않고 BatchCancelled를 발생시킵니다.
     """
     try:
         # 자격증 데이터 구조화
@@ -410,56 +457,77 @@ def evaluate_candidate_fit(job_posting_text, resume_fields):
         else:
             experience_text = "경력사항: 없음"
         
-        # 프롬프트 구성
-        prompt = f"""
-너는 채용 심사관이야.
-다음은 채용공고 내용이야:
-
----
-{job_posting_text}
----
-
-그리고 다음은 지원자의 이력서에서 추출한 주요 항목들이야:
-
-{education_text}
-{experience_text}
-{certificate_text}
-{award_text}
-
-이 후보자가 이 채용공고에 얼마나 적합한지를 **0~100 사이 점수로 숫자를 출력**해줘.
-점수에 대한 이유와 설명도 같이 출력해주세요.
-"""
+        # 프롬프트 구성: 정적 지시문(시스템 메시지) → 채용공고 → 이력서 순서로 배치하여
+        # 매 호출 같은 접두부가 유지되도록 함 (프롬프트 캐싱)
+        resume_text = "\n".join([education_text, experience_text, certificate_text, award_text])
+        messages = build_evaluation_messages(job_posting_text, resume_text)
+        call_usage = empty_usage()
         
-        # LangChain AzureChatOpenAI 사용 (챗봇과 동일한 방식)
-        try:
-            from langchain_openai import AzureChatOpenAI
-            
-            llm = AzureChatOpenAI(
-                openai_api_version=OPENAI_API_VERSION,
-                azure_deployment="gpt-4.1",
-                azure_endpoint=AZURE_ENDPOINT,
-                api_key=OPENAI_API_KEY,
-                temperature=0.7
-            )
-            
-            # LangChain을 사용한 응답 생성
-            response = llm.invoke(prompt)
-            
-            return True, response.content.strip()
-        except Exception as langchain_error:
-            # LangChain 실패 시 기존 방식으로 폴백
-            setup_openai_client()
-            
-            response = openai.chat.completions.create(
-                model="gpt-4.1",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            return True, response.choices[0].message.content.strip()
+        # 실패가 이어지는 백엔드는 회로 차단기가 건너뛰므로, 지원자마다 실패 대기 시간을 반복하지 않음
+        langchain_breaker = get_circuit_breaker("langchain", LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_COOLDOWN_SECONDS)
+        openai_breaker = get_circuit_breaker("openai", LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_COOLDOWN_SECONDS)
+        evaluation = None
+        
+        # LangChain AzureChatOpenAI 사용 (캐시된 클라이언트 재사용)
+        if langchain_breaker.allow_request():
+            try:
+                llm = get_llm()
+                if llm is None:
+                    raise RuntimeError("LangChain LLM 클라이언트를 사용할 수 없습니다.")
+                
+                # LangChain을 사용한 응답 생성
+                # 헤지로 중복 요청이 나갔으면 버린 응답도 과금되므로 같은 사용량으로 한 번 더 집계 (배치 비용 상한에 반영)
+                response = call_llm_backend(
+                    "langchain",
+                    lambda: llm.invoke(messages),
+                    cancel_token,
+                    on_duplicate=lambda duplicate: record_langchain_usage(call_usage, duplicate)
+                )
+                record_langchain_usage(call_usage, response)
+                evaluation = response.content.strip()
+                langchain_breaker.record_success()
+            except Exception as langchain_error:
+                langchain_breaker.record_failure(langchain_error)
+            except BaseException:
+                # 배치 중단/재실행으로 끊긴 호출은 실패로 세지 않음
+                langchain_breaker.release()
+                raise
+        
+        # LangChain 실패(또는 차단) 시 기존 방식으로 폴백
+        if evaluation is None:
+            if not openai_breaker.allow_request():
+                raise RuntimeError("LLM 백엔드가 모두 차단되어 있습니다. 잠시 후 다시 시도해주세요.")
+            try:
+                setup_openai_client()
+                
+                response = call_llm_backend(
+                    "openai",
+                    lambda: openai.chat.completions.create(
+                        model="gpt-4.1",
+                        messages=to_openai_messages(messages),
+                        temperature=0.7,
+                        max_tokens=2000,
+                        timeout=LLM_TIMEOUT_SECONDS or None
+                    ),
+                    cancel_token,
+                    on_duplicate=lambda duplicate: record_openai_usage(call_usage, duplicate)
+                )
+                record_openai_usage(call_usage, response)
+                evaluation = response.choices[0].message.content.strip()
+                openai_breaker.record_success()
+            except Exception as openai_error:
+                openai_breaker.record_failure(openai_error)
+                raise
+            except BaseException:
+                openai_breaker.release()
+                raise
+        
+        # 호출 사용량 누적 및 프롬프트 버전별 캐시 토큰 기록
+        if usage is not None:
+            add_usage(usage, call_usage)
+        record_prompt_cache_metrics(EVALUATION_PROMPT_VERSION, call_usage)
+        
+        return True, evaluation
     except Exception as e:
         return False, str(e)
 
@@ -495,7 +563,8 @@ def get_llm():
             openai_api_version=OPENAI_API_VERSION,
             azure_endpoint=AZURE_ENDPOINT,
             api_key=OPENAI_API_KEY,
-            temperature=0.7
+            temperature=0.7,
+            timeout=LLM_TIMEOUT_SECONDS or None
         )
         return llm
     except Exception as e:
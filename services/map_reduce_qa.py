@@ -0,0 +1,150 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+import os
+from services.prompt_templates import build_map_messages
+from services.usage_tracker import empty_usage, add_usage, record_langchain_usage, estimate_cost
+from utils.metrics import increment_counter, stage_timer
+
+# .env 파일 로드
+load_dotenv()
+
+# 지원자 전체 대상 질문을 요약 묶음(shard)으로 나눠 동시에 묻는 map-reduce 질의
+MAP_REDUCE_SHARD_SIZE = int(os.getenv("MAP_REDUCE_SHARD_SIZE", "40"))
+MAP_REDUCE_MAX_WORKERS = int(os.getenv("MAP_REDUCE_MAX_WORKERS", "4"))
+# 시간/비용 상한 (0이면 제한 없음). 상한에 닿으면 새 묶음은 보내지 않고 받은 결과로 답변
+MAP_REDUCE_TIMEOUT_SECONDS = float(os.getenv("MAP_REDUCE_TIMEOUT_SECONDS", "60"))
+MAP_REDUCE_BUDGET_USD = float(os.getenv("MAP_REDUCE_BUDGET_USD", "0.5"))
+
+# map 단계 응답 한 줄: "파일명 | 관련도 | 근거" (앞에 붙은 번호/글머리표는 무시)
+MATCH_LINE_PATTERN = re.compile(r'^\s*(?:[-*•]|\d+[.)])?\s*(.+?)\s*\|\s*(\d{1,3})\s*(?:점)?\s*\|\s*(.*)$')
+
+def digest_name(digest):
+    """지원자 요약 줄에서 파일명(첫 항목)을 반환합니다."""
+    return digest.split(" | ", 1)[0].strip()
+
+def parse_map_response(text, shard_names):
+    """map 단계 응답에서 묶음에 실제로 있는 지원자의 (파일명, 관련도, 근거)만 추출합니다."""
+    matches = []
+    for line in (text or "").splitlines():
+        match = MATCH_LINE_PATTERN.match(line)
+        if not match or match.group(1) not in shard_names:
+            continue
+        matches.append({
+            "file_name": match.group(1),
+            "relevance": min(int(match.group(2)), 100),
+            "reason": match.group(3).strip()
+        })
+    return matches
+
+def map_shard(llm, question, shard):
+    """지원자 요약 묶음 하나에 질문하여 (관련 지원자 목록, 사용량)을 반환합니다."""
+    usage = empty_usage()
+    response = llm.invoke(build_map_messages(question, shard))
+    record_langchain_usage(usage, response)
+    return parse_map_response(response.content, {digest_name(digest) for digest in shard}), usage
+
+def merge_ranked_matches(matches, fitness_scores=None):
+    """
+    묶음별 결과를 합쳐 관련도 내림차순(같으면 적합성 점수 내림차순)으로 정렬합니다.
+    같은 지원자가 여러 번 나오면 관련도가 가장 높은 항목만 남깁니다.
+    """
+    fitness_scores = fitness_scores or {}
+    best = {}
+    for match in matches:
+        current = best.get(match["file_name"])
+        if current is None or match["relevance"] > current["relevance"]:
+            best[match["file_name"]] = match
+    
+    return sorted(
+        best.values(),
+        key=lambda match: (-match["relevance"], -(fitness_scores.get(match["file_name"]) or 0), match["file_name"])
+    )
+
+def map_reduce_candidates(llm, question, digests, shard_size=MAP_REDUCE_SHARD_SIZE, max_workers=MAP_REDUCE_MAX_WORKERS,
+                          timeout_seconds=MAP_REDUCE_TIMEOUT_SECONDS, budget_usd=MAP_REDUCE_BUDGET_USD,
+                          fitness_scores=None, progress_callback=None):
+    """
+    지원자 요약 전체를 묶음으로 나눠 최대 max_workers개씩 동시에 질문(map)하고, 결과를 관련도순으로 합칩니다(reduce).
+    시간/비용 상한에 닿으면 새 묶음은 보내지 않습니다. (순위 목록, 사용량, 통계)를 반환합니다.
+    progress_callback(완료 묶음 수, 전체 묶음 수)은 호출한 스레드에서 실행됩니다.
+    """
+    shards = [digests[i:i + shard_size] for i in range(0, len(digests), shard_size)]
+    usage = empty_usage()
+    matches = []
+    stats = {
+        "candidates": len(digests),
+        "shards": len(shards),
+        "completed_shards": 0,
+        "failed_shards": 0,
+        "skipped_shards": 0,
+        "stopped_reason": None,
+        "elapsed_seconds": 0.0
+    }
+    
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="map-reduce-qa")
+    pending = set()
+    next_shard = 0
+    try:
+        with stage_timer("chat.map_reduce"):
+            while next_shard < len(shards) or pending:
+                # 상한에 닿지 않았으면 빈 자리만큼 다음 묶음 제출
+                while stats["stopped_reason"] is None and next_shard < len(shards) and len(pending) < max_workers:
+                    pending.add(executor.submit(map_shard, llm, question, shards[next_shard]))
+                    next_shard += 1
+                if not pending:
+                    break
+                
+                remaining = None
+                if timeout_seconds > 0:
+                    remaining = timeout_seconds - (time.perf_counter() - started)
+                    if remaining <= 0:
+                        stats["stopped_reason"] = "timeout"
+                        break
+                
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        shard_matches, shard_usage = future.result()
+                        matches.extend(shard_matches)
+                        add_usage(usage, shard_usage)
+                        stats["completed_shards"] += 1
+                    except Exception:
+                        stats["failed_shards"] += 1
+                        increment_counter("map_reduce_shards", result="failed")
+                    if progress_callback:
+                        progress_callback(stats["completed_shards"] + stats["failed_shards"], len(shards))
+                
+                if stats["stopped_reason"] is None and budget_usd > 0 and estimate_cost(usage) >= budget_usd:
+                    stats["stopped_reason"] = "budget"
+    finally:
+        # 시간 상한으로 멈춘 경우 진행 중인 묶음은 기다리지 않음 (결과는 버림)
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    stats["skipped_shards"] = len(shards) - stats["completed_shards"] - stats["failed_shards"]
+    stats["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+    increment_counter("map_reduce_shards", stats["completed_shards"], result="completed")
+    if stats["stopped_reason"]:
+        increment_counter("map_reduce_stopped", reason=stats["stopped_reason"])
+    return merge_ranked_matches(matches, fitness_scores), usage, stats
+
+def format_map_reduce_answer(ranked, stats, fitness_scores=None, limit=20):
+    """순위 목록을 챗봇 답변 문자열로 만듭니다."""
+    fitness_scores = fitness_scores or {}
+    if not ranked:
+        lines = ["질문 조건에 맞는 지원자를 찾을 수 없습니다."]
+    else:
+        lines = [f"질문 조건에 맞는 지원자 {len(ranked)}명을 관련도순으로 정리했습니다 (상위 {min(limit, len(ranked))}명):\n"]
+        for rank, match in enumerate(ranked[:limit], start=1):
+            score = fitness_scores.get(match["file_name"])
+            score_text = f", 적합성 점수 {score:.0f}점" if score is not None else ""
+            lines.append(f"{rank}. {match['file_name']} - 관련도 {match['relevance']}{score_text}: {match['reason']}")
+    
+    # 상한/실패로 일부 지원자만 확인했으면 답변에 명시
+    if stats["skipped_shards"] or stats["failed_shards"]:
+        reasons = {"timeout": "시간 상한", "budget": "비용 상한"}
+        reason = reasons.get(stats["stopped_reason"], "일부 요청 실패")
+        lines.append(f"\n※ {reason}으로 전체 {stats['shards']}개 묶음 중 {stats['completed_shards']}개만 확인한 결과입니다.")
+    return "\n".join(lines)
@@ -0,0 +1,335 @@
+import streamlit as st
+from dotenv import load_dotenv
+import os
+import re
+from services.document_intelligence import analyze_resume_with_ai, report_problem, ResumeAnalysisError
+from services.usage_tracker import empty_usage, add_usage, usage_delta, estimate_cost
+from services.retry_queue import STAGE_ANALYSIS, STAGE_EVALUATION
+from utils.candidate_table import total_experience_years, highest_degree, certificate_names, key_skills, format_candidate_digest
+from utils.result_store import get_result_store, posting_key
+from utils.metrics import increment_counter
+from services.llm_service import (
+    evaluate_candidate_fit, extract_score_from_evaluation,
+    process_certificate_field, process_award_field, process_education_field, process_experience_field
+)
+
+# .env 파일 로드
+load_dotenv()
+
+# 세션/사용자 간 공유 결과 저장소 (SQLite 파일, 같은 경로를 쓰는 모든 세션이 공유)
+RESULT_STORE_ENABLED = os.getenv("RESULT_STORE_ENABLED", "true").lower() == "true"
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "store/results.db")
+
+# 적합도 평가에 사용하는 이력서 필드와 구조화 함수
+TARGET_FIELDS = ["학력사항", "경력사항", "자격증", "수상경력"]
+FIELD_PROCESSORS = {
+    "학력사항": process_education_field,
+    "경력사항": process_experience_field,
+    "자격증": process_certificate_field,
+    "수상경력": process_award_field
+}
+
+def build_resume_fields(fields_data):
+    """Document Intelligence 필드에서 평가 대상 필드를 구조화된 형태로 변환합니다."""
+    resume_fields = {}
+    for field_name in TARGET_FIELDS:
+        if field_name in fields_data:
+            resume_fields[field_name] = FIELD_PROCESSORS[field_name](fields_data[field_name]['content'])
+    return resume_fields
+
+def build_debug_info(resume_fields, job_text):
+    """평가 실패 시 함께 표시할 디버그 정보를 만듭니다."""
+    openai_key = os.getenv("OPENAI_API_KEY")
+    azure_endpoint = os.getenv("AZURE_ENDPOINT")
+    
+    return f"""
+🔍 디버그 정보:
+- OpenAI API 키: {'설정됨' if openai_key else '설정되지 않음'}
+- Azure 엔드포인트: {'설정됨' if azure_endpoint else '설정되지 않음'}
+- 이력서 필드 수: {len(resume_fields)}
+- 채용공고 길이: {len(job_text) if job_text else 0}자
+"""
+
+def extract_resume(blob_name, job_posting=None, cancel_token=None, on_error=None):
+    """
+    이력서 한 건을 분석(Document Intelligence 또는 로컬 추출)하고 평가 전 결과를 만듭니다.
+    분석에 실패하면 ResumeAnalysisError가 발생합니다.
+    """
+    analysis_result = analyze_resume_with_ai(blob_name, cancel_token=cancel_token, on_error=on_error)
+    
+    # 사용량 기록 (DI 과금 페이지 + LLM 토큰)
+    usage = empty_usage()
+    if analysis_result.get("extraction_source") == "document_intelligence":
+        usage["di_pages"] = analysis_result.get("page_count", 0)
+    
+    return {
+        "file_name": blob_name,
+        "job_posting": job_posting,
+        "analysis": analysis_result,
+        "fitness_evaluation": None,
+        "fitness_score": None,
+        "usage": usage
+    }
+
+def get_resume_fields(result):
+    """분석 결과에서 평가 대상 필드를 구조화하여 반환합니다."""
+    analysis_result = result["analysis"]
+    if not analysis_result["documents"] or not analysis_result["documents"][0]["fields"]:
+        return {}
+    return build_resume_fields(analysis_result["documents"][0]["fields"])
+
+def tokenize(text):
+    """우선순위 계산용으로 텍스트를 소문자 단어 집합으로 나눕니다."""
+    return {token for token in re.findall(r'[0-9A-Za-z가-힣.+#]{2,}', text.lower())}
+
+def priority_score(job_text, result):
+    """
+    LLM 평가 전에 계산하는 간단한 우선순위 점수입니다.
+    채용공고 단어가 이력서 필드에 얼마나 등장하는지(0~1)를 봅니다.
+    """
+    if not job_text:
+        return 0.0
+    job_tokens = tokenize(job_text)
+    if not job_tokens:
+        return 0.0
+    
+    fields = result["analysis"]["documents"][0]["fields"] if result["analysis"]["documents"] else {}
+    resume_text = " ".join(fields[name]['content'] for name in TARGET_FIELDS if name in fields)
+    return len(job_tokens & tokenize(resume_text)) / len(job_tokens)
+
+def score_resume(result, job_text, cancel_token=None):
+    """분석된 이력서의 채용공고 적합도를 평가하여 result에 기록하고 result를 반환합니다."""
+    if not job_text:
+        return result
+    
+    resume_fields = get_resume_fields(result)
+    if not resume_fields:
+        return result
+    
+    success, evaluation_result = evaluate_candidate_fit(job_text, resume_fields, usage=result["usage"], cancel_token=cancel_token)
+    if success:
+        result["fitness_evaluation"] = evaluation_result
+        result["fitness_score"] = extract_score_from_evaluation(evaluation_result)
+        result.pop("evaluation_error", None)
+    else:
+        # 실패 시 디버그 정보 포함 (오류 메시지는 재시도 분류용으로 따로 보관)
+        result["fitness_evaluation"] = f"❌ 평가 실패\n{build_debug_info(resume_fields, job_text)}\n\n오류: {evaluation_result}"
+        result["fitness_score"] = None
+        result["evaluation_error"] = evaluation_result
+    return result
+
+def build_candidate_row(result, keyword_match=None):
+    """평가가 끝난 결과를 지원자 테이블(CandidateTable)의 한 행으로 변환합니다."""
+    analysis = result["analysis"]
+    resume_fields = get_resume_fields(result)
+    certificates = certificate_names(resume_fields.get("자격증", []))
+    degree_level, degree_label = highest_degree(resume_fields.get("학력사항", []))
+    experience_years = total_experience_years(resume_fields.get("경력사항", []))
+    skills = key_skills(resume_fields.get("경력사항", []), certificates)
+    fields = list(analysis["documents"][0]["fields"].keys()) if analysis["documents"] else []
+    usage = result.get("usage") or {}
+    
+    return {
+        "파일명": result["file_name"],
+        "채용공고": result.get("job_posting"),
+        "적합성 점수": result.get("fitness_score"),
+        "키워드 일치도": round(keyword_match, 3) if keyword_match is not None else None,
+        "경력(년)": experience_years,
+        "최종 학력": degree_label,
+        "학력 수준": degree_level,
+        "주요 기술": ", ".join(skills),
+        "자격증 수": len(certificates),
+        "자격증 보유": bool(certificates),
+        "자격증 목록": ", ".join(certificates),
+        "수상 수": len(resume_fields.get("수상경력", [])),
+        "문서 수": len(analysis["documents"]),
+        "페이지 수": analysis.get("page_count", len(analysis["pages"])),
+        "테이블 수": analysis.get("table_count", len(analysis["tables"])),
+        "키-값 쌍 수": analysis.get("kv_count", len(analysis["key_value_pairs"])),
+        "추출된 필드": ", ".join(fields[:5]) + ("..." if len(fields) > 5 else ""),
+        "토큰 수": usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0),
+        "예상 비용($)": round(estimate_cost(usage), 4),
+        "요약": format_candidate_digest(
+            os.path.basename(result["file_name"]), result.get("fitness_score"),
+            degree_label, experience_years, skills, certificates
+        )
+    }
+
+def get_shared_store(on_error=None):
+    """공유 결과 저장소를 반환합니다. 비활성화되었거나 열 수 없으면 None을 반환합니다."""
+    if not RESULT_STORE_ENABLED:
+        return None
+    try:
+        return get_result_store(RESULT_STORE_PATH)
+    except Exception as e:
+        report_problem(f"공유 결과 저장소를 열 수 없습니다: {str(e)}", on_error)
+        return None
+
+def load_or_extract_resume(blob_name, resume_version, job_posting=None, cancel_token=None, on_error=None):
+    """
+    공유 저장소에 같은 버전(ETag)의 분석 결과가 있으면 재사용하고, 없으면 분석 후 저장합니다.
+    분석에 실패하면 ResumeAnalysisError가 발생합니다.
+    on_error를 전달하면 오류와 경고를 화면 대신 콜백으로 알립니다 (백그라운드 수집기 등).
+    """
+    store = get_shared_store(on_error)
+    if store and resume_version:
+        try:
+            analysis = store.get_analysis(blob_name, resume_version)
+        except Exception as e:
+            report_problem(f"저장소 조회 실패: {str(e)}", on_error)
+            analysis = None
+        if analysis is not None:
+            increment_counter("result_store_lookups", result="hit", kind="analysis")
+            return {
+                "file_name": blob_name,
+                "job_posting": job_posting,
+                "analysis": analysis,
+                "fitness_evaluation": None,
+                "fitness_score": None,
+                "usage": empty_usage(),
+                "resume_version": resume_version,
+                "cached_analysis": True
+            }
+        increment_counter("result_store_lookups", result="miss", kind="analysis")
+    
+    result = extract_resume(blob_name, job_posting=job_posting, cancel_token=cancel_token, on_error=on_error)
+    result["resume_version"] = resume_version
+    if store and resume_version:
+        try:
+            store.put_analysis(blob_name, resume_version, result["analysis"])
+        except Exception as e:
+            report_problem(f"저장소 저장 실패: {str(e)}", on_error)
+    return result
+
+def load_or_score_resume(result, job_text, cancel_token=None, on_error=None):
+    """
+    공유 저장소에 같은 채용공고/이력서 버전의 평가 결과가 있으면 재사용하고, 없으면 평가 후 저장합니다.
+    평가에 실패한 결과는 저장하지 않습니다 (on_error를 전달하면 저장소 오류를 콜백으로 알림).
+    """
+    store = get_shared_store(on_error)
+    key = posting_key(result.get("job_posting"), job_text)
+    version = result.get("resume_version")
+    if not (store and key and version):
+        return score_resume(result, job_text, cancel_token=cancel_token)
+    
+    # 메모리 상한으로 상세 데이터를 뺀 뒤 저장소에서 다시 찾을 때 사용
+    result["posting_key"] = key
+    
+    try:
+        cached = store.get_evaluation(key, result["file_name"], version)
+    except Exception as e:
+        report_problem(f"저장소 조회 실패: {str(e)}", on_error)
+        cached = None
+    if cached is not None:
+        increment_counter("result_store_lookups", result="hit", kind="evaluation")
+        result["fitness_score"] = cached["fitness_score"]
+        result["fitness_evaluation"] = cached["fitness_evaluation"]
+        result["cached_evaluation"] = True
+        return result
+    increment_counter("result_store_lookups", result="miss", kind="evaluation")
+    
+    score_resume(result, job_text, cancel_token=cancel_token)
+    if result["fitness_score"] is not None:
+        try:
+            store.put_evaluation(key, result["file_name"], version, result["fitness_score"], result["fitness_evaluation"], result["usage"])
+        except Exception as e:
+            report_problem(f"저장소 저장 실패: {str(e)}", on_error)
+    return result
+
+def results_posting_key(results):
+    """결과 목록이 평가된 채용공고의 저장소 키를 반환합니다 (공유 저장소로 평가하지 않았으면 None)."""
+    return next((result["posting_key"] for result in results if result.get("posting_key")), None)
+
+def load_top_evaluations(posting, limit, min_score=None):
+    """
+    공유 저장소에서 채용공고의 점수 상위 평가 결과를 조회합니다 (다른 세션에서 평가한 이력서 포함).
+    저장소를 사용할 수 없거나 조회에 실패하면 None을 반환합니다.
+    """
+    store = get_shared_store()
+    if not (store and posting):
+        return None
+    try:
+        return store.top_evaluations(posting, limit=limit, min_score=min_score)
+    except Exception as e:
+        st.warning(f"저장소 조회 실패: {str(e)}")
+        return None
+
+def load_evaluation_history(file_name):
+    """공유 저장소에서 이력서 한 건의 모든 채용공고 평가 이력을 조회합니다 (사용할 수 없으면 빈 목록)."""
+    store = get_shared_store()
+    if not store:
+        return []
+    try:
+        return store.find_by_file_name(file_name)
+    except Exception as e:
+        st.warning(f"저장소 조회 실패: {str(e)}")
+        return []
+
+def load_store_stats():
+    """공유 저장소의 분석/평가 결과 수를 반환합니다 (사용할 수 없으면 None)."""
+    store = get_shared_store()
+    if not store:
+        return None
+    try:
+        return store.stats()
+    except Exception as e:
+        st.warning(f"저장소 조회 실패: {str(e)}")
+        return None
+
+def restore_result_details(result):
+    """
+    메모리 상한으로 상세 데이터를 뺀 결과를 공유 저장소에서 다시 채워 반환합니다.
+    저장소를 사용할 수 없거나 결과를 찾지 못하면 None을 반환합니다.
+    """
+    store = get_shared_store()
+    version = result.get("resume_version")
+    if not (store and version):
+        return None
+    
+    try:
+        analysis = store.get_analysis(result["file_name"], version)
+        evaluation = store.get_evaluation(result["posting_key"], result["file_name"], version) if result.get("posting_key") else None
+    except Exception as e:
+        st.warning(f"저장소 조회 실패: {str(e)}")
+        return None
+    if analysis is None:
+        return None
+    
+    restored = {**result, "analysis": analysis, "details_evicted": False}
+    if evaluation is not None:
+        restored["fitness_evaluation"] = evaluation["fitness_evaluation"]
+    return restored
+
+def retry_failed_item(item, job_text, batch_usage=None, cancel_token=None):
+    """
+    재시도 대기열 항목 하나를 다시 처리합니다. 성공하면 None, 실패하면 오류(예외 또는 메시지)를 반환합니다.
+    분석이 성공하면 항목을 평가 단계로 바꾸고 이어서 평가하며, 결과는 item["result"]에 보관합니다.
+    batch_usage를 전달하면 재시도로 늘어난 사용량이 누적됩니다.
+    """
+    if item["stage"] == STAGE_ANALYSIS:
+        try:
+            result = load_or_extract_resume(item["file_name"], item.get("resume_version"), job_posting=item.get("job_posting"), cancel_token=cancel_token)
+        except ResumeAnalysisError as e:
+            return e
+        if batch_usage is not None:
+            add_usage(batch_usage, result["usage"])
+        item["stage"] = STAGE_EVALUATION
+        item["result"] = result
+    
+    result = item["result"]
+    usage_before = dict(result["usage"])
+    load_or_score_resume(result, job_text, cancel_token=cancel_token)
+    if batch_usage is not None:
+        add_usage(batch_usage, usage_delta(usage_before, result["usage"]))
+    return result.get("evaluation_error")
+
+def process_resume(blob_name, job_text, job_posting=None):
+    """
+    이력서 한 건을 분석하고 채용공고 적합도를 평가합니다.
+    분석에 실패하면 None을 반환합니다.
+    """
+    try:
+        result = extract_resume(blob_name, job_posting=job_posting)
+    except ResumeAnalysisError:
+        return None
+    return score_resume(result, job_text)
@@ -0,0 +1,162 @@
+import re
+import time
+import random
+from dotenv import load_dotenv
+import os
+from utils.metrics import increment_counter
+from utils.cancellation import BatchCancelled
+
+# .env 파일 로드
+load_dotenv()
+
+# 배치 본 처리 후 실패 항목을 다시 처리하는 재시도 단계 설정
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "2"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "30"))
+
+# 실패 단계
+STAGE_ANALYSIS = "analysis"
+STAGE_EVALUATION = "evaluation"
+STAGE_LABELS = {STAGE_ANALYSIS: "이력서 분석", STAGE_EVALUATION: "적합성 평가"}
+
+# 실패 유형
+FAILURE_TRANSIENT = "transient"
+FAILURE_PERMANENT = "permanent"
+FAILURE_LABELS = {FAILURE_TRANSIENT: "일시적", FAILURE_PERMANENT: "영구"}
+
+# 다시 시도해도 결과가 같은 오류 (잘못된 파일/요청, 인증, 설정 문제)
+PERMANENT_ERROR_PATTERN = re.compile(
+    r'(\b(400|401|403|404|413|415)\b|invalid|unsupported|corrupt|password|unauthori[sz]ed|forbidden|'
+    r'not\s*found|content_filter|content management policy|authentication|클라이언트를 가져올 수 없|지원하지 않는)',
+    re.IGNORECASE
+)
+# 잠시 후 다시 시도하면 성공할 수 있는 오류 (시간 초과, 요청 제한, 서버 오류, 연결 문제, 회로 차단)
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r'(\b(408|429|500|502|503|504)\b|time\s*d?\s*out|timeout|rate\s*limit|too many requests|throttl|'
+    r'temporar|unavailable|connection|reset by peer|server error|overloaded|차단되어)',
+    re.IGNORECASE
+)
+
+def classify_failure(error):
+    """
+    실패 오류를 일시적(transient) 또는 영구(permanent)로 분류합니다.
+    영구 오류 패턴에만 해당하면 영구 오류이고, 일시적 오류 패턴이 함께 보이거나 어느 쪽에도 해당하지 않으면
+    일시적인 것으로 보고 재시도합니다 (재시도 횟수는 제한됨).
+    """
+    # 분석 실패처럼 원래 예외를 감싼 경우 원래 예외 유형도 확인
+    if isinstance(error, (TimeoutError, ConnectionError)) or isinstance(getattr(error, "__cause__", None), (TimeoutError, ConnectionError)):
+        return FAILURE_TRANSIENT
+    message = str(error or "")
+    if PERMANENT_ERROR_PATTERN.search(message) and not TRANSIENT_ERROR_PATTERN.search(message):
+        return FAILURE_PERMANENT
+    return FAILURE_TRANSIENT
+
+def backoff_delay(attempt, base_delay=RETRY_BASE_DELAY_SECONDS, max_delay=RETRY_MAX_DELAY_SECONDS):
+    """attempt번째 재시도 전 대기 시간(초)을 반환합니다 (지수 증가 + 지터)."""
+    delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
+    return delay * random.uniform(0.5, 1.0)
+
+class RetryQueue:
+    """
+    배치 본 처리에서 실패한 이력서를 모아 두었다가, 본 처리가 끝난 뒤 백오프를 두고 다시 처리합니다.
+    영구 오류는 재시도하지 않고 바로 복구 불가 목록에 넣습니다.
+    """
+    
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY_SECONDS, max_delay=RETRY_MAX_DELAY_SECONDS):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.pending = []
+        self.recovered = []
+        self.unrecoverable = []
+    
+    def add(self, stage, file_name, error, **context):
+        """실패 항목을 추가합니다. context(이력서 버전, 분석 결과 등)는 재시도 처리 함수에 그대로 전달됩니다."""
+        kind = classify_failure(error)
+        item = {
+            "stage": stage,
+            "failed_stage": stage,
+            "file_name": file_name,
+            "error": str(error or "알 수 없는 오류"),
+            "kind": kind,
+            "attempts": 0,
+            "reason": None,
+            **context
+        }
+        increment_counter("batch_failures", stage=stage, kind=kind)
+        if kind == FAILURE_PERMANENT:
+            item["reason"] = "영구 오류"
+            self.unrecoverable.append(item)
+        else:
+            self.pending.append(item)
+        return item
+    
+    def run(self, handler, should_stop=None, progress_callback=None, sleep=time.sleep):
+        """
+        대기 중인 항목을 최대 max_attempts번까지 다시 처리합니다.
+        handler(item)는 성공하면 None, 실패하면 오류를 반환합니다 (item의 단계/결과를 바꿀 수 있음).
+        should_stop()이 True이거나 배치가 중단(BatchCancelled)되면 남은 항목은 재시도하지 않습니다.
+        progress_callback(시도 차수, 처리한 항목 수, 이번 차수 항목 수)은 항목마다 호출됩니다.
+        """
+        stopped = False
+        for attempt in range(1, self.max_attempts + 1):
+            if stopped or not self.pending or (should_stop and should_stop()):
+                break
+            
+            sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+            retrying, self.pending = self.pending, []
+            for index, item in enumerate(retrying, start=1):
+                if should_stop and should_stop():
+                    self.pending.extend(retrying[index - 1:])
+                    break
+                
+                item["attempts"] = attempt
+                try:
+                    error = handler(item)
+                except BatchCancelled:
+                    self.pending.extend(retrying[index - 1:])
+                    stopped = True
+                    break
+                except Exception as e:
+                    error = e
+                
+                if error is None:
+                    self.recovered.append(item)
+                    increment_counter("batch_retries", stage=item["failed_stage"], result="recovered")
+                else:
+                    item["error"] = str(error)
+                    item["kind"] = classify_failure(error)
+                    if item["kind"] == FAILURE_PERMANENT:
+                        item["reason"] = "영구 오류"
+                        self.unrecoverable.append(item)
+                        increment_counter("batch_retries", stage=item["failed_stage"], result="permanent")
+                    else:
+                        self.pending.append(item)
+                
+                if progress_callback:
+                    progress_callback(attempt, index, len(retrying))
+        
+        return self.abandon_pending()
+    
+    def abandon_pending(self):
+        """남은 항목을 복구 불가로 처리합니다 (재시도 횟수를 다 썼거나 중단된 경우)."""
+        for item in self.pending:
+            item["reason"] = "재시도 횟수 초과" if item["attempts"] >= self.max_attempts else "재시도 중단"
+            increment_counter("batch_retries", stage=item["failed_stage"], result="exhausted")
+        self.unrecoverable.extend(self.pending)
+        self.pending = []
+        return self
+    
+    def report_rows(self):
+        """복구하지 못한 항목을 표 행으로 만듭니다 (최종 보고서용)."""
+        return [
+            {
+                "파일명": os.path.basename(item["file_name"]),
+                "실패 단계": STAGE_LABELS[item["stage"]],
+                "오류 유형": FAILURE_LABELS[item["kind"]],
+                "사유": item["reason"],
+                "재시도 횟수": item["attempts"],
+                "오류": item["error"]
+            }
+            for item in self.unrecoverable
+        ]
@@ -0,0 +1,100 @@
+from dotenv import load_dotenv
+import os
+from utils.metrics import increment_counter
+
+# .env 파일 로드
+load_dotenv()
+
+# 단가 (USD, 배포 환경에 맞게 설정)
+LLM_PROMPT_PRICE_PER_1K = float(os.getenv("LLM_PROMPT_PRICE_PER_1K", "0.002"))
+LLM_CACHED_PROMPT_PRICE_PER_1K = float(os.getenv("LLM_CACHED_PROMPT_PRICE_PER_1K", "0.0005"))
+LLM_COMPLETION_PRICE_PER_1K = float(os.getenv("LLM_COMPLETION_PRICE_PER_1K", "0.008"))
+DI_PRICE_PER_PAGE = float(os.getenv("DI_PRICE_PER_PAGE", "0.03"))
+
+# 배치당 비용 상한 (USD, 0이면 제한 없음)
+BATCH_BUDGET_USD = float(os.getenv("BATCH_BUDGET_USD", "0"))
+
+USAGE_KEYS = ["prompt_tokens", "completion_tokens", "cached_tokens", "di_pages", "llm_calls"]
+
+def empty_usage():
+    """빈 사용량 기록을 반환합니다."""
+    return {key: 0 for key in USAGE_KEYS}
+
+def add_usage(total, usage):
+    """usage를 total에 누적하고 total을 반환합니다."""
+    if usage:
+        for key in USAGE_KEYS:
+            total[key] = total.get(key, 0) + usage.get(key, 0)
+    return total
+
+def usage_delta(before, after):
+    """두 사용량 기록의 차이(after - before)를 반환합니다."""
+    return {key: after.get(key, 0) - before.get(key, 0) for key in USAGE_KEYS}
+
+def record_langchain_usage(usage, response):
+    """LangChain 응답의 usage_metadata를 사용량 기록에 누적합니다."""
+    if usage is None:
+        return
+    metadata = getattr(response, "usage_metadata", None) or {}
+    input_details = metadata.get("input_token_details") or {}
+    usage["prompt_tokens"] += metadata.get("input_tokens", 0)
+    usage["completion_tokens"] += metadata.get("output_tokens", 0)
+    usage["cached_tokens"] += input_details.get("cache_read", 0) or 0
+    usage["llm_calls"] += 1
+
+def record_openai_usage(usage, response):
+    """openai chat.completions 응답의 usage를 사용량 기록에 누적합니다."""
+    if usage is None:
+        return
+    response_usage = getattr(response, "usage", None)
+    if response_usage is None:
+        usage["llm_calls"] += 1
+        return
+    prompt_details = getattr(response_usage, "prompt_tokens_details", None)
+    usage["prompt_tokens"] += getattr(response_usage, "prompt_tokens", 0) or 0
+    usage["completion_tokens"] += getattr(response_usage, "completion_tokens", 0) or 0
+    usage["cached_tokens"] += (getattr(prompt_details, "cached_tokens", 0) or 0) if prompt_details else 0
+    usage["llm_calls"] += 1
+
+def record_callback_usage(usage, callback):
+    """LangChain get_openai_callback 결과를 사용량 기록에 누적합니다."""
+    if usage is None or callback is None:
+        return
+    usage["prompt_tokens"] += getattr(callback, "prompt_tokens", 0) or 0
+    usage["completion_tokens"] += getattr(callback, "completion_tokens", 0) or 0
+    usage["cached_tokens"] += getattr(callback, "prompt_tokens_cached", 0) or 0
+    usage["llm_calls"] += getattr(callback, "successful_requests", 0) or 0
+
+def record_prompt_cache_metrics(prompt_version, usage):
+    """프롬프트 버전별 입력 토큰과 캐시 적중 토큰 수를 지표 카운터에 누적합니다."""
+    if not usage or not usage.get("llm_calls"):
+        return
+    increment_counter("llm_prompt_tokens", usage.get("prompt_tokens", 0), prompt=prompt_version, kind="total")
+    increment_counter("llm_prompt_tokens", usage.get("cached_tokens", 0), prompt=prompt_version, kind="cached")
+    increment_counter("llm_prompt_calls", usage.get("llm_calls", 0), prompt=prompt_version)
+
+def estimate_cost(usage):
+    """사용량 기록으로 예상 비용(USD)을 계산합니다."""
+    if not usage:
+        return 0.0
+    cached_tokens = usage.get("cached_tokens", 0)
+    uncached_prompt_tokens = max(usage.get("prompt_tokens", 0) - cached_tokens, 0)
+    return (
+        uncached_prompt_tokens / 1000 * LLM_PROMPT_PRICE_PER_1K
+        + cached_tokens / 1000 * LLM_CACHED_PROMPT_PRICE_PER_1K
+        + usage.get("completion_tokens", 0) / 1000 * LLM_COMPLETION_PRICE_PER_1K
+        + usage.get("di_pages", 0) * DI_PRICE_PER_PAGE
+    )
+
+def is_over_budget(usage, budget_usd=BATCH_BUDGET_USD):
+    """배치 사용량이 비용 상한을 넘었는지 확인합니다."""
+    return budget_usd > 0 and estimate_cost(usage) >= budget_usd
+
+def format_usage(usage):
+    """사용량을 한 줄 요약 문자열로 만듭니다."""
+    usage = usage or empty_usage()
+    return (
+        f"입력 {usage.get('prompt_tokens', 0):,} (캐시 {usage.get('cached_tokens', 0):,}) / "
+        f"출력 {usage.get('completion_tokens', 0):,} 토큰, DI {usage.get('di_pages', 0)}페이지, "
+        f"약 ${estimate_cost(usage):.4f}"
+    )
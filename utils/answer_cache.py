@@ -0,0 +1,110 @@
+import re
+import math
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 정규화 시 제거할 문장부호/군더더기 표현
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+FILLER_PATTERN = re.compile(r'(좀|혹시|please)\s*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def normalize_question(question):
+    """대소문자, 문장부호, 공백 차이를 없앤 질문 문자열을 반환합니다."""
+    text = PUNCTUATION_PATTERN.sub(" ", question.lower())
+    text = FILLER_PATTERN.sub("", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+def candidate_set_version(results, index_version=""):
+    """지원자 집합(파일명, 점수)과 검색 인덱스 버전으로 캐시 버전을 만듭니다."""
+    digest = hashlib.sha256(index_version.encode("utf-8"))
+    for result in sorted(results or [], key=lambda item: item["file_name"]):
+        digest.update(f"{result['file_name']}:{result.get('resume_version')}:{result.get('fitness_score')}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def vector_norm(vector):
+    """벡터의 L2 노름을 반환합니다 (0이면 1.0)."""
+    return math.sqrt(sum(value * value for value in vector)) or 1.0
+
+class AnswerCache:
+    """
+    챗봇 답변 캐시입니다.
+    정규화한 질문이 같으면 바로, 다르면 임베딩 코사인 유사도가 기준 이상인 질문의 답변을 재사용합니다.
+    항목은 버전(지원자 집합 + 인덱스 버전)별로 구분되며, 버전이 바뀌면 이전 항목은 조회되지 않습니다.
+    """
+    
+    def __init__(self, max_entries=256, similarity_threshold=0.95):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+    
+    def lookup_exact(self, version, question):
+        """정규화한 질문이 같은 항목을 찾습니다."""
+        key = (version, normalize_question(question))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return entry
+    
+    def lookup_similar(self, version, embedding):
+        """같은 버전의 항목 중 임베딩 유사도가 가장 높은(기준 이상) 항목을 찾습니다."""
+        if embedding is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        
+        norm = vector_norm(embedding)
+        best_key, best_similarity = None, self.similarity_threshold
+        with self._lock:
+            for key, entry in self._entries.items():
+                if key[0] != version or entry["embedding"] is None:
+                    continue
+                similarity = sum(a * b for a, b in zip(embedding, entry["embedding"])) / (norm * entry["norm"])
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+            
+            if best_key is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.stats["semantic_hits"] += 1
+            return {**self._entries[best_key], "similarity": best_similarity}
+    
+    def put(self, version, question, answer, embedding=None):
+        """답변을 저장합니다. 최대 개수를 넘으면 가장 오래 사용하지 않은 항목을 지웁니다."""
+        key = (version, normalize_question(question))
+        with self._lock:
+            self._entries[key] = {
+                "question": question,
+                "answer": answer,
+                "embedding": embedding,
+                "norm": vector_norm(embedding) if embedding else 1.0,
+                "created_at": time.time()
+            }
+            self._entries.move_to_end(key)
+            
+            # 다른 버전의 항목부터 정리
+            for stale_key in [k for k in self._entries if k[0] != version]:
+                if len(self._entries) <= self.max_entries:
+                    break
+                del self._entries[stale_key]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def hit_rate(self):
+        """지금까지의 캐시 적중률 (0~1)을 반환합니다."""
+        with self._lock:
+            hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+            total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+    
+    def clear(self):
+        """모든 항목을 지웁니다."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,92 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+# 중단 사유
+CANCEL_REASON_USER = "cancelled"
+CANCEL_REASON_DEADLINE = "deadline"
+
+# 진행 중인 요청을 기다리며 중단 여부를 확인하는 간격 (초)
+WAIT_SLICE_SECONDS = 0.5
+
+class BatchCancelled(BaseException):
+    """
+    배치가 중단(사용자 요청 또는 전체 제한 시간 초과)되었을 때 발생합니다.
+    Streamlit의 재실행 예외처럼 BaseException을 상속하여, 단계별 except Exception 처리에서 실패로 삼키지 않습니다.
+    """
+
+    def __init__(self, reason):
+        super().__init__(f"배치 중단: {reason}")
+        self.reason = reason
+
+class CancelToken:
+    """
+    배치 중단 신호와 전체 제한 시간을 함께 관리합니다.
+    check()는 중단되었거나 제한 시간이 지났으면 BatchCancelled를 발생시키고,
+    heartbeat(예: 상태 표시 갱신)를 호출하여 Streamlit이 중단 버튼 입력을 처리할 수 있게 합니다.
+    """
+
+    def __init__(self, deadline_seconds=0, heartbeat=None):
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + deadline_seconds if deadline_seconds > 0 else None
+        self.heartbeat = heartbeat
+        self.reason = None
+        self._event = threading.Event()
+
+    def cancel(self, reason=CANCEL_REASON_USER):
+        """중단을 요청합니다."""
+        if self.reason is None:
+            self.reason = reason
+        self._event.set()
+
+    def is_cancelled(self):
+        """중단 요청이 있었거나 제한 시간이 지났는지 확인합니다."""
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(CANCEL_REASON_DEADLINE)
+        return self._event.is_set()
+
+    def remaining(self):
+        """전체 제한 시간까지 남은 시간(초)을 반환합니다 (제한 없으면 None)."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def check(self):
+        """중단되었으면 BatchCancelled를 발생시킵니다."""
+        if self.heartbeat:
+            self.heartbeat()
+        if self.is_cancelled():
+            raise BatchCancelled(self.reason)
+
+def wait_with_deadline(is_done, wait, timeout_seconds, cancel_token=None, stage="요청"):
+    """
+    is_done()이 참이 될 때까지 wait(초)를 짧게 반복 호출하며 기다립니다.
+    단계 제한 시간이 지나면 TimeoutError, 배치가 중단되면 BatchCancelled를 발생시킵니다.
+    """
+    started_at = time.monotonic()
+    while not is_done():
+        if cancel_token:
+            cancel_token.check()
+        if timeout_seconds > 0 and time.monotonic() - started_at >= timeout_seconds:
+            raise TimeoutError(f"{stage} 시간 초과 ({timeout_seconds:.0f}초)")
+        wait(WAIT_SLICE_SECONDS)
+
+# 중단 가능한 호출을 실행하는 작업 스레드 (중단/시간 초과된 호출은 결과를 버리고 기다리지 않음)
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="cancellable-call")
+
+def call_with_deadline(func, timeout_seconds=0, cancel_token=None, stage="요청"):
+    """
+    func()를 작업 스레드에서 실행하고 결과를 반환합니다.
+    기다리는 동안 단계 제한 시간과 배치 중단 여부를 확인합니다 (둘 다 없으면 바로 호출).
+    """
+    if cancel_token is None and timeout_seconds <= 0:
+        return func()
+
+    future = _executor.submit(func)
+    try:
+        wait_with_deadline(future.done, lambda seconds: wait_futures([future], timeout=seconds), timeout_seconds, cancel_token, stage)
+    except BaseException:
+        # 시간 초과, 배치 중단, Streamlit 재실행(중단 버튼) 모두 결과를 기다리지 않음
+        future.cancel()
+        raise
+    return future.result()
@@ -0,0 +1,176 @@
+import re
+import pandas as pd
+
+# 학력 문자열에서 찾을 키워드와 학위 수준 (앞에서부터 먼저 일치하는 항목 사용)
+DEGREE_LEVELS = [
+    ("박사", 5, "박사"),
+    ("석사", 4, "석사"),
+    ("대학원", 4, "석사"),
+    ("2,3년", 2, "전문학사"),
+    ("2년", 2, "전문학사"),
+    ("3년", 2, "전문학사"),
+    ("전문", 2, "전문학사"),
+    ("학사", 3, "학사"),
+    ("대학", 3, "학사"),
+    ("고등학교", 1, "고졸")
+]
+DEGREE_LABELS = ["박사", "석사", "학사", "전문학사", "고졸", "정보 없음"]
+
+# 업무기간에서 연/월을 찾는 패턴 (예: 2019-03 ~ 2025-08, 2019.03 - 2021.02)
+PERIOD_DATE_PATTERN = re.compile(r'(\d{4})(?:\s*[.\-/년]\s*(\d{1,2}))?')
+
+# 경력사항/자격증에서 찾을 주요 기술 키워드
+SKILL_KEYWORDS = [
+    "java", "python", "javascript", "typescript", "react", "vue", "angular", "node.js", "spring",
+    "django", "flask", "fastapi", "mysql", "postgresql", "oracle", "mongodb", "redis", "kafka",
+    "docker", "kubernetes", "aws", "azure", "gcp", "linux", "git", "jenkins", "c++", "c#", "go",
+    "kotlin", "swift", "pytorch", "tensorflow", "spark", "hadoop", "sql"
+]
+SKILL_PATTERNS = [
+    (skill, re.compile(r'(?<![a-z0-9])' + re.escape(skill) + r'(?![a-z0-9+#])'))
+    for skill in SKILL_KEYWORDS
+]
+# 요약 한 줄에 넣을 최대 기술/자격증 수
+DIGEST_MAX_ITEMS = 6
+
+# 지원자 테이블 컬럼 (순서대로 표시)
+CANDIDATE_COLUMNS = [
+    "파일명", "채용공고", "적합성 점수", "키워드 일치도", "경력(년)", "최종 학력", "학력 수준",
+    "주요 기술", "자격증 수", "자격증 보유", "자격증 목록", "수상 수",
+    "문서 수", "페이지 수", "테이블 수", "키-값 쌍 수", "추출된 필드", "토큰 수", "예상 비용($)", "요약"
+]
+
+def period_months(work_period):
+    """업무기간 문자열의 근무 개월 수를 계산합니다. 기간을 알 수 없으면 0을 반환합니다."""
+    dates = PERIOD_DATE_PATTERN.findall(work_period or "")
+    if len(dates) < 2:
+        return 0
+    
+    (start_year, start_month), (end_year, end_month) = dates[0], dates[1]
+    months = (int(end_year) - int(start_year)) * 12 + (int(end_month or 1) - int(start_month or 1))
+    return max(months, 0)
+
+def total_experience_years(experience_records):
+    """경력사항 기록들의 총 경력 연수를 계산합니다 (소수점 첫째 자리)."""
+    months = sum(
+        period_months(record.get("업무기간", "")) for record in experience_records
+        if isinstance(record, dict)
+    )
+    return round(months / 12, 1)
+
+def highest_degree(education_records):
+    """학력사항 기록들 중 가장 높은 학위의 (수준, 표시명)을 반환합니다."""
+    best = (0, "정보 없음")
+    for record in education_records:
+        if not isinstance(record, dict):
+            continue
+        level_text = f"{record.get('학력', '')} {record.get('학교명', '')}"
+        for keyword, level, label in DEGREE_LEVELS:
+            if keyword in level_text:
+                if level > best[0]:
+                    best = (level, label)
+                break
+    return best
+
+def certificate_names(certificate_records):
+    """자격증 기록들에서 자격증명 목록을 반환합니다."""
+    names = []
+    for record in certificate_records:
+        if isinstance(record, dict):
+            names.append(record.get("자격증명") or record.get("name") or "")
+        else:
+            names.append(str(record))
+    return [name for name in names if name]
+
+def key_skills(experience_records, certificates=()):
+    """경력사항(직위, 업무내용)과 자격증명에서 주요 기술 키워드를 찾아 반환합니다."""
+    texts = []
+    for record in experience_records:
+        if isinstance(record, dict):
+            texts.append(f"{record.get('직위', '')} {record.get('업무내용', '')}")
+        else:
+            texts.append(str(record))
+    texts.extend(certificates)
+    text = " ".join(texts).lower()
+    return [skill for skill, pattern in SKILL_PATTERNS if pattern.search(text)]
+
+def format_candidate_digest(file_name, score, degree, years, skills, certificates):
+    """
+    지원자 한 명의 고정 형식 요약 한 줄을 만듭니다 (챗봇 비교 질문용).
+    예: 홍길동.pdf | 점수 85 | 학력 석사 | 경력 3.5년 | 기술 python, aws | 자격증 정보처리기사
+    """
+    return " | ".join([
+        file_name,
+        f"점수 {score if score is not None else '평가 불가'}",
+        f"학력 {degree}",
+        f"경력 {years}년",
+        f"기술 {', '.join(skills[:DIGEST_MAX_ITEMS]) or '없음'}",
+        f"자격증 {', '.join(certificates[:DIGEST_MAX_ITEMS]) or '없음'}"
+    ])
+
+class CandidateTable:
+    """
+    지원자별 점수와 주요 속성을 컬럼 형태로 보관하는 테이블입니다.
+    평가가 끝날 때마다 행을 추가/갱신하고, 필터링과 정렬은 pandas 벡터 연산으로 처리합니다.
+    """
+    
+    def __init__(self):
+        self._frame = pd.DataFrame(columns=CANDIDATE_COLUMNS)
+        self._pending = {}
+    
+    def __len__(self):
+        return len(self._frame) + len(self._pending)
+    
+    @staticmethod
+    def row_key(file_name, job_posting=None):
+        """테이블 행 키 (채용공고 + 파일명)를 반환합니다."""
+        return f"{job_posting or ''}::{file_name}"
+    
+    def upsert(self, row):
+        """행을 추가하거나, 같은 지원자의 행이 이미 있으면 값을 갱신합니다."""
+        key = self.row_key(row["파일명"], row.get("채용공고"))
+        if key in self._frame.index:
+            self._frame.loc[key, list(row.keys())] = list(row.values())
+        else:
+            self._pending[key] = row
+    
+    def frame(self):
+        """대기 중인 행을 반영한 전체 테이블을 반환합니다 (새 행만 이어 붙임)."""
+        if self._pending:
+            new_rows = pd.DataFrame.from_dict(self._pending, orient="index").reindex(columns=CANDIDATE_COLUMNS)
+            self._frame = new_rows if self._frame.empty else pd.concat([self._frame, new_rows])
+            self._frame["적합성 점수"] = pd.to_numeric(self._frame["적합성 점수"], errors="coerce")
+            self._pending = {}
+        return self._frame
+    
+    def query(self, min_score=None, degrees=None, min_years=None, require_certificate=False,
+              certificate_keyword=None, name_keyword=None, sort_keys=None, limit=None):
+        """
+        조건에 맞는 행을 정렬하여 반환합니다.
+        sort_keys는 (컬럼명, 오름차순 여부) 목록이며, 기본값은 적합성 점수 내림차순입니다.
+        점수가 없는 지원자(평가 불가)는 항상 마지막에 옵니다.
+        """
+        frame = self.frame()
+        mask = pd.Series(True, index=frame.index)
+        
+        if min_score is not None and min_score > 0:
+            mask &= frame["적합성 점수"] >= min_score
+        if degrees:
+            mask &= frame["최종 학력"].isin(degrees)
+        if min_years is not None and min_years > 0:
+            mask &= frame["경력(년)"] >= min_years
+        if require_certificate:
+            mask &= frame["자격증 보유"].astype(bool)
+        if certificate_keyword:
+            mask &= frame["자격증 목록"].str.contains(certificate_keyword, case=False, regex=False, na=False)
+        if name_keyword:
+            mask &= frame["파일명"].str.contains(name_keyword, case=False, regex=False, na=False)
+        
+        sort_keys = sort_keys or [("적합성 점수", False)]
+        result = frame[mask].sort_values(
+            by=[column for column, _ in sort_keys],
+            ascending=[ascending for _, ascending in sort_keys],
+            na_position="last",
+            kind="stable"
+        )
+        return result.head(limit) if limit else result
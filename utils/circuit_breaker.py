@@ -0,0 +1,112 @@
+import time
+import threading
+from utils.metrics import increment_counter, set_gauge
+
+# 회로 상태
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 게이지로 내보낼 상태 값 (0: 정상, 1: 복구 확인 중, 2: 차단)
+STATE_GAUGE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+class CircuitBreaker:
+    """
+    백엔드 호출의 연속 실패를 기억하는 회로 차단기입니다.
+    연속 실패가 기준 이상이면 차단(open)하여 대기 시간 동안 호출을 건너뛰고,
+    대기 시간이 지나면 한 번의 확인 호출(half-open)만 허용하여 성공하면 다시 정상(closed)으로 돌아갑니다.
+    """
+    
+    def __init__(self, name, failure_threshold=2, cooldown_seconds=60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        set_gauge("circuit_breaker_state", STATE_GAUGE_VALUES[self.state], backend=self.name)
+    
+    def _transition(self, state):
+        if self.state == state:
+            return
+        self.state = state
+        if state == STATE_OPEN:
+            self.opened_at = time.monotonic()
+            self.stats["opened"] += 1
+        set_gauge("circuit_breaker_state", STATE_GAUGE_VALUES[state], backend=self.name)
+        increment_counter("circuit_breaker_transitions", backend=self.name, state=state)
+    
+    def allow_request(self):
+        """호출해도 되는지 확인합니다. 차단 중이면 False (대기 시간이 지났으면 확인 호출 한 번만 허용)."""
+        with self._lock:
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self._transition(STATE_HALF_OPEN)
+            
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            
+            self.stats["rejected"] += 1
+            increment_counter("circuit_breaker_rejected", backend=self.name)
+            return False
+    
+    def record_success(self):
+        """호출 성공을 기록합니다 (확인 호출이 성공하면 회로를 닫음)."""
+        with self._lock:
+            self.stats["successes"] += 1
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            self._transition(STATE_CLOSED)
+    
+    def record_failure(self, error=None):
+        """호출 실패를 기록합니다 (확인 호출이 실패하거나 연속 실패가 기준 이상이면 회로를 엶)."""
+        with self._lock:
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error) if error is not None else None
+            if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._probe_in_flight = False
+                self.opened_at = time.monotonic()
+                self._transition(STATE_OPEN)
+    
+    def release(self):
+        """결과 없이 끝난 호출(배치 중단 등)의 확인 호출 자리를 돌려놓습니다 (성공/실패로 세지 않음)."""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def snapshot(self):
+        """현재 상태를 사전으로 반환합니다 (지표 패널 표시용)."""
+        with self._lock:
+            remaining = 0.0
+            if self.state == STATE_OPEN:
+                remaining = max(self.cooldown_seconds - (time.monotonic() - self.opened_at), 0.0)
+            return {
+                "backend": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "cooldown_remaining": remaining,
+                "last_error": self.last_error,
+                **self.stats
+            }
+
+# 백엔드 이름별로 하나의 회로 차단기를 프로세스 전체에서 공유
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name, failure_threshold=2, cooldown_seconds=60.0):
+    """백엔드 이름에 해당하는 공유 회로 차단기를 반환합니다."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, failure_threshold, cooldown_seconds)
+        return _breakers[name]
+
+def get_circuit_breakers():
+    """생성된 모든 회로 차단기를 반환합니다."""
+    with _breakers_lock:
+        return list(_breakers.values())
@@ -0,0 +1,141 @@
+import re
+import math
+from collections import Counter
+
+# 검색 문서 메타데이터에서 지원자(원본 파일)를 식별할 때 확인하는 키 (앞에서부터 사용)
+SOURCE_KEYS = ["metadata_storage_name", "file_name", "title", "source", "parent_id"]
+
+# 토큰 수 추정: 한국어가 섞인 텍스트는 대략 2자당 1토큰
+CHARS_PER_TOKEN = 2
+
+def estimate_tokens(text):
+    """텍스트의 대략적인 토큰 수를 추정합니다."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def shingles(text, size=5):
+    """공백을 정리한 문자 n-gram 집합을 반환합니다 (중복 청크 비교용)."""
+    compact = re.sub(r'\s+', ' ', text.lower()).strip()
+    if len(compact) <= size:
+        return {compact}
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+def jaccard(left, right):
+    """두 집합의 자카드 유사도를 반환합니다."""
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+def lexical_tokens(text):
+    """어휘 점수 계산용 토큰 목록을 반환합니다."""
+    return re.findall(r'[0-9A-Za-z가-힣.+#]{2,}', text.lower())
+
+def lexical_score(query_tokens, text):
+    """질문 토큰이 청크에 등장하는 정도 (0~1, 로그 빈도 가중)."""
+    if not query_tokens:
+        return 0.0
+    counts = Counter(lexical_tokens(text))
+    return sum(math.log1p(counts[token]) for token in query_tokens) / (len(query_tokens) * math.log1p(3))
+
+def cosine(left, right):
+    """두 벡터의 코사인 유사도를 반환합니다."""
+    dot = sum(a * b for a, b in zip(left, right))
+    norm = math.sqrt(sum(a * a for a in left)) * math.sqrt(sum(b * b for b in right))
+    return dot / norm if norm else 0.0
+
+def document_source(document):
+    """문서가 속한 지원자(원본 파일) 이름을 반환합니다."""
+    metadata = getattr(document, "metadata", None) or {}
+    for key in SOURCE_KEYS:
+        if metadata.get(key):
+            return str(metadata[key])
+    return "알 수 없는 문서"
+
+def pack_candidate_digests(digests, token_budget):
+    """
+    지원자 요약 줄을 주어진 순서대로 토큰 예산까지 담습니다.
+    (담은 요약 줄 목록, 통계)를 반환합니다.
+    """
+    packed = []
+    used_tokens = 0
+    for digest in digests:
+        # 줄바꿈 1자 포함
+        digest_tokens = estimate_tokens(digest + "\n")
+        if used_tokens + digest_tokens > token_budget:
+            break
+        packed.append(digest)
+        used_tokens += digest_tokens
+    
+    stats = {
+        "total_candidates": len(digests),
+        "packed_candidates": len(packed),
+        "packed_tokens": used_tokens
+    }
+    return packed, stats
+
+def compact_documents(query, documents, token_budget, dedup_threshold=0.85,
+                      query_embedding=None, document_embeddings=None, embedding_weight=0.5):
+    """
+    검색된 청크를 정리하여 (압축된 문서 목록, 통계)를 반환합니다.
+    1) 거의 같은 청크 제거 2) 어휘(+임베딩) 점수로 재정렬 3) 지원자별로 묶기 4) 토큰 예산까지 채우기
+    """
+    original_tokens = sum(estimate_tokens(document.page_content) for document in documents)
+    
+    # 1) 거의 같은 청크 제거 (먼저 검색된 청크를 남김)
+    kept = []
+    kept_shingles = []
+    for index, document in enumerate(documents):
+        document_shingles = shingles(document.page_content)
+        if any(jaccard(document_shingles, other) >= dedup_threshold for other in kept_shingles):
+            continue
+        kept.append(index)
+        kept_shingles.append(document_shingles)
+    
+    # 2) 로컬 재정렬 점수
+    query_tokens = list(dict.fromkeys(lexical_tokens(query)))
+    scores = {}
+    for index in kept:
+        score = lexical_score(query_tokens, documents[index].page_content)
+        if query_embedding is not None and document_embeddings is not None:
+            score = (1 - embedding_weight) * score + embedding_weight * cosine(query_embedding, document_embeddings[index])
+        scores[index] = score
+    
+    # 3) 지원자별로 묶고, 가장 관련 높은 청크 기준으로 지원자 순서 결정
+    groups = {}
+    for index in sorted(kept, key=lambda i: scores[i], reverse=True):
+        groups.setdefault(document_source(documents[index]), []).append(index)
+    
+    # 4) 토큰 예산 안에서 지원자별 문서로 합치기
+    packed = []
+    used_tokens = 0
+    packed_chunks = 0
+    for source, indexes in groups.items():
+        header = f"[지원자 문서: {source}]"
+        group_texts = []
+        group_tokens = estimate_tokens(header)
+        for index in indexes:
+            chunk_tokens = estimate_tokens(documents[index].page_content)
+            if used_tokens + group_tokens + chunk_tokens > token_budget:
+                continue
+            group_texts.append(documents[index].page_content.strip())
+            group_tokens += chunk_tokens
+        if not group_texts:
+            continue
+        
+        used_tokens += group_tokens
+        packed_chunks += len(group_texts)
+        first = documents[indexes[0]]
+        packed.append(type(first)(
+            page_content=header + "\n" + "\n\n".join(group_texts),
+            metadata={**(first.metadata or {}), "chunk_count": len(group_texts)}
+        ))
+    
+    stats = {
+        "retrieved_chunks": len(documents),
+        "deduplicated_chunks": len(documents) - len(kept),
+        "packed_chunks": packed_chunks,
+        "candidates": len(packed),
+        "original_tokens": original_tokens,
+        "packed_tokens": used_tokens,
+        "tokens_saved": max(original_tokens - used_tokens, 0)
+    }
+    return packed, stats
@@ -0,0 +1,150 @@
+import io
+import time
+import PyPDF2
+from PyPDF2.generic import DecodedStreamObject, NameObject, NumberObject
+
+# 이미지 다운샘플링은 Pillow가 설치된 경우에만 사용 (선택사항)
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+# 페이지에서 제거할 부가 항목 (주석, 썸네일, 메타데이터 등 분석에 불필요한 항목)
+PAGE_JUNK_KEYS = ["/Annots", "/Thumb", "/PieceInfo", "/Metadata"]
+
+# 다시 인코딩할 수 있는 PDF 이미지 색 공간 (Pillow 모드)
+PDF_IMAGE_MODES = {"/DeviceRGB": "RGB", "/DeviceGray": "L"}
+
+def decode_pdf_image(x_object):
+    """PDF 이미지 XObject를 Pillow 이미지로 변환합니다 (마스크, CMYK 등 지원하지 않는 형식이면 None)."""
+    if x_object.get("/ImageMask") or "/Mask" in x_object:
+        return None
+    
+    filters = x_object.get("/Filter")
+    if isinstance(filters, list):
+        filters = filters[0] if len(filters) == 1 else None
+    
+    try:
+        if filters == "/DCTDecode":
+            # DCTDecode 스트림의 데이터는 JPEG 파일 그대로임
+            image = Image.open(io.BytesIO(x_object.get_data()))
+        else:
+            mode = PDF_IMAGE_MODES.get(x_object.get("/ColorSpace"))
+            if mode is None or x_object.get("/BitsPerComponent") != 8:
+                return None
+            image = Image.frombytes(mode, (x_object["/Width"], x_object["/Height"]), x_object.get_data())
+    except Exception:
+        return None
+    
+    if image.mode not in PDF_IMAGE_MODES.values():
+        return None
+    return image
+
+def downsample_page_images(page, max_image_dpi, jpeg_quality):
+    """
+    페이지의 이미지 중 해상도가 max_image_dpi를 넘는 이미지를 축소하여 JPEG(DCTDecode)로 다시 인코딩합니다.
+    이미지가 페이지 전체를 덮는다고 가정하여 페이지 크기로 최대 픽셀 수를 정합니다 (스캔 PDF 기준).
+    """
+    resources = page.get("/Resources")
+    x_objects = resources.get_object().get("/XObject") if resources is not None else None
+    if x_objects is None:
+        return
+    x_objects = x_objects.get_object()
+    
+    # PDF 좌표 단위는 1/72인치
+    max_side = int(max(float(page.mediabox.width), float(page.mediabox.height)) / 72 * max_image_dpi)
+    
+    for name in x_objects:
+        x_object = x_objects[name].get_object()
+        if x_object.get("/Subtype") != "/Image":
+            continue
+        if max(x_object["/Width"], x_object["/Height"]) <= max_side:
+            continue
+        
+        image = decode_pdf_image(x_object)
+        if image is None:
+            continue
+        
+        image.thumbnail((max_side, max_side))
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=jpeg_quality, optimize=True)
+        
+        # 원래 이미지 스트림을 JPEG 스트림으로 교체 (사전에 직접 넣은 스트림은 저장 시 간접 객체로 기록됨)
+        jpeg_stream = DecodedStreamObject()
+        jpeg_stream.set_data(output.getvalue())
+        jpeg_stream.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(image.width),
+            NameObject("/Height"): NumberObject(image.height),
+            NameObject("/ColorSpace"): NameObject("/DeviceRGB" if image.mode == "RGB" else "/DeviceGray"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+            NameObject("/Filter"): NameObject("/DCTDecode")
+        })
+        if "/SMask" in x_object:
+            jpeg_stream[NameObject("/SMask")] = x_object.raw_get("/SMask")
+        x_objects[NameObject(name)] = jpeg_stream
+
+def compact_pdf(document_content, max_pages, max_image_dpi=150, jpeg_quality=80):
+    """
+    PDF의 페이지 수를 제한하고 불필요한 항목을 제거한 뒤 콘텐츠 스트림을 압축합니다.
+    Pillow가 설치되어 있으면 스캔 페이지처럼 해상도가 큰 이미지도 max_image_dpi로 축소합니다.
+    """
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(document_content))
+    pdf_writer = PyPDF2.PdfWriter()
+    
+    for page in pdf_reader.pages[:max_pages]:
+        for key in PAGE_JUNK_KEYS:
+            if key in page:
+                del page[key]
+        if PIL_AVAILABLE:
+            downsample_page_images(page, max_image_dpi, jpeg_quality)
+        page.compress_content_streams()
+        pdf_writer.add_page(page)
+    
+    # 새 문서로 작성하므로 첨부파일, 북마크, 문서 메타데이터는 복사되지 않음
+    output = io.BytesIO()
+    pdf_writer.write(output)
+    return output.getvalue()
+
+def compact_image(document_content, max_image_side, jpeg_quality):
+    """긴 변이 max_image_side를 넘는 이미지를 축소하여 JPEG로 다시 인코딩합니다."""
+    if not PIL_AVAILABLE:
+        return document_content
+    
+    image = Image.open(io.BytesIO(document_content))
+    if max(image.size) > max_image_side:
+        image.thumbnail((max_image_side, max_image_side))
+    
+    output = io.BytesIO()
+    image.convert("RGB").save(output, format="JPEG", quality=jpeg_quality, optimize=True)
+    return output.getvalue()
+
+def compact_document(document_content, file_name, max_pages=10, max_image_side=2000, jpeg_quality=80, max_image_dpi=150):
+    """
+    업로드 전 문서를 압축합니다.
+    (압축된 바이트, 압축 정보)를 반환하며, 크기가 줄지 않으면 원본을 그대로 반환합니다.
+    """
+    started_at = time.perf_counter()
+    compacted = document_content
+    
+    try:
+        if file_name.lower().endswith('.pdf'):
+            compacted = compact_pdf(document_content, max_pages, max_image_dpi, jpeg_quality)
+        elif file_name.lower().endswith(IMAGE_EXTENSIONS):
+            compacted = compact_image(document_content, max_image_side, jpeg_quality)
+    except Exception:
+        compacted = document_content
+    
+    if len(compacted) >= len(document_content):
+        compacted = document_content
+    
+    compaction_info = {
+        "original_bytes": len(document_content),
+        "compacted_bytes": len(compacted),
+        "compaction_seconds": round(time.perf_counter() - started_at, 3)
+    }
+    return compacted, compaction_info
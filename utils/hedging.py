@@ -0,0 +1,177 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures, FIRST_COMPLETED
+from utils.metrics import record_stage, increment_counter, set_gauge, percentile
+from utils.cancellation import wait_with_deadline
+
+class HedgePolicy:
+    """
+    느린 요청에 중복(헤지) 요청을 보내는 기준과 예산을 관리합니다.
+    최근 원 요청 지연시간의 백분위수(기본 p95)를 넘도록 응답이 없으면 같은 요청을 한 번 더 보내고,
+    헤지 요청 수는 전체 호출 수의 budget_ratio 이하, 동시에 진행 중인 헤지는 max_in_flight 이하로 제한합니다.
+    """
+    
+    def __init__(self, name, percentile_ratio=0.95, min_samples=20, min_delay_seconds=2.0, budget_ratio=0.05, max_in_flight=2, window=200):
+        self.name = name
+        self.percentile_ratio = percentile_ratio
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.budget_ratio = budget_ratio
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "skipped_budget": 0, "skipped_limit": 0}
+        # 원 요청 지연시간 (= 헤징이 없었을 때의 지연시간) / 호출자가 실제로 기다린 시간
+        self.primary_latencies = deque(maxlen=window)
+        self.effective_latencies = deque(maxlen=window)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+    
+    def threshold(self):
+        """헤지 요청을 보낼 대기 시간(초)을 반환합니다 (측정값이 부족하면 None)."""
+        with self._lock:
+            if len(self.primary_latencies) < self.min_samples:
+                return None
+            samples = sorted(self.primary_latencies)
+        threshold = max(percentile(samples, self.percentile_ratio), self.min_delay_seconds)
+        set_gauge("llm_hedge_threshold_seconds", threshold, policy=self.name)
+        return threshold
+    
+    def begin_call(self):
+        """호출 수를 셉니다 (헤지 예산의 기준)."""
+        with self._lock:
+            self.stats["calls"] += 1
+    
+    def record_primary(self, seconds):
+        """
+        성공한 원 요청의 지연시간을 기록합니다 (늦게 끝나 결과를 버린 요청도 포함).
+        빠르게 실패한 요청은 기준 p95를 낮춰 장애 중에 헤지가 늘어나므로 기록하지 않습니다.
+        """
+        with self._lock:
+            self.primary_latencies.append(seconds)
+        record_stage(f"{self.name}_call", seconds)
+    
+    def record_effective(self, seconds, hedge_won):
+        """호출자가 실제로 기다린 시간과 헤지 요청이 먼저 끝났는지를 기록합니다."""
+        with self._lock:
+            self.effective_latencies.append(seconds)
+            if hedge_won:
+                self.stats["hedge_wins"] += 1
+        record_stage(f"{self.name}_call_hedged", seconds)
+        if hedge_won:
+            increment_counter("llm_hedges", policy=self.name, result="won")
+    
+    def try_acquire_hedge(self):
+        """헤지 요청을 보낼 수 있으면 자리를 잡고 True를 반환합니다 (예산 초과, 동시 한도 초과면 False)."""
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.budget_ratio * self.stats["calls"]:
+                self.stats["skipped_budget"] += 1
+                increment_counter("llm_hedges", policy=self.name, result="skipped_budget")
+                return False
+            if not self._slots.acquire(blocking=False):
+                self.stats["skipped_limit"] += 1
+                increment_counter("llm_hedges", policy=self.name, result="skipped_limit")
+                return False
+            self.stats["hedged"] += 1
+        increment_counter("llm_hedges", policy=self.name, result="sent")
+        return True
+    
+    def release_hedge(self):
+        """끝난 헤지 요청의 동시 실행 자리를 돌려놓습니다."""
+        self._slots.release()
+    
+    def snapshot(self):
+        """현재 통계와 헤징 전후 지연시간 백분위수를 사전으로 반환합니다 (지표 패널 표시용)."""
+        threshold = self.threshold()
+        with self._lock:
+            primary = sorted(self.primary_latencies)
+            effective = sorted(self.effective_latencies)
+            return {
+                "policy": self.name,
+                "threshold": threshold,
+                "budget_used": self.stats["hedged"] / (self.budget_ratio * self.stats["calls"]) if self.stats["calls"] and self.budget_ratio else 0.0,
+                "primary_p50": percentile(primary, 0.50),
+                "primary_p95": percentile(primary, 0.95),
+                "primary_p99": percentile(primary, 0.99),
+                "effective_p50": percentile(effective, 0.50),
+                "effective_p95": percentile(effective, 0.95),
+                "effective_p99": percentile(effective, 0.99),
+                **self.stats
+            }
+
+# 원 요청과 헤지 요청을 실행하는 작업 스레드 (늦게 끝난 쪽의 결과는 버림)
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedged-call")
+
+def hedged_call(func, policy, timeout_seconds=0, cancel_token=None, stage="요청", on_duplicate=None):
+    """
+    func()를 실행하고, 응답이 policy.threshold()보다 늦으면 같은 요청을 한 번 더 보내 먼저 성공한 결과를 반환합니다.
+    원 요청이 헤지 전에 실패하면 그 오류를 그대로 발생시키고, 두 요청이 모두 실패하면 원 요청의 오류를 발생시킵니다.
+    헤지 요청을 보냈다면 결과를 버린 요청도 과금되므로, on_duplicate(사용한 결과)를 호출하여
+    같은 크기의 사용량으로 보수적으로 집계할 수 있게 합니다.
+    단계 제한 시간과 배치 중단은 call_with_deadline과 같이 처리합니다.
+    """
+    policy.begin_call()
+    threshold = policy.threshold()
+    started_at = time.monotonic()
+    
+    primary = _executor.submit(func)
+    def record_primary(future):
+        if not future.cancelled() and future.exception() is None:
+            policy.record_primary(time.monotonic() - started_at)
+    
+    primary.add_done_callback(record_primary)
+    futures = [primary]
+    # 헤지 여부는 호출당 한 번만 결정 (측정값이 부족하면 헤지하지 않음)
+    hedge_decided = threshold is None
+    
+    def succeeded():
+        return [future for future in futures if future.done() and future.exception() is None]
+    
+    def is_done():
+        return bool(succeeded()) or all(future.done() for future in futures)
+    
+    def wait(seconds):
+        nonlocal hedge_decided
+        if not hedge_decided:
+            remaining = threshold - (time.monotonic() - started_at)
+            if remaining <= 0:
+                hedge_decided = True
+                if policy.try_acquire_hedge():
+                    hedge = _executor.submit(func)
+                    hedge.add_done_callback(lambda future: policy.release_hedge())
+                    futures.append(hedge)
+            else:
+                seconds = min(seconds, remaining)
+        wait_futures([future for future in futures if not future.done()], timeout=seconds, return_when=FIRST_COMPLETED)
+    
+    try:
+        wait_with_deadline(is_done, wait, timeout_seconds, cancel_token, stage)
+    except BaseException:
+        # 시간 초과, 배치 중단, Streamlit 재실행 모두 결과를 기다리지 않음
+        for future in futures:
+            future.cancel()
+        raise
+    
+    winners = succeeded()
+    if not winners:
+        return primary.result()
+    
+    winner = winners[0]
+    policy.record_effective(time.monotonic() - started_at, hedge_won=winner is not primary)
+    if len(futures) > 1 and on_duplicate:
+        on_duplicate(winner.result())
+    return winner.result()
+
+# 정책 이름별로 하나의 헤징 정책을 프로세스 전체에서 공유
+_policies = {}
+_policies_lock = threading.Lock()
+
+def get_hedge_policy(name, **options):
+    """이름에 해당하는 공유 헤징 정책을 반환합니다 (options는 처음 만들 때만 사용)."""
+    with _policies_lock:
+        if name not in _policies:
+            _policies[name] = HedgePolicy(name, **options)
+        return _policies[name]
+
+def get_hedge_policies():
+    """생성된 모든 헤징 정책을 반환합니다."""
+    with _policies_lock:
+        return list(_policies.values())
@@ -0,0 +1,210 @@
+import re
+import math
+from collections import Counter
+
+# 의도 종류
+INTENT_GREETING = "greeting"
+INTENT_HELP = "help"
+INTENT_STRUCTURED = "structured"
+INTENT_COMPARATIVE = "comparative"
+INTENT_OPEN = "open"
+
+# 규칙 기반 분류 (먼저 적용, 일치하면 바로 결정)
+# 인사/도움말은 메시지 전체가 해당 표현일 때만 템플릿으로 답변 (다른 내용이 섞이면 검색 + LLM)
+INTENT_RULES = [
+    (INTENT_GREETING, re.compile(
+        r'^\s*(안녕(하세요|하십니까)?|하이|헬로|반가워(요)?|반갑습니다|좋은\s*아침(이에요|입니다)?|고마워(요)?|감사합니다|수고하세요|hello|hi|hey)[\s!.?~]*$',
+        re.IGNORECASE
+    )),
+    (INTENT_HELP, re.compile(
+        r'^\s*(도움말|사용법|사용\s*방법(\s*알려\s*줘)?|help|(뭘|무엇을|뭐)\s*할\s*수\s*있(어|나요|니|습니까)?|'
+        r'(여기서\s*)?어떤\s*질문(을|을\s*할\s*수\s*있(어|나요|니|습니까)?)?)[\s!.?~]*$',
+        re.IGNORECASE
+    )),
+    (INTENT_STRUCTURED, re.compile(r'(상위\s*\d+|top\s*\d+|\d+\s*등|몇\s*명|점수\s*(가\s*)?(높은|낮은)\s*순|평균\s*점수|최고\s*점수|\d+\s*점\s*이상|\d+\s*년\s*이상)', re.IGNORECASE)),
+    (INTENT_COMPARATIVE, re.compile(r'(비교|누가\s*(더|가장)|가장\s*적합|제일\s*(나은|적합|좋은)|순위를\s*매|(전체|모든)\s*지원자)', re.IGNORECASE))
+]
+
+# 작은 나이브 베이즈 분류기의 학습 예시 (규칙에 걸리지 않은 질문에 사용)
+TRAINING_EXAMPLES = {
+    INTENT_GREETING: [
+        "안녕하세요", "안녕", "반갑습니다", "좋은 아침이에요", "수고하세요", "고마워요", "감사합니다", "hello"
+    ],
+    INTENT_HELP: [
+        "무엇을 물어볼 수 있나요", "어떻게 사용하나요", "이 챗봇은 뭐 하는 거야", "사용 방법 알려줘",
+        "어떤 기능이 있어", "도움이 필요해요"
+    ],
+    INTENT_STRUCTURED: [
+        "점수 상위 5명 알려줘", "가장 점수가 높은 지원자는 누구야", "점수 순으로 보여줘", "1등 지원자 누구야",
+        "몇 명 분석했어", "평균 점수는 얼마야", "80점 이상 지원자 목록", "석사 지원자 목록 보여줘",
+        "경력 5년 이상 지원자 목록", "자격증 있는 지원자 몇 명이야"
+    ],
+    INTENT_COMPARATIVE: [
+        "프로젝트 경험을 비교해줘", "누가 더 적합해", "지원자들을 비교해서 추천해줘", "전체 지원자 중 적임자는",
+        "클라우드 경험이 가장 많은 사람은", "지원자들의 강점을 비교해줘"
+    ],
+    INTENT_OPEN: [
+        "백엔드 개발 경험이 있는 지원자를 찾아주세요", "머신러닝 전문가를 찾아주세요", "Python 경험자 찾아줘",
+        "이 지원자의 강점은 뭐야", "면접에서 물어볼 질문 추천해줘",
+        "채용공고에 가장 적합한 이유를 설명해줘", "리더십 경험이 있는 사람은 누구야"
+    ]
+}
+
+# 학력 라벨 (CandidateTable의 '최종 학력' 값과 동일)
+DEGREE_KEYWORDS = ["박사", "석사", "학사", "전문학사", "고졸"]
+
+# 구조화된 질문에서 조건으로 인식하는 표현 (인식한 부분을 지운 뒤 남은 단어로 처리 가능 여부를 판단)
+STRUCTURED_CONDITION_PATTERNS = [
+    re.compile(r'(?:점수\s*)?(?:상위|top)\s*\d+\s*(?:명|위)?', re.IGNORECASE),
+    re.compile(r'몇\s*명'),
+    re.compile(r'\d+\s*(?:명|등)'),
+    re.compile(r'최고\s*점수|가장\s*(?:점수가\s*)?높은'),
+    re.compile(r'\d+\s*점\s*이상'),
+    re.compile(r'(?:경력|경험)\s*\d+(?:\.\d+)?\s*년\s*이상'),
+    re.compile(r'\d+(?:\.\d+)?\s*년\s*이상(?:의)?\s*(?:경력|경험)(?:자|이\s*있는)?'),
+    re.compile(r'(?:전문학사|박사|석사|학사|고졸)(?:\s*학위)?'),
+    re.compile(r'자격증\s*(?:이\s*)?(?:있는|보유(?:한|자)?)'),
+    re.compile(r'점수\s*(?:가\s*)?(?:높은|낮은)\s*순(?:으로|서대로)?'),
+    re.compile(r'평균\s*(?:적합성\s*)?(?:점수)?')
+]
+
+# 조건 외에 남아도 되는 단어 (지원자/목록/요청 어미 등). 이 밖의 단어가 남으면 검색 + LLM으로 처리
+STRUCTURED_FILLER_WORDS = {
+    "적합성", "적합도", "점수", "지원자", "후보", "후보자", "사람", "인원", "명단", "목록", "리스트", "순위", "순서", "순",
+    "전체", "모든", "모두", "총", "중", "분석", "분석한", "분석된", "분석했어", "분석했나요", "평가", "평가한", "평가된",
+    "알려", "알려줘", "알려주세요", "보여", "보여줘", "보여주세요", "뽑아줘", "정리해줘", "찾아줘", "해줘", "줘", "주세요",
+    "누구", "누구야", "누구예요", "누구인가요", "누구니", "얼마", "얼마야", "얼마예요", "얼마인가요", "뭐야", "이야", "인가요",
+    "있어", "있나요", "있니", "있는", "몇", "명", "좀", "요", "및", "그리고", "대상"
+}
+
+# 단어 끝의 조사 (남은 단어를 비교하기 전에 제거)
+JOSA_SUFFIX_PATTERN = re.compile(r'(?:들|에서|으로|로|은|는|이|가|을|를|의|와|과|도|만|중)$')
+
+def unparsed_words(question):
+    """구조화된 조건과 허용된 단어를 제외하고 질문에 남은 단어 목록을 반환합니다."""
+    remainder = question
+    for pattern in STRUCTURED_CONDITION_PATTERNS:
+        remainder = pattern.sub(" ", remainder)
+    
+    leftovers = []
+    for word in re.findall(r'[가-힣A-Za-z0-9.+#]+', remainder):
+        stripped = word
+        while stripped not in STRUCTURED_FILLER_WORDS and JOSA_SUFFIX_PATTERN.search(stripped) and len(stripped) > 1:
+            stripped = JOSA_SUFFIX_PATTERN.sub("", stripped)
+        if JOSA_SUFFIX_PATTERN.fullmatch(stripped):
+            continue
+        if stripped.strip(".") and stripped not in STRUCTURED_FILLER_WORDS:
+            leftovers.append(word)
+    return leftovers
+
+def char_ngrams(text, n=2):
+    """공백을 제거한 문자 n-gram 목록을 반환합니다 (형태소 분석기 없이 한국어 처리)."""
+    compact = re.sub(r'\s+', '', text.lower())
+    if len(compact) < n:
+        return [compact] if compact else []
+    return [compact[i:i + n] for i in range(len(compact) - n + 1)]
+
+class NaiveBayesIntentModel:
+    """문자 bigram 기반 다항 나이브 베이즈 의도 분류기입니다 (CPU에서 바로 학습/추론)."""
+    
+    def __init__(self, examples=TRAINING_EXAMPLES):
+        self.token_counts = {}
+        self.total_tokens = {}
+        self.priors = {}
+        vocabulary = set()
+        example_total = sum(len(texts) for texts in examples.values())
+        
+        for intent, texts in examples.items():
+            counts = Counter()
+            for text in texts:
+                counts.update(char_ngrams(text))
+            self.token_counts[intent] = counts
+            self.total_tokens[intent] = sum(counts.values())
+            self.priors[intent] = math.log(len(texts) / example_total)
+            vocabulary.update(counts)
+        self.vocabulary_size = len(vocabulary) or 1
+    
+    def predict(self, text):
+        """(의도, 확률)을 반환합니다."""
+        tokens = char_ngrams(text)
+        log_scores = {}
+        for intent, counts in self.token_counts.items():
+            denominator = self.total_tokens[intent] + self.vocabulary_size
+            log_scores[intent] = self.priors[intent] + sum(
+                math.log((counts[token] + 1) / denominator) for token in tokens
+            )
+        
+        best_intent = max(log_scores, key=log_scores.get)
+        max_score = log_scores[best_intent]
+        normalizer = sum(math.exp(score - max_score) for score in log_scores.values())
+        return best_intent, 1.0 / normalizer
+
+_model = None
+
+def get_intent_model():
+    """의도 분류 모델을 반환합니다 (처음 호출 시 학습)."""
+    global _model
+    if _model is None:
+        _model = NaiveBayesIntentModel()
+    return _model
+
+def classify_intent(question, min_confidence=0.7):
+    """
+    질문의 의도와 판단 근거를 반환합니다.
+    규칙이 먼저 적용되고, 모델의 확신도가 낮으면 일반 질문(검색 + LLM)으로 처리합니다.
+    로컬 답변(인사/도움말/구조화된 조회)은 질문 전체를 인식한 경우에만 사용하고,
+    인식하지 못한 단어(기술, 자격증 이름 등)가 남으면 일반 질문으로 처리합니다.
+    """
+    for intent, pattern in INTENT_RULES:
+        if not pattern.search(question):
+            continue
+        if intent == INTENT_STRUCTURED and unparsed_words(question):
+            continue
+        return intent, "rule", 1.0
+    
+    intent, confidence = get_intent_model().predict(question)
+    if confidence < min_confidence:
+        return INTENT_OPEN, "model", confidence
+    # 모델은 인사/도움말 템플릿을 고르지 않음 (템플릿은 메시지 전체가 규칙에 맞을 때만)
+    if intent in (INTENT_GREETING, INTENT_HELP):
+        return INTENT_OPEN, "model", confidence
+    if intent == INTENT_STRUCTURED and unparsed_words(question):
+        return INTENT_OPEN, "model", confidence
+    return intent, "model", confidence
+
+def parse_structured_query(question):
+    """
+    구조화된 질문에서 조회 조건을 추출합니다.
+    예: "점수 상위 5명" → limit 5, "석사 80점 이상" → degrees ["석사"], min_score 80, "점수 낮은 순" → ascending
+    """
+    query = {
+        "limit": None,
+        "min_score": None,
+        "degrees": [],
+        "min_years": None,
+        "require_certificate": False,
+        "count_only": False,
+        "average": False,
+        "ascending": False
+    }
+    
+    limit_match = re.search(r'(?:상위|top)\s*(\d+)|(\d+)\s*명(?!\s*이상)', question, re.IGNORECASE)
+    if limit_match:
+        query["limit"] = int(limit_match.group(1) or limit_match.group(2))
+    elif re.search(r'(1\s*등|최고\s*점수|가장\s*(점수가\s*)?높은)', question):
+        query["limit"] = 1
+    
+    score_match = re.search(r'(\d+)\s*점\s*이상', question)
+    if score_match:
+        query["min_score"] = int(score_match.group(1))
+    
+    years_match = re.search(r'(?:경력|경험)\s*(\d+(?:\.\d+)?)\s*년\s*이상|(\d+(?:\.\d+)?)\s*년\s*이상(?:의)?\s*(?:경력|경험)', question)
+    if years_match:
+        query["min_years"] = float(years_match.group(1) or years_match.group(2))
+    
+    query["degrees"] = [degree for degree in DEGREE_KEYWORDS if degree in question and not (degree == "학사" and "전문학사" in question)]
+    query["require_certificate"] = bool(re.search(r'자격증\s*(이\s*)?(있는|보유)', question))
+    query["count_only"] = bool(re.search(r'몇\s*명', question))
+    query["average"] = bool(re.search(r'평균', question))
+    query["ascending"] = bool(re.search(r'점수\s*(가\s*)?낮은\s*순', question))
+    return query
@@ -0,0 +1,184 @@
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+import PyPDF2
+
+# 로컬 추출 결과의 model_id (Document Intelligence 결과와 구분)
+LOCAL_MODEL_ID = "local-text-layer"
+
+# 이력서 섹션 제목 후보 (공백/기호 제거 후 비교)
+SECTION_HEADINGS = {
+    "학력사항": ["학력사항", "학력", "학력정보", "최종학력"],
+    "경력사항": ["경력사항", "경력", "경력정보", "경력및업무", "직무경력"],
+    "자격증": ["자격증", "자격사항", "자격면허", "보유자격증", "자격증및면허"],
+    "수상경력": ["수상경력", "수상내역", "수상", "수상및활동"]
+}
+
+# 대상이 아니지만 섹션의 끝을 알려주는 제목들
+OTHER_HEADINGS = [
+    "기본정보", "인적사항", "개인정보", "자기소개", "자기소개서", "보유기술", "기술스택",
+    "어학", "어학능력", "외국어", "대외활동", "활동사항", "교육이수", "교육사항",
+    "프로젝트", "프로젝트경험", "병역사항", "포트폴리오", "희망근무조건"
+]
+
+# 텍스트 레이어가 있다고 판단할 페이지당 최소 글자 수
+MIN_CHARS_PER_PAGE = 200
+
+# DOCX 본문 XML 네임스페이스
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def normalize_heading(line):
+    """제목 비교를 위해 공백과 기호를 제거합니다."""
+    return re.sub(r'[\s\[\]\(\)【】<>■□●○▶·:：/&]', '', line) if line else ""
+
+def match_heading(line):
+    """라인이 섹션 제목이면 섹션명을(대상 외 섹션은 ""), 아니면 None을 반환합니다."""
+    normalized = normalize_heading(line)
+    if not normalized or len(normalized) > 12:
+        return None
+    
+    for section_name, aliases in SECTION_HEADINGS.items():
+        if normalized in [normalize_heading(alias) for alias in aliases]:
+            return section_name
+    
+    if normalized in [normalize_heading(heading) for heading in OTHER_HEADINGS]:
+        return ""
+    
+    return None
+
+def split_sections(text):
+    """텍스트를 섹션 제목 기준으로 나누어 대상 섹션별 내용을 반환합니다."""
+    sections = {}
+    current_section = None
+    
+    for line in text.split('\n'):
+        stripped = line.strip()
+        heading = match_heading(stripped)
+        
+        if heading is not None:
+            current_section = heading or None
+            if current_section and current_section not in sections:
+                sections[current_section] = []
+            continue
+        
+        if current_section and stripped:
+            sections[current_section].append(stripped)
+    
+    return {name: "\n".join(lines) for name, lines in sections.items() if lines}
+
+def extract_pdf_text_pages(document_content):
+    """PDF 바이트에서 페이지별 텍스트 레이어를 추출합니다."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(document_content))
+    return [(page.extract_text() or "") for page in pdf_reader.pages]
+
+def iter_docx_paragraphs(document_content):
+    """
+    DOCX(zip)의 word/document.xml을 스트리밍으로 읽어 문단 텍스트를 순서대로 반환합니다.
+    표 셀 안의 문단도 같은 순서로 포함됩니다.
+    """
+    with zipfile.ZipFile(io.BytesIO(document_content)) as docx_file:
+        with docx_file.open("word/document.xml") as document_xml:
+            for _, element in ET.iterparse(document_xml, events=("end",)):
+                if element.tag != WORD_NAMESPACE + "p":
+                    continue
+                
+                parts = []
+                for node in element.iter():
+                    if node.tag == WORD_NAMESPACE + "t":
+                        parts.append(node.text or "")
+                    elif node.tag == WORD_NAMESPACE + "tab":
+                        parts.append("\t")
+                    elif node.tag in (WORD_NAMESPACE + "br", WORD_NAMESPACE + "cr"):
+                        parts.append("\n")
+                yield "".join(parts)
+                
+                # 처리한 문단은 바로 비워서 문서 전체가 메모리에 쌓이지 않도록 함
+                element.clear()
+
+def extract_docx_text(document_content):
+    """DOCX 파일의 문단과 표 텍스트를 줄 단위 문자열로 추출합니다."""
+    return "\n".join(paragraph for paragraph in iter_docx_paragraphs(document_content) if paragraph.strip())
+
+def build_local_analysis(page_texts, sections, confidence):
+    """로컬 추출 결과를 analyze_resume_with_ai와 동일한 구조로 구성합니다."""
+    fields = {}
+    for section_name, content in sections.items():
+        fields[section_name] = {
+            "type": "string",
+            "content": content,
+            "confidence": confidence
+        }
+    
+    return {
+        "model_id": LOCAL_MODEL_ID,
+        "page_count": len(page_texts),
+        "documents": [{
+            "doc_type": LOCAL_MODEL_ID,
+            "confidence": confidence,
+            "fields": fields
+        }],
+        "pages": [
+            {
+                "page_number": page_number,
+                "lines": [line for line in text.split('\n') if line.strip()],
+                "words": []
+            }
+            for page_number, text in enumerate(page_texts, start=1)
+        ],
+        "tables": [],
+        "key_value_pairs": []
+    }
+
+def parsed_sections_ratio(sections, field_parsers=None):
+    """
+    대상 섹션 중 내용이 추출된 비율(0~1)을 계산합니다.
+    field_parsers(섹션명 → 파싱 함수)를 전달하면 파싱 결과가 비어 있지 않은 섹션만 셉니다
+    (제목만 찾고 내용 형식이 달라 구조화되지 않는 경우를 걸러냄).
+    """
+    parsed = 0
+    for section_name, content in sections.items():
+        parser = (field_parsers or {}).get(section_name)
+        try:
+            if parser is None or parser(content):
+                parsed += 1
+        except Exception:
+            continue
+    return round(parsed / len(SECTION_HEADINGS), 3)
+
+def sections_confidence(sections, total_chars, page_count, field_parsers=None):
+    """텍스트 밀도와 파싱된 섹션 비율을 바탕으로 신뢰도(0~1)를 계산합니다."""
+    if page_count == 0 or total_chars / page_count < MIN_CHARS_PER_PAGE:
+        return 0.0
+    
+    return parsed_sections_ratio(sections, field_parsers)
+
+def extract_resume_locally(document_content, field_parsers=None):
+    """
+    PDF 텍스트 레이어에서 이력서 섹션을 추출합니다.
+    (분석 결과, 신뢰도)를 반환하며, 텍스트 레이어가 없으면 (None, 0.0)을 반환합니다.
+    field_parsers를 전달하면 파싱 결과가 나오는 섹션만 신뢰도에 반영합니다.
+    """
+    page_texts = extract_pdf_text_pages(document_content)
+    total_chars = sum(len(text.strip()) for text in page_texts)
+    if total_chars == 0:
+        return None, 0.0
+    
+    sections = split_sections("\n".join(page_texts))
+    confidence = sections_confidence(sections, total_chars, len(page_texts), field_parsers)
+    
+    return build_local_analysis(page_texts, sections, confidence), confidence
+
+def extract_resume_from_docx(document_content, field_parsers=None):
+    """
+    DOCX 이력서에서 섹션을 추출합니다.
+    (분석 결과, 신뢰도)를 반환하며, 텍스트가 없으면 (None, 0.0)을 반환합니다.
+    """
+    text = extract_docx_text(document_content)
+    if not text.strip():
+        return None, 0.0
+    
+    sections = split_sections(text)
+    confidence = parsed_sections_ratio(sections, field_parsers)
+    
+    return build_local_analysis([text], sections, confidence), confidence
@@ -0,0 +1,122 @@
+import sys
+import time
+import threading
+import tracemalloc
+from collections import deque
+
+# deep_sizeof가 따라갈 최대 깊이 (클라이언트 객체처럼 참조가 깊은 경우 대비)
+MAX_DEPTH = 12
+
+# 이 시간(초) 동안 갱신되지 않은 세션 보고서는 종료된 세션으로 보고 제거
+SESSION_REPORT_TTL = 3600
+
+# 세션별 메모리 보고서 (프로세스 전체에서 공유)
+_lock = threading.Lock()
+_session_reports = {}
+
+def deep_sizeof(obj, max_depth=MAX_DEPTH):
+    """객체와 그 하위 객체들의 대략적인 메모리 크기(바이트)를 계산합니다."""
+    seen = set()
+    total = 0
+    pending = deque([(obj, 0)])
+    
+    while pending:
+        current, depth = pending.popleft()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+        
+        if depth >= max_depth or isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        
+        if isinstance(current, dict):
+            for key, value in current.items():
+                pending.append((key, depth + 1))
+                pending.append((value, depth + 1))
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            for item in current:
+                pending.append((item, depth + 1))
+        elif hasattr(current, "__dict__"):
+            pending.append((vars(current), depth + 1))
+    
+    return total
+
+def update_session_report(session_id, sizes):
+    """세션의 구조별 메모리 크기(바이트)를 기록합니다."""
+    now = time.time()
+    with _lock:
+        _session_reports[session_id] = {
+            "sizes": dict(sizes),
+            "total": sum(sizes.values()),
+            "updated_at": now
+        }
+        for stale_id in [sid for sid, report in _session_reports.items() if now - report["updated_at"] > SESSION_REPORT_TTL]:
+            del _session_reports[stale_id]
+
+def get_session_reports():
+    """모든 세션의 메모리 보고서를 반환합니다."""
+    with _lock:
+        return {session_id: dict(report) for session_id, report in _session_reports.items()}
+
+def slim_result(result):
+    """상세 페이지/테이블/키-값 데이터를 제거하고 개수만 남긴 결과를 반환합니다."""
+    analysis = result["analysis"]
+    slim_analysis = {
+        key: value for key, value in analysis.items()
+        if key not in ("pages", "tables", "key_value_pairs")
+    }
+    slim_analysis.update({
+        "pages": [],
+        "tables": [],
+        "key_value_pairs": [],
+        "page_count": analysis.get("page_count", len(analysis.get("pages", []))),
+        "table_count": analysis.get("table_count", len(analysis.get("tables", []))),
+        "kv_count": analysis.get("kv_count", len(analysis.get("key_value_pairs", [])))
+    })
+    return {**result, "analysis": slim_analysis}
+
+def evict_result_details(result):
+    """
+    상세 화면용 데이터(추출 필드, 평가 본문)까지 제거한 결과를 반환합니다.
+    점수, 추출 경로, 압축 정보 등 결과 요약에 쓰는 값은 유지합니다.
+    """
+    slim = slim_result(result)
+    return {
+        **slim,
+        "analysis": {**slim["analysis"], "documents": []},
+        "fitness_evaluation": None,
+        "details_evicted": True
+    }
+
+def start_tracemalloc(frames=1):
+    """tracemalloc을 시작하고 현재 스냅샷을 반환합니다."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    return tracemalloc.take_snapshot()
+
+def compare_tracemalloc(before_snapshot, limit=10, stop=True):
+    """시작 스냅샷과 현재를 비교하여 할당이 가장 많이 늘어난 위치를 반환합니다."""
+    after_snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    if stop:
+        tracemalloc.stop()
+    
+    top_stats = after_snapshot.compare_to(before_snapshot, "lineno")[:limit]
+    return {
+        "current_mb": round(current / (1024 * 1024), 2),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+        "top": [
+            {
+                "위치": str(stat.traceback[0]) if stat.traceback else "",
+                "증가량(KB)": round(stat.size_diff / 1024, 1),
+                "현재(KB)": round(stat.size / 1024, 1),
+                "할당 수 증가": stat.count_diff
+            }
+            for stat in top_stats
+        ]
+    }
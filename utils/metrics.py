@@ -0,0 +1,182 @@
+import os
+import json
+import math
+import time
+import threading
+import functools
+from collections import deque
+
+# 단계별로 보관할 최대 측정값 수 (오래된 값부터 버림)
+MAX_SAMPLES_PER_STAGE = 10000
+
+# 내보낼 지표 이름 접두사
+METRIC_PREFIX = "recruit"
+
+_lock = threading.Lock()
+_stage_samples = {}
+_stage_counts = {}
+_stage_errors = {}
+_counters = {}
+_gauges = {}
+
+def record_stage(stage, seconds, error=False):
+    """단계 실행 시간과 오류 여부를 기록합니다."""
+    with _lock:
+        if stage not in _stage_samples:
+            _stage_samples[stage] = deque(maxlen=MAX_SAMPLES_PER_STAGE)
+            _stage_counts[stage] = 0
+            _stage_errors[stage] = 0
+        _stage_samples[stage].append(seconds)
+        _stage_counts[stage] += 1
+        if error:
+            _stage_errors[stage] += 1
+
+class stage_timer:
+    """with 블록의 실행 시간을 단계 지표로 기록합니다."""
+    
+    def __init__(self, stage):
+        self.stage = stage
+        self.error = False
+    
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        record_stage(self.stage, time.perf_counter() - self.started_at, error=self.error or exc_type is not None)
+        return False
+
+def trace_stage(stage, is_error=None):
+    """
+    함수 실행 시간을 단계 지표로 기록하는 데코레이터입니다.
+    예외가 발생하거나 is_error(반환값)가 참이면 오류로 집계합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                record_stage(stage, time.perf_counter() - started_at, error=True)
+                raise
+            record_stage(stage, time.perf_counter() - started_at, error=bool(is_error and is_error(result)))
+            return result
+        return wrapper
+    return decorator
+
+def increment_counter(name, value=1, **labels):
+    """누적 카운터를 증가시킵니다."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def set_gauge(name, value, **labels):
+    """현재 값을 나타내는 게이지를 설정합니다."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _gauges[key] = value
+
+def percentile(sorted_values, ratio):
+    """정렬된 값에서 백분위수를 계산합니다 (nearest-rank)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(ratio * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def get_stage_summary():
+    """단계별 호출 수, 오류 수, p50/p95/p99, 합계를 반환합니다."""
+    with _lock:
+        snapshot = {stage: sorted(samples) for stage, samples in _stage_samples.items()}
+        counts = dict(_stage_counts)
+        errors = dict(_stage_errors)
+    
+    summary = {}
+    for stage, samples in snapshot.items():
+        summary[stage] = {
+            "count": counts[stage],
+            "errors": errors[stage],
+            "p50": percentile(samples, 0.50),
+            "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99),
+            "sum": sum(samples)
+        }
+    return summary
+
+def get_metrics_snapshot():
+    """단계 지표, 카운터, 게이지를 JSON으로 직렬화 가능한 형태로 반환합니다."""
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in _counters.items()]
+        gauges = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in _gauges.items()]
+    
+    return {
+        "generated_at": time.time(),
+        "stages": get_stage_summary(),
+        "counters": counters,
+        "gauges": gauges
+    }
+
+def escape_label_value(value):
+    """Prometheus 텍스트 형식에 맞게 라벨 값의 역슬래시, 큰따옴표, 줄바꿈을 이스케이프합니다."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels):
+    """Prometheus 라벨 문자열을 만듭니다."""
+    if not labels:
+        return ""
+    escaped = [f'{key}="{escape_label_value(value)}"' for key, value in sorted(labels.items())]
+    return "{" + ",".join(escaped) + "}"
+
+def to_prometheus_text():
+    """지표를 Prometheus 텍스트 형식으로 변환합니다."""
+    snapshot = get_metrics_snapshot()
+    lines = []
+    
+    latency_metric = f"{METRIC_PREFIX}_stage_latency_seconds"
+    lines.append(f"# HELP {latency_metric} 단계별 처리 시간")
+    lines.append(f"# TYPE {latency_metric} summary")
+    for stage, stats in snapshot["stages"].items():
+        for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+            value = stats[key]
+            lines.append(f"{latency_metric}{format_labels({'stage': stage, 'quantile': quantile})} {value:.6f}")
+        lines.append(f"{latency_metric}_sum{format_labels({'stage': stage})} {stats['sum']:.6f}")
+        lines.append(f"{latency_metric}_count{format_labels({'stage': stage})} {stats['count']}")
+    
+    errors_metric = f"{METRIC_PREFIX}_stage_errors_total"
+    lines.append(f"# HELP {errors_metric} 단계별 오류 수")
+    lines.append(f"# TYPE {errors_metric} counter")
+    for stage, stats in snapshot["stages"].items():
+        lines.append(f"{errors_metric}{format_labels({'stage': stage})} {stats['errors']}")
+    
+    for metric_type, items in (("counter", snapshot["counters"]), ("gauge", snapshot["gauges"])):
+        declared = set()
+        for item in sorted(items, key=lambda item: item["name"]):
+            metric_name = f"{METRIC_PREFIX}_{item['name']}"
+            if metric_name not in declared:
+                lines.append(f"# TYPE {metric_name} {metric_type}")
+                declared.add(metric_name)
+            lines.append(f"{metric_name}{format_labels(item['labels'])} {item['value']}")
+    
+    return "\n".join(lines) + "\n"
+
+def export_metrics(export_dir):
+    """지표를 metrics.prom(Prometheus 텍스트)과 metrics.json 파일로 저장하고 경로를 반환합니다."""
+    os.makedirs(export_dir, exist_ok=True)
+    prom_path = os.path.join(export_dir, "metrics.prom")
+    json_path = os.path.join(export_dir, "metrics.json")
+    
+    with open(prom_path, "w", encoding="utf-8") as prom_file:
+        prom_file.write(to_prometheus_text())
+    with open(json_path, "w", encoding="utf-8") as json_file:
+        json.dump(get_metrics_snapshot(), json_file, ensure_ascii=False, indent=2)
+    
+    return prom_path, json_path
+
+def reset_metrics():
+    """모든 지표를 초기화합니다."""
+    with _lock:
+        _stage_samples.clear()
+        _stage_counts.clear()
+        _stage_errors.clear()
+        _counters.clear()
+        _gauges.clear()
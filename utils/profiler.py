@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+# 샘플링 간격 (초). 5ms 간격이면 오버헤드가 작아 운영과 비슷한 조건에서 사용할 수 있음
+DEFAULT_INTERVAL = 0.005
+
+# 스택에서 제외할 프로파일러 자신의 파일
+PROFILER_FILE = os.path.abspath(__file__)
+
+def frame_label(frame):
+    """프레임을 '함수명 (파일명:줄번호)' 형태의 라벨로 변환합니다."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    별도 스레드에서 대상 스레드의 호출 스택을 주기적으로 샘플링하는 프로파일러입니다.
+    결과는 collapsed stack(flamegraph.pl, speedscope 호환)과 상위 함수 표로 제공합니다.
+    """
+    
+    def __init__(self, interval=DEFAULT_INTERVAL, target_thread_id=None):
+        self.interval = interval
+        self.target_thread_id = target_thread_id
+        self.stacks = Counter()
+        self.sample_count = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """현재(또는 지정한) 스레드에 대한 샘플링을 시작합니다."""
+        if self.target_thread_id is None:
+            self.target_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """샘플링을 멈춥니다."""
+        if self._thread is None:
+            return self
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed += time.perf_counter() - self.started_at
+        return self
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            
+            stack = []
+            while frame is not None:
+                if os.path.abspath(frame.f_code.co_filename) != PROFILER_FILE:
+                    stack.append(frame_label(frame))
+                frame = frame.f_back
+            
+            if stack:
+                # collapsed 형식은 루트 → 리프 순서
+                self.stacks[tuple(reversed(stack))] += 1
+                self.sample_count += 1
+    
+    def collapsed_lines(self):
+        """'루트;...;리프 샘플수' 형식의 collapsed stack 라인들을 반환합니다."""
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+    
+    def write_collapsed(self, path):
+        """collapsed stack 파일을 저장합니다 (flamegraph.pl 또는 speedscope로 열 수 있음)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as collapsed_file:
+            collapsed_file.write("\n".join(self.collapsed_lines()) + "\n")
+        return path
+    
+    def top_functions(self, limit=20):
+        """자체(self) 샘플 수 기준 상위 함수 목록을 반환합니다."""
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            # 재귀 호출은 한 번만 집계
+            for label in set(stack):
+                total_counts[label] += count
+        
+        total_samples = self.sample_count or 1
+        rows = []
+        for label, self_count in self_counts.most_common(limit):
+            rows.append({
+                "함수": label,
+                "self 샘플": self_count,
+                "self %": round(self_count / total_samples * 100, 1),
+                "누적 샘플": total_counts[label],
+                "누적 %": round(total_counts[label] / total_samples * 100, 1)
+            })
+        return rows
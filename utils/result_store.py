@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# 프로세스 전체(그리고 같은 파일을 쓰는 다른 프로세스)에서 공유하는 결과 저장소 스키마
+# - analyses: 이력서 버전(ETag)별 분석 결과 (채용공고와 무관)
+# - evaluations: 채용공고 버전 + 이력서 버전별 적합성 평가 결과
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    file_name TEXT NOT NULL,
+    resume_version TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (file_name, resume_version)
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    posting_key TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    resume_version TEXT NOT NULL,
+    fitness_score INTEGER,
+    fitness_evaluation TEXT,
+    usage TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (posting_key, file_name, resume_version)
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_posting_score ON evaluations (posting_key, fitness_score DESC);
+CREATE INDEX IF NOT EXISTS idx_evaluations_file_name ON evaluations (file_name);
+"""
+
+def posting_key(job_posting, job_text):
+    """채용공고 이름과 내용 해시로 저장소 키를 만듭니다 (내용이 바뀌면 새 키)."""
+    if not job_posting or not job_text:
+        return None
+    digest = hashlib.sha256(job_text.encode("utf-8")).hexdigest()[:16]
+    return f"{job_posting}@{digest}"
+
+class ResultStore:
+    """
+    SQLite 기반의 분석/평가 결과 저장소입니다.
+    여러 세션이 같은 저장소를 읽고, 없는 결과만 계산하여 추가합니다.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            # 다른 프로세스가 쓰는 동안에도 읽을 수 있도록 WAL 모드 사용
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+    
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    def _write(self, sql, params=()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+    
+    def get_analysis(self, file_name, resume_version):
+        """저장된 분석 결과를 반환합니다. 없으면 None을 반환합니다."""
+        rows = self._query(
+            "SELECT analysis FROM analyses WHERE file_name = ? AND resume_version = ?",
+            (file_name, resume_version)
+        )
+        return json.loads(rows[0]["analysis"]) if rows else None
+    
+    def put_analysis(self, file_name, resume_version, analysis):
+        """분석 결과를 저장합니다 (같은 버전이 있으면 덮어씀)."""
+        self._write(
+            "INSERT OR REPLACE INTO analyses (file_name, resume_version, analysis, created_at) VALUES (?, ?, ?, ?)",
+            (file_name, resume_version, json.dumps(analysis, ensure_ascii=False), time.time())
+        )
+    
+    def get_evaluation(self, posting, file_name, resume_version):
+        """저장된 적합성 평가 결과를 반환합니다. 없으면 None을 반환합니다."""
+        rows = self._query(
+            "SELECT fitness_score, fitness_evaluation, usage FROM evaluations "
+            "WHERE posting_key = ? AND file_name = ? AND resume_version = ?",
+            (posting, file_name, resume_version)
+        )
+        if not rows:
+            return None
+        return {
+            "fitness_score": rows[0]["fitness_score"],
+            "fitness_evaluation": rows[0]["fitness_evaluation"],
+            "usage": json.loads(rows[0]["usage"]) if rows[0]["usage"] else {}
+        }
+    
+    def put_evaluation(self, posting, file_name, resume_version, fitness_score, fitness_evaluation, usage=None):
+        """적합성 평가 결과를 저장합니다 (같은 버전이 있으면 덮어씀)."""
+        self._write(
+            "INSERT OR REPLACE INTO evaluations "
+            "(posting_key, file_name, resume_version, fitness_score, fitness_evaluation, usage, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (posting, file_name, resume_version, fitness_score, fitness_evaluation,
+             json.dumps(usage or {}), time.time())
+        )
+    
+    def top_evaluations(self, posting, limit=10, min_score=None):
+        """
+        채용공고별 점수 상위 평가 결과를 반환합니다 (posting_key, fitness_score 인덱스 사용).
+        이력서가 수정되어 여러 버전이 평가된 경우 가장 최근 평가만 사용합니다.
+        """
+        sql = (
+            "SELECT file_name, resume_version, fitness_score, created_at FROM evaluations AS latest "
+            "WHERE posting_key = ? AND fitness_score IS NOT NULL "
+            "AND created_at = (SELECT MAX(created_at) FROM evaluations "
+            "WHERE posting_key = latest.posting_key AND file_name = latest.file_name)"
+        )
+        params = [posting]
+        if min_score is not None:
+            sql += " AND fitness_score >= ?"
+            params.append(min_score)
+        sql += " ORDER BY fitness_score DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._query(sql, params)]
+    
+    def find_by_file_name(self, file_name):
+        """파일명으로 모든 채용공고의 평가 결과를 찾습니다 (file_name 인덱스 사용)."""
+        rows = self._query(
+            "SELECT posting_key, resume_version, fitness_score, created_at FROM evaluations "
+            "WHERE file_name = ? ORDER BY created_at DESC",
+            (file_name,)
+        )
+        return [dict(row) for row in rows]
+    
+    def stats(self):
+        """저장된 분석/평가 결과 수를 반환합니다."""
+        return {
+            "analyses": self._query("SELECT COUNT(*) AS count FROM analyses")[0]["count"],
+            "evaluations": self._query("SELECT COUNT(*) AS count FROM evaluations")[0]["count"]
+        }
+
+# 경로별로 하나의 저장소 인스턴스를 프로세스 전체에서 공유
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_result_store(path):
+    """경로에 해당하는 공유 저장소를 반환합니다."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ResultStore(path)
+        return _stores[path]